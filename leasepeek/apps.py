@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class LeasepeekConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'leasepeek'
+
+    def ready(self):
+        # Build the MongoDB indexes the views rely on. Existing indexes are left alone, so this is safe on every start.
+        if settings.MONGO_ENSURE_INDEXES:
+            from .mongo_indexes import ensure_indexes_in_background
+            ensure_indexes_in_background()
@@ -1,5 +1,43 @@
 from ..mongo_models import data_collection
+from ..unit_storage import load_units
+from ..readers.reader_functions.recent_leases import recent_leases
+from ..readers.reader_functions.expiring_leases import expiring_leases
+from ..readers.reader_functions.lease_trends import analyze_lease_trends
 from bson.objectid import ObjectId
+from datetime import datetime
+
+# The stored unit fields the date-relative analytics read.
+lease_date_fields = ('floorplan', 'status', 'rent', 'sqft', 'moveIn', 'leaseStart', 'leaseExpire')
+
+# The stored fields the date-relative analytics read, as a projection. Embedded units are projected too, for properties stored before units had their own collection.
+lease_date_projection = {'asOf': 1, **{f'data.{field}': 1 for field in lease_date_fields}}
+
+def date_relative_analytics(unit_data, as_of_date_str):
+    """
+    Recomputes the analytics measured from the 'as of' date out of the stored units, so correcting the date doesn't need the workbook to be uploaded again.
+
+    Args:
+    unit_data (list): The stored units, with at least the `lease_date_fields`.
+    as_of_date_str (str): The new 'as of' date, in 'MM/DD/YYYY' format.
+
+    Returns:
+    dict: The 'recentLeases', 'expiringLeases' and 'leaseTrends' entries of the property document.
+    """
+    return {
+        "recentLeases": recent_leases(unit_data, as_of_date_str),
+        "expiringLeases": expiring_leases(unit_data, as_of_date_str),
+        "leaseTrends": analyze_lease_trends(unit_data, as_of_date_str),
+    }
+
+
+def valid_as_of_date(as_of_date_str):
+    # Whether the date is in the 'MM/DD/YYYY' format the analytics are computed from
+    try:
+        datetime.strptime(as_of_date_str, '%m/%d/%Y')
+    except (TypeError, ValueError):
+        return False
+    return True
+
 
 def update_basic_data(data):
     objectId = data.get('objectId')
@@ -27,9 +65,17 @@ def update_basic_data(data):
         }
     }
 
+    # A corrected 'as of' date moves the recent lease windows, the expiration horizon and the lease trend months, so they are recomputed from the stored units and set by the same update
+    if valid_as_of_date(updated_asOf):
+        stored = data_collection.find_one({"_id": ObjectId(objectId)}, lease_date_projection)
+        if not stored:
+            raise Exception(f"No document found with _id: {objectId}")
+        if stored.get('asOf') != updated_asOf:
+            update_query["$set"].update(date_relative_analytics(load_units(stored, lease_date_fields), updated_asOf))
+
     result = data_collection.update_one({"_id": ObjectId(objectId)}, update_query)
 
     if result.matched_count > 0:
         return "Document updated successfully."
     else:
-        raise Exception(f"No document found with _id: {objectId}")
\ No newline at end of file
+        raise Exception(f"No document found with _id: {objectId}")
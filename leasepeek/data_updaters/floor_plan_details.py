@@ -1,6 +1,7 @@
 from ..mongo_models import data_collection
 from bson.objectid import ObjectId
 from collections import defaultdict
+from ..readers.reader_functions.floorplan_survey import distribution_keys
 
 def update_floor_plan_data(data):
     objectId = data.get('objectId')
@@ -23,6 +24,10 @@ def update_floor_plan_data(data):
             'baths': plan['baths'],
             'renovated': plan['renovated'],
         }
+        # Keep the rent distribution computed when the data was read, if the client sent it back.
+        for key in distribution_keys:
+            if key in plan:
+                floorplans[plan['planCode']][key] = plan[key]
         
     update_query = {
         "$set": {
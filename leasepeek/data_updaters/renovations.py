@@ -1,71 +1,48 @@
 from ..mongo_models import data_collection
+from ..unit_storage import load_units, update_named_units
+from .unit_aggregates import renovation_update
 from bson.objectid import ObjectId
 
 def update_renovations_data(data):
     objectId = data.get('objectId')
-    renovatedUnits = data.get('renovatedUnits')
-    renovatedFloorPlans = data.get('renovatedFloorPlans')
+    renovatedUnits = data.get('renovatedUnits') or []
+    renovatedFloorPlans = data.get('renovatedFloorPlans') or []
     dataType = data.get('type')
 
-    unit_data = data_collection.find_one({"_id": ObjectId(objectId)})
+    unit_data = data_collection.find_one({"_id": ObjectId(objectId)}, {"data.unit": 1, "data.floorplan": 1, "data.renovated": 1, "floorplans": 1})
     if not unit_data:
         raise Exception(f"No document found with _id: {objectId}")
-    
-    data_inputted_successfully = False
+    units = load_units(unit_data, ('unit', 'floorplan', 'renovated'))
 
     # Update unit data based on renovatedFloorPlans
     if dataType == 'floorPlan':
-        if "floorplans" in unit_data:
-            for plan_name in unit_data['floorplans']:
-                is_renovated = plan_name in renovatedFloorPlans
-                field_path = f"floorplans.{plan_name}.renovated"
-                update_query = {"$set": {field_path: is_renovated}}
-                result = data_collection.update_one({"_id": ObjectId(objectId)}, update_query)
-                if result.matched_count > 0:
-                    data_inputted_successfully = True
-                else:
-                    raise Exception("Data input error")
-                
-        if "data" in unit_data:
-            for unit_info in unit_data['data']:                    
-                unit_floorplan = unit_info['floorplan']
-                is_renovated = unit_floorplan in renovatedFloorPlans
-                field_path = f"data.{unit_info['unit']}.renovated"
-                update_query = {"$set": {"data.$[elem].renovated": is_renovated}}
-                array_filters = [{"elem.floorplan": unit_floorplan}]
-                result = data_collection.update_one({"_id": ObjectId(objectId)}, update_query, array_filters=array_filters)
-            
-            if result.matched_count > 0:
-                data_inputted_successfully = True
-            else:
-                raise Exception("Data input error")
+        update_query, renovated_units, unrenovated_units = renovation_update(
+            {**unit_data, 'data': units},
+            lambda unit: unit['floorplan'] in renovatedFloorPlans,
+            lambda plan_name: plan_name in renovatedFloorPlans,
+        )
 
-    # Update unit data based on renovatedUnits
+    # Update unit data based on renovatedUnits, marking the floorplans of renovated units as renovated
     else:
-        floorplans_to_update = []
-        if "data" in unit_data:
-            for unit_info in unit_data['data']:                    
-                unit_id = unit_info['unit'] 
-                is_renovated = unit_id in renovatedUnits
-                if is_renovated:
-                    floorplans_to_update.append(unit_info['floorplan'])
-                field_path = f"data.{unit_id}.renovated"
-                update_query = {"$set": {"data.$[elem].renovated": is_renovated}}
-                array_filters = [{"elem.unit": unit_id}]
-                result = data_collection.update_one({"_id": ObjectId(objectId)}, update_query, array_filters=array_filters)
-                if result.matched_count > 0:
-                    data_inputted_successfully = True
-                else:
-                    raise Exception("Data input error")
-        if "floorplans" in unit_data:
-            for plan_name in unit_data['floorplans']:
-                is_renovated = plan_name in floorplans_to_update
-                field_path = f"floorplans.{plan_name}.renovated"
-                update_query = {"$set": {field_path: is_renovated}}
-                result = data_collection.update_one({"_id": ObjectId(objectId)}, update_query)
-                if result.matched_count > 0:
-                    data_inputted_successfully = True
-                else:
-                    raise Exception("Data input error")
+        floorplans_to_update = {unit_info['floorplan'] for unit_info in units if unit_info['unit'] in renovatedUnits}
+        update_query, renovated_units, unrenovated_units = renovation_update(
+            {**unit_data, 'data': units},
+            lambda unit: unit['unit'] in renovatedUnits,
+            lambda plan_name: plan_name in floorplans_to_update,
+        )
 
-    return "Document updated successfully." if data_inputted_successfully else "Data input error."
\ No newline at end of file
+    # Only the flags that change are written. Embedded units are matched by name with array filters, in the same update as the floorplans
+    array_filters = []
+    for unit_names, is_renovated, identifier in [(renovated_units, True, 'renovated'), (unrenovated_units, False, 'unrenovated')]:
+        unit_paths, unit_filters = update_named_units(unit_data, unit_names, {'renovated': is_renovated}, identifier)
+        if unit_paths:
+            update_query.setdefault("$set", {}).update(unit_paths)
+            array_filters.extend(unit_filters)
+
+    # Every flag already matches
+    if not update_query:
+        return "Document updated successfully."
+
+    result = data_collection.update_one({"_id": ObjectId(objectId)}, update_query, array_filters=array_filters or None)
+
+    return "Document updated successfully." if result.matched_count > 0 else "Data input error."
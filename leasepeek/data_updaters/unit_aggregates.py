@@ -0,0 +1,182 @@
+"""
+Incremental maintenance of the aggregates stored with a property when some of its units are edited.
+
+Instead of re-reading the rent roll, the edit is turned into a single update of the property touching only the paths it
+affects: the vacancy counts of the edited units' old and new statuses, the loss to lease and contractual rent totals, and the
+floorplan surveys of the floorplans they belong to. The edited units themselves are written with `leasepeek.unit_storage`.
+
+Counts and totals are adjusted with `$inc` by the edited units' amounts, so concurrent edits of the same property add up
+instead of overwriting each other. The surveys of the affected floorplans are recomputed from their stored units with
+`summarize_floorplans`.
+"""
+from ..readers.reader_functions.status_resolution import resolve_stored_status, status_type
+from ..readers.reader_functions.floorplan_survey import summarize_floorplans, distribution_keys
+from ..readers.reader_functions.money import to_cents, from_cents
+
+# The stored unit fields needed to maintain the aggregates.
+aggregate_unit_fields = ('unit', 'floorplan', 'status', 'rent', 'market', 'sqft')
+
+# The stored fields needed to maintain the aggregates, as a projection. Embedded units are projected too, for properties stored before units had their own collection.
+aggregate_projection = {
+    **{f'data.{field}': 1 for field in aggregate_unit_fields},
+    'floorplans': 1, 'vacancy': 1, 'lossToLease': 1, 'charges.rent': 1,
+}
+
+# The fields of a floorplan survey computed from its units. The rest ('planName', 'planType', 'beds', 'baths', 'renovated') may have been edited and are left alone.
+survey_fields = ('avgRent', 'sumRent', 'avgMarket', 'sumMarket', 'unitCount', 'avgSqft') + distribution_keys + ('unitStatuses',)
+
+def survey_plan(units, resolutions, plan_name):
+    """
+    Recomputes the floorplan survey of a single floorplan from its stored units.
+
+    Returns:
+    dict: The survey of the floorplan, or None if none of its units are surveyed anymore.
+    """
+    surveyed = [(unit, resolution) for unit, resolution in zip(units, resolutions) if unit['floorplan'] == plan_name and resolution.surveyed]
+    survey = summarize_floorplans(
+        [plan_name for unit, resolution in surveyed],
+        [to_cents(unit['market']) for unit, resolution in surveyed],
+        [to_cents(unit['rent']) for unit, resolution in surveyed],
+        [unit['sqft'] for unit, resolution in surveyed],
+        [resolution.status for unit, resolution in surveyed],
+        [resolution.occupied for unit, resolution in surveyed],
+    )
+    return survey.get(plan_name)
+
+
+def unit_status_update(document, new_statuses):
+    """
+    Builds the update applying unit status edits to the aggregates of a stored property.
+
+    Args:
+    document (dict): The stored property, with at least the fields of `aggregate_projection` and its units under 'data'.
+    new_statuses (dict): The new status of each edited unit, by unit name. Every stored row of the unit is edited.
+
+    Returns:
+    tuple: The update of the property, with its '$inc', '$set' and '$unset' operators, and the new status of each changed unit row, by position. Both are empty if no status changes. Vacancy statuses left without units are dropped afterwards with `emptied_vacancy_updates`.
+    """
+    units = document.get('data') or []
+    resolutions = [resolve_stored_status(unit['status']) for unit in units]
+
+    inc_fields = {}
+    set_fields = {}
+    unset_fields = {}
+    vacancy_deltas = {}
+    market_delta = 0
+    rent_delta = 0
+    affected_plans = []
+    unit_statuses = {}
+
+    for index, unit in enumerate(units):
+        if unit['unit'] not in new_statuses:
+            continue
+        old = resolutions[index]
+        new = resolutions[index] = resolve_stored_status(new_statuses[unit['unit']])
+        if old.status == new.status:
+            continue
+
+        unit_statuses[index] = new.status
+
+        if old.vacancy_status is not None:
+            vacancy_deltas[old.vacancy_status] = vacancy_deltas.get(old.vacancy_status, 0) - 1
+        if new.vacancy_status is not None:
+            vacancy_deltas[new.vacancy_status] = vacancy_deltas.get(new.vacancy_status, 0) + 1
+
+        # Units excluded from the floorplan survey are excluded from the loss to lease as well.
+        if old.surveyed != new.surveyed:
+            sign = 1 if new.surveyed else -1
+            market_delta += sign * to_cents(unit['market'])
+            rent_delta += sign * to_cents(unit['rent'])
+
+        if old.surveyed or new.surveyed:
+            if unit['floorplan'] not in affected_plans:
+                affected_plans.append(unit['floorplan'])
+
+    # Vacancy counts. Incrementing a missing count adds the status, so its type is set along with it.
+    vacancy = document.get('vacancy') or {}
+    for vacancy_status, delta in vacancy_deltas.items():
+        if delta == 0:
+            continue
+        inc_fields[f'vacancy.{vacancy_status}.count'] = delta
+        if vacancy_status not in vacancy:
+            set_fields[f'vacancy.{vacancy_status}.type'] = status_type(vacancy_status)
+
+    # Loss to lease and the contractual rent, which starts from the loss to lease rent income.
+    loss_to_lease = document.get('lossToLease') or {}
+    if market_delta and 'marketSum' in loss_to_lease:
+        inc_fields['lossToLease.marketSum'] = from_cents(market_delta)
+    if rent_delta and 'rentIncome' in loss_to_lease:
+        inc_fields['lossToLease.rentIncome'] = from_cents(rent_delta)
+    if rent_delta and (document.get('charges') or {}).get('rent') is not None:
+        inc_fields['charges.rent.value'] = from_cents(rent_delta)
+
+    # Floorplan surveys of the affected floorplans.
+    floorplans = document.get('floorplans') or {}
+    for plan_name in affected_plans:
+        survey = survey_plan(units, resolutions, plan_name)
+        if survey is None:
+            if plan_name in floorplans:
+                unset_fields[f'floorplans.{plan_name}'] = ''
+        elif plan_name in floorplans:
+            for field in survey_fields:
+                set_fields[f'floorplans.{plan_name}.{field}'] = survey[field]
+        else:
+            set_fields[f'floorplans.{plan_name}'] = survey
+
+    update = {}
+    if inc_fields:
+        update['$inc'] = inc_fields
+    if set_fields:
+        update['$set'] = set_fields
+    if unset_fields:
+        update['$unset'] = unset_fields
+    return update, unit_statuses
+
+
+def emptied_vacancy_updates(update):
+    """
+    Builds the updates dropping the vacancy statuses an update of `unit_status_update` may leave without units.
+
+    Each status is only dropped if its count is no longer positive once the update is applied, so a status that a concurrent
+    edit counted a unit under again is kept.
+
+    Args:
+    update (dict): The update of the property, as returned by `unit_status_update`.
+
+    Returns:
+    list: The filter and update of each vacancy status whose count decreased, to apply to the property.
+    """
+    updates = []
+    for path, delta in update.get('$inc', {}).items():
+        if path.startswith('vacancy.') and delta < 0:
+            vacancy_path = path[:-len('.count')]
+            updates.append(({path: {'$lte': 0}}, {'$unset': {vacancy_path: ''}}))
+    return updates
+
+
+def renovation_update(document, unit_renovated, plan_renovated):
+    """
+    Finds the renovated flags of a stored property's units and floorplans that change, so only those are written.
+
+    Args:
+    document (dict): The stored property, with its 'floorplans' and its units' 'unit' and 'renovated' fields under 'data'.
+    unit_renovated (callable): Returns whether a stored unit is renovated.
+    plan_renovated (callable): Returns whether a floorplan is renovated, given its name.
+
+    Returns:
+    tuple: The update of the property's floorplans, empty if none changes, and the names of the units to mark as renovated and as not renovated.
+    """
+    renovated_units = set()
+    unrenovated_units = set()
+    for unit in document.get('data') or []:
+        is_renovated = unit_renovated(unit)
+        if bool(unit.get('renovated')) != is_renovated:
+            (renovated_units if is_renovated else unrenovated_units).add(unit['unit'])
+
+    set_fields = {}
+    for plan_name, plan in (document.get('floorplans') or {}).items():
+        is_renovated = plan_renovated(plan_name)
+        if bool(plan.get('renovated')) != is_renovated:
+            set_fields[f'floorplans.{plan_name}.renovated'] = is_renovated
+
+    return ({'$set': set_fields} if set_fields else {}), renovated_units, unrenovated_units
@@ -1,19 +1,70 @@
+from django.core.exceptions import ValidationError
 from ..mongo_models import data_collection
+from ..unit_storage import load_units, update_units
+from ..readers.reader_functions.status_resolution import canonical_statuses
+from .unit_aggregates import unit_status_update, emptied_vacancy_updates, aggregate_projection, aggregate_unit_fields
 from bson.objectid import ObjectId
 
+def read_status_changes(unit_changes):
+    """
+    Reads the status edits of single units sent by a user.
+
+    Args:
+    unit_changes (list): The edits, each with the 'unit' edited and its new 'status'.
+
+    Returns:
+    dict: The new status of each edited unit, by unit name.
+
+    Raises:
+    ValidationError: If an edit isn't a unit name and one of the canonical statuses.
+    """
+    if not isinstance(unit_changes, list):
+        raise ValidationError("units must be a list of unit status edits.")
+    new_statuses = {}
+    for change in unit_changes:
+        if not isinstance(change, dict) or not isinstance(change.get('unit'), (str, int)):
+            raise ValidationError("Each unit status edit must name its unit.")
+        if change.get('status') not in canonical_statuses:
+            raise ValidationError(f"Invalid status for unit {change['unit']}. Expected one of: {', '.join(canonical_statuses)}.")
+        new_statuses[change['unit']] = change['status']
+    return new_statuses
+
+
 def update_unit_statuses(data):
     objectId = data.get('objectId')
     unit_status_data = data.get('unitStatuses')
+    new_statuses = read_status_changes(data.get('units') or [])
 
-    update_query = {
-            "$set": {
-                "vacancy": unit_status_data
-            }
-        }
+    update_query = {}
+
+    # Status edits of single units, applied along with the aggregates that depend on them
+    if new_statuses:
+        unit_data = data_collection.find_one({"_id": ObjectId(objectId)}, aggregate_projection)
+        if not unit_data:
+            raise Exception(f"No document found with _id: {objectId}")
+        units = load_units(unit_data, aggregate_unit_fields)
+        update_query, unit_statuses = unit_status_update({**unit_data, 'data': units}, new_statuses)
+        unit_paths = update_units(unit_data, {index: {'status': status} for index, status in unit_statuses.items()})
+        if unit_paths:
+            update_query.setdefault("$set", {}).update(unit_paths)
+
+    # Vacancy counts set by the user override the recomputed ones
+    if unit_status_data is not None:
+        for operator in list(update_query):
+            update_query[operator] = {path: value for path, value in update_query[operator].items() if not path.startswith('vacancy.')}
+            if not update_query[operator]:
+                del update_query[operator]
+        update_query.setdefault("$set", {})["vacancy"] = unit_status_data
+
+    if not update_query:
+        return "Document updated successfully."
 
     result = data_collection.update_one({"_id": ObjectId(objectId)}, update_query)
 
     if result.matched_count > 0:
+        # Drop the vacancy statuses left without units
+        for query, vacancy_update in emptied_vacancy_updates(update_query):
+            data_collection.update_one({"_id": ObjectId(objectId), **query}, vacancy_update)
         return "Document updated successfully."
     else:
-        raise Exception(f"No document found with _id: {objectId}")
\ No newline at end of file
+        raise Exception(f"No document found with _id: {objectId}")
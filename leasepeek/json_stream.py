@@ -0,0 +1,122 @@
+"""
+Module Description:
+This module encodes property documents read as raw BSON into JSON incrementally, for `StreamingHttpResponse`.
+
+Property documents are read with `raw_codec_options`, so they stay `RawBSONDocument`s holding the bytes MongoDB sent: a field is
+only decoded when it is encoded, and an embedded document only when it is reached. The JSON is produced in chunks of about
+`stream_chunk_size` characters as the document and its units are walked, instead of decoding the whole document into dicts,
+copying it and encoding it again as one string, so peak memory and the time to the first byte don't grow with the number of units.
+
+The output is the same as `json.dumps` with `DjangoJSONEncoder`, as used by `JsonResponse`.
+
+Functions:
+- json_pieces: Encodes a value as JSON, piece by piece.
+- buffered: Joins pieces of text into chunks of about `stream_chunk_size` characters.
+- property_json_chunks: Encodes a stored property and its units as the JSON list returned by read_excel_data.
+
+Variables:
+- raw_codec_options: The codec options reading documents as `RawBSONDocument`s.
+- stream_chunk_size: The approximate size of each chunk, in characters.
+"""
+from bson import decode
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from collections.abc import Mapping
+from django.core.serializers.json import DjangoJSONEncoder
+import logging
+
+logger = logging.getLogger(__name__)
+
+# The codec options reading documents as `RawBSONDocument`s, e.g. `collection.with_options(codec_options=raw_codec_options)`.
+raw_codec_options = CodecOptions(document_class=RawBSONDocument)
+
+# The approximate size of each chunk, in characters. Raw documents smaller than this, such as a unit, are decoded and encoded in one go.
+stream_chunk_size = 64 * 1024
+
+_encoder = DjangoJSONEncoder()
+
+def json_pieces(value):
+    """
+    Encodes a value as JSON, piece by piece, decoding raw documents only as they are reached.
+
+    Parameters:
+    - value: A `RawBSONDocument`, mapping, list or JSON scalar.
+
+    Returns:
+    - generator: The pieces of the JSON text.
+    """
+    if isinstance(value, RawBSONDocument) and len(value.raw) <= stream_chunk_size:
+        yield _encoder.encode(decode(value.raw))
+    elif isinstance(value, Mapping):
+        yield '{'
+        for position, (key, item) in enumerate(value.items()):
+            yield f"{', ' if position else ''}{_encoder.encode(key)}: "
+            yield from json_pieces(item)
+        yield '}'
+    elif isinstance(value, (list, tuple)):
+        yield '['
+        for position, item in enumerate(value):
+            if position:
+                yield ', '
+            yield from json_pieces(item)
+        yield ']'
+    else:
+        yield _encoder.encode(value)
+
+
+def buffered(pieces, chunk_size=stream_chunk_size):
+    """
+    Joins pieces of text into chunks of about `chunk_size` characters, so the response isn't written a few bytes at a time.
+    """
+    buffer = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def property_pieces(document, units, unit_fields):
+    # The pieces of `property_json_chunks`, before they are buffered.
+    yield '[{'
+    position = 0
+    for key, value in document.items():
+        if key == '_id':
+            continue
+        yield f"{', ' if position else ''}{_encoder.encode(key)}: "
+        if key == 'data' and unit_fields:
+            value = [{field: unit[field] for field in unit_fields if field in unit} for unit in value]
+        yield from json_pieces(value)
+        position += 1
+
+    if units is not None:
+        yield f"{', ' if position else ''}\"data\": ["
+        for unit_position, unit in enumerate(units):
+            if unit_position:
+                yield ', '
+            yield from json_pieces(unit)
+        yield ']'
+    yield '}]'
+
+
+def property_json_chunks(document, units=None, unit_fields=None):
+    """
+    Encodes a stored property and its units as the JSON list returned by read_excel_data, in chunks.
+
+    Parameters:
+    - document (RawBSONDocument): The stored property. Its '_id' is left out.
+    - units (iterable): The units of the property, such as a cursor over `units_collection`, added under 'data'. None if the property embeds its units or they weren't requested.
+    - unit_fields (iterable): The fields to keep of each unit the property embeds. Defaults to every field.
+
+    Returns:
+    - generator: The chunks of the JSON text. An error while reading the units ends the response early; it is logged, since the status has been sent already.
+    """
+    try:
+        yield from buffered(property_pieces(document, units, unit_fields))
+    except Exception as e:
+        logger.error(f"Error streaming property data: {e}", exc_info=True)
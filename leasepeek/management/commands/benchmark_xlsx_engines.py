@@ -0,0 +1,78 @@
+"""
+Management command that benchmarks the rent roll reader engines against each other.
+
+For each workbook, the command times how long each engine takes to read the sheet and to run the full `read_xlsx_file` pipeline, and checks that every engine produces the same property document as the 'pandas' engine.
+
+Usage:
+    python manage.py benchmark_xlsx_engines [paths ...] [--repeat N] [--stages]
+
+With --stages, the time taken by each stage of the pipeline in the last run is listed under each engine.
+
+When no paths are given, the test layouts named by the 01_TEST_FILE_NAME to 07_TEST_FILE_NAME environment variables are used, along with good_test_data.xlsx.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from leasepeek.readers.xlsx import read_xlsx_file
+from leasepeek.readers.xlsx_stream import iter_xlsx_rows
+from leasepeek.readers.xlsx_sax import iter_sheet_rows
+import pandas as pd
+import os
+import time
+
+# Test layouts used by the data validation tests.
+test_data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'tests', 'test_data')
+test_file_variables = [f'0{i}_TEST_FILE_NAME' for i in range(1, 8)]
+
+# How each engine reads a sheet, without the rest of the pipeline.
+sheet_readers = {
+    'pandas': lambda path: pd.read_excel(path, header=None),
+    'openpyxl': lambda path: sum(1 for _ in iter_xlsx_rows(path)),
+    'sax': lambda path: sum(1 for _ in iter_sheet_rows(path)),
+}
+
+def best_time(function, repeat):
+    """
+    Returns the fastest of `repeat` runs of `function`, in milliseconds, along with the value of the last run.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, result
+
+
+class Command(BaseCommand):
+    help = "Benchmarks the pandas, openpyxl and sax rent roll reader engines."
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help="Workbooks to benchmark. Defaults to the test layouts.")
+        parser.add_argument('--repeat', type=int, default=3, help="Number of runs per engine. The fastest run is reported.")
+        parser.add_argument('--stages', action='store_true', help="List the time taken by each pipeline stage.")
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or self.default_paths()
+        if not paths:
+            raise CommandError("No workbooks to benchmark.")
+
+        self.stdout.write(f"{'file':<40} {'engine':<10} {'read ms':>10} {'pipeline ms':>12}  document")
+        for path in paths:
+            if not os.path.exists(path):
+                raise CommandError(f"File not found: {path}")
+            file_name = os.path.basename(path)
+            reference = None
+            for engine, read_sheet in sheet_readers.items():
+                read_ms, _ = best_time(lambda: read_sheet(path), options['repeat'])
+                timings = {}
+                pipeline_ms, document = best_time(lambda: read_xlsx_file(path, 'benchmark', file_name, engine=engine, timings=timings), options['repeat'])
+                document.pop('date')
+                if reference is None:
+                    reference = document
+                matches = 'reference' if engine == 'pandas' else ('identical' if document == reference else 'DIFFERS')
+                self.stdout.write(f"{file_name[:40]:<40} {engine:<10} {read_ms:>10.1f} {pipeline_ms:>12.1f}  {matches}")
+                if options['stages']:
+                    for stage_name, stage_ms in timings.items():
+                        self.stdout.write(f"{'':<40}   {stage_name:<32} {stage_ms:>10.1f}")
+
+    def default_paths(self):
+        names = ['good_test_data.xlsx'] + [os.environ.get(variable) for variable in test_file_variables]
+        return [os.path.join(test_data_dir, name) for name in names if name]
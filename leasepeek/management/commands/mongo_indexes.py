@@ -0,0 +1,31 @@
+"""
+Management command that builds the MongoDB indexes declared in `leasepeek.mongo_indexes` and reports how much they are used.
+
+Usage:
+    python manage.py mongo_indexes [--stats]
+
+Indexes that already exist are left as they are, so the command can be run on every deployment. With --stats, the number of operations that used each index of the managed collections, as reported by `$indexStats`, is listed afterwards. Indexes that exist in the database but aren't declared are flagged as unmanaged.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from leasepeek.mongo_indexes import ensure_indexes, index_usage
+from pymongo.errors import PyMongoError
+
+
+class Command(BaseCommand):
+    help = "Builds the managed MongoDB indexes and reports their usage."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stats', action='store_true', help="List how often each index was used, with $indexStats.")
+
+    def handle(self, *args, **options):
+        try:
+            for collection_name, index_names in ensure_indexes().items():
+                self.stdout.write(f"{collection_name}: {', '.join(index_names)}")
+
+            if options['stats']:
+                self.stdout.write(f"\n{'collection':<12} {'index':<24} {'operations':>12}  since")
+                for usage in index_usage():
+                    name = usage['name'] if usage['managed'] else f"{usage['name']} (unmanaged)"
+                    self.stdout.write(f"{usage['collection']:<12} {name:<24} {usage['operations']:>12}  {usage['since']:%Y-%m-%d %H:%M}")
+        except PyMongoError as e:
+            raise CommandError(f"Could not reach MongoDB: {e}")
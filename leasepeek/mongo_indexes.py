@@ -0,0 +1,103 @@
+"""
+Module Description:
+This module declares the MongoDB indexes the views and data updaters rely on, builds them, and reports how much they are used.
+
+Creating an index that already exists with the same keys and options does nothing, so `ensure_indexes` can run every time the
+application starts (see `LeasepeekConfig.ready`) as well as from the `mongo_indexes` management command.
+
+Functions:
+- ensure_indexes: Builds the managed indexes that don't exist yet.
+- index_usage: Reports how often each index of the managed collections was used, with `$indexStats`.
+- ensure_indexes_in_background: Builds the managed indexes once per process, without blocking the caller.
+
+Variables:
+- managed_indexes: The managed indexes of each collection.
+"""
+from .mongo_models import data_collection, units_collection
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import PyMongoError
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# The managed indexes of each collection.
+managed_indexes = {
+    data_collection: [
+        # The properties of a user; read_excel_data and the updaters also match on '_id', which has its own index.
+        IndexModel([('user_id', ASCENDING)], name='user_id'),
+        # read_user_data pages through the properties of a user in '_id' order.
+        IndexModel([('user_id', ASCENDING), ('_id', ASCENDING)], name='user_id__id'),
+        # The properties of a user by 'as of' date, and by building.
+        IndexModel([('user_id', ASCENDING), ('asOf', ASCENDING)], name='user_id_asOf'),
+        IndexModel([('user_id', ASCENDING), ('location.buildingName', ASCENDING)], name='user_id_buildingName'),
+    ],
+    units_collection: [
+        # The units of a property, in rent roll order (see `leasepeek.unit_storage`).
+        IndexModel([('property_id', ASCENDING), ('seq', ASCENDING)], name='property_id_seq', unique=True),
+    ],
+}
+
+# Whether `ensure_indexes_in_background` has started in this process.
+_ensure_started = False
+_ensure_lock = threading.Lock()
+
+def ensure_indexes():
+    """
+    Builds the managed indexes that don't exist yet. Indexes that already exist are left as they are.
+
+    Returns:
+    - dict: The names of the managed indexes, by collection name.
+    """
+    created = {}
+    for collection, indexes in managed_indexes.items():
+        created[collection.name] = collection.create_indexes(indexes)
+        logger.info(f"Indexes of '{collection.name}': {', '.join(created[collection.name])}")
+    return created
+
+
+def index_usage():
+    """
+    Reports how often each index of the managed collections was used, with the `$indexStats` aggregation stage.
+
+    The counts are kept by each server since it started or the index was created, so an index with no operations since a long time ago is a candidate for removal.
+
+    Returns:
+    - list: A dict per index, with the 'collection', the index 'name', whether it is 'managed', its number of 'operations' and the time it was counted 'since'.
+    """
+    usage = []
+    for collection, indexes in managed_indexes.items():
+        managed_names = {'_id_'} | {index.document['name'] for index in indexes}
+        for stats in collection.aggregate([{'$indexStats': {}}]):
+            usage.append({
+                'collection': collection.name,
+                'name': stats['name'],
+                'managed': stats['name'] in managed_names,
+                'operations': stats['accesses']['ops'],
+                'since': stats['accesses']['since'],
+            })
+    return usage
+
+
+def ensure_indexes_in_background():
+    """
+    Builds the managed indexes on a background thread, once per process, so startup doesn't wait on the database. Failures are logged rather than raised, since the indexes only affect query performance.
+
+    Returns:
+    - threading.Thread: The thread building the indexes, or None if it was already started in this process.
+    """
+    global _ensure_started
+    with _ensure_lock:
+        if _ensure_started:
+            return None
+        _ensure_started = True
+
+    def build():
+        try:
+            ensure_indexes()
+        except PyMongoError as e:
+            logger.warning(f"Could not build the MongoDB indexes: {e}")
+
+    thread = threading.Thread(target=build, name='ensure-mongo-indexes', daemon=True)
+    thread.start()
+    return thread
@@ -1,9 +1,14 @@
 """
 Database Connection Module for leasepeek_backend Project.
 
-This module establishes a connection to the MongoDB database and specifically targets the 'data' collection within the database. It leverages the connection settings defined in the `db_connection` module to interact with MongoDB.
+This module establishes a connection to the MongoDB database and targets its collections. It leverages the connection settings defined in the `db_connection` module to interact with MongoDB.
+
+Collections:
+- data_collection: One document per uploaded rent roll, holding the property summaries.
+- units_collection: The unit rows of each property, one document per unit keyed by 'property_id' and 'seq', its position in the rent roll. Properties stored before units had their own collection embed them under 'data' instead.
 """
 
 from db_connection import db
 
 data_collection = db['data']
+units_collection = db['units']
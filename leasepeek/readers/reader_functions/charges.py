@@ -1,6 +1,9 @@
+from leasepeek.readers.reader_functions.money import to_cents, from_cents
+
 def charge_codes(unit_data, loss_to_lease):
+    # Charges are totalled in cents and reported in dollars
     charges = {'rent': {
-        'value': loss_to_lease['rentIncome'],
+        'value': to_cents(loss_to_lease['rentIncome']),
         'type': 'contractualRent',
     }}
 
@@ -8,11 +11,14 @@ def charge_codes(unit_data, loss_to_lease):
         for charge in unit['charges']:
             code = charge['code']
             if code in charges:
-                charges[code]['value'] += charge['value']
+                charges[code]['value'] += to_cents(charge['value'])
             else:
                 charges[code] = {
-                    'value': charge['value'],
+                    'value': to_cents(charge['value']),
                     'type': ''
                 }
 
+    for charge in charges.values():
+        charge['value'] = from_cents(charge['value'])
+
     return charges
\ No newline at end of file
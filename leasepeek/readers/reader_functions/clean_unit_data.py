@@ -3,17 +3,37 @@ This module is designed to clean and standardize rental property unit data extra
 
 It contains predefined keywords related to real estate units, charge codes, and various data descriptors, utilizing these to identify, categorize, and clean specific data points from the input data structure.
 
-The main function in this module interprets individual data entries, recognizing the associated category of each piece of information, and cleanses this data into a consistent and structured format.
+The main function in this module interprets individual data entries, recognizing the associated category of each piece of information, and cleanses this data into a consistent and structured format. Amounts are stored in integer cents (see `leasepeek.readers.reader_functions.money`).
 
 Functions:
     classify_key(key: str) -> str: Categorizes a single piece of data based on predefined keywords.
-    clean_unit_data(data_array: list) -> list: Processes an array of dictionaries, each representing a unit's raw data, and standardizes and cleans this data into a uniform structure.
+    key_schema(key: str) -> tuple: Works out the category and cleaning step of a single key.
+    clean_unit_data(data_array: list) -> tuple: Processes an array of dictionaries, each representing a unit's raw data, and standardizes and cleans this data into uniform `UnitRecord`s, along with a report of the values that couldn't be parsed.
 
 Variables:
     unit_keywords, address_keywords, floorplan_keywords, ... , charge_codes, negative_charge_codes: Sets of keywords and codes used for data categorization and identification during the cleaning process.
+    keyword_categories, key_categories: The keyword groupings in classification order, and the lookup table compiled from them.
+    NumericCell: A numeric value set aside to be parsed with the rest of its column.
 """
+from collections import namedtuple
 from datetime import datetime
-from decimal import Decimal
+
+from leasepeek.readers.reader_functions.numeric_columns import parse_numeric_column
+from leasepeek.readers.reader_functions.money import to_cents
+from leasepeek.readers.reader_functions.lease_dates import parse_unit_dates
+from leasepeek.readers.reader_functions.unit_record import UnitRecord, UnitCharge
+
+# The kind of number each numeric cleaning step parses its column into.
+step_kinds = {'integer': 'integer', 'dollars': 'integer', 'cents': 'cents'}
+
+# A numeric value set aside to be parsed with the rest of its column:
+# - unit: The record of the unit the value belongs to.
+# - target: The record the parsed value is stored on, the unit itself or one of its charges.
+# - field: The field of the target the parsed value is stored in.
+# - key: The key the value was read under.
+# - value: The raw value.
+# - negative_charge: Whether the value is a charge stored as a negative number.
+NumericCell = namedtuple('NumericCell', ['unit', 'target', 'field', 'key', 'value', 'negative_charge'])
 
 # Sets of keyword groupings used to classify data from an input source. Each list contains variations or possible headings found in the dataset that represent the same type of information
 unit_keywords = {'Unit', 'Bldg/Unit', 'Unit Number'}
@@ -41,6 +61,42 @@ negative_charge_codes = {'MODE-Model', 'LTOL-Loss To Lease In Force', 'VAC -Vaca
 vacancy_loss_charge_codes = {'VAC -Vacancy Loss'}
 model_loss_charge_codes = {'MODE-Model'}
 
+# The keyword groupings in the order they are checked when classifying a key, paired with the category they represent. A key found in more than one grouping belongs to the first one.
+keyword_categories = (
+    ('unit', unit_keywords),
+    ('leaseDates', lease_keywords),
+    ('address', address_keywords),
+    ('floorplan', floorplan_keywords),
+    ('sqft', sqft_keywords),
+    ('market', market_keywords),
+    ('rent', rent_keywords),
+    ('status', status_keywords),
+    ('tenant', tenant_keywords),
+    ('residentId', resident_id_keywords),
+    ('moveIn', move_in_keywords),
+    ('moveOut', move_out_keywords),
+    ('leaseStart', lease_start_keywords),
+    ('leaseExpire', lease_expire_keywords),
+    ('residentDeposit', resident_deposit_keywords),
+    ('otherDeposit', other_deposit_keywords),
+    ('balance', balance_keywords),
+    ('total', total_keywords),
+    ('charges', charge_codes),
+)
+
+# Every keyword mapped straight to its category, so a key is classified with a single lookup.
+key_categories = {}
+for category, keywords in keyword_categories:
+    for keyword in keywords:
+        key_categories.setdefault(keyword, category)
+
+# Categories grouped by how their values are cleaned.
+field_categories = {'unit', 'address', 'floorplan', 'tenant', 'residentId', 'status', 'moveIn', 'moveOut', 'leaseStart', 'leaseExpire'}
+integer_categories = {'sqft'}
+# Amounts rounded to whole dollars, and amounts kept to the cent. Both are stored in cents.
+dollar_categories = {'rent', 'total', 'market', 'residentDeposit', 'otherDeposit'}
+cents_categories = {'balance'}
+
 def classify_key(key):
     """
     Classify a given key into predefined categories based on the keyword groupings.
@@ -51,186 +107,88 @@ def classify_key(key):
     Returns:
     str: A string that represents the category into which the key is classified. If the key does not match any predefined category, it is classified as 'unclassified'.
     """
+    return key_categories.get(key, 'unclassified')
 
-    # Check if the key matches any of the 'Unit' keywords.
-    if any(keyword == key for keyword in unit_keywords):
-        return 'unit'
 
-    # Check if the key matches any of the 'Lease Dates' keywords.
-    if any(keyword == key for keyword in lease_keywords):
-        return 'leaseDates'
+def key_schema(key):
+    """
+    Works out how the values of a given key are cleaned.
 
-    # Check if the key matches any of the 'Address' keywords.
-    if any(keyword == key for keyword in address_keywords):
-        return 'address'
+    Args:
+    key (str): The key from the input data.
 
-    # Check if the key matches any of the 'Floor Plan Type' keywords.
-    elif any(keyword == key for keyword in floorplan_keywords):
-        return 'floorplan'
-    
-    # Check if the key matches any of the 'Unit Sq Ft' keywords.
-    elif any(keyword == key for keyword in sqft_keywords):
-        return 'sqft'
-    
-    # Check if the key matches any of the 'Market Value' keywords.
-    elif any(keyword == key for keyword in market_keywords):
-        return 'market'
-    
-    # Check if the key matches any of the 'Rent Charge' keywords.
-    elif any(keyword == key for keyword in rent_keywords):
-        return 'rent'
-    
-    # Check if the key matches any of the 'Unit Status' keywords.
-    elif any(keyword == key for keyword in status_keywords):
-        return 'status'
-    
-    # Check if the key matches any of the 'Tenant Name' keywords.
-    elif any(keyword == key for keyword in tenant_keywords):
-        return 'tenant'
-    
-    # Check if the key matches any of the 'Tenant ID' keywords.
-    elif any(keyword == key for keyword in resident_id_keywords):
-        return 'residentId'
-    
-    # Check if the key matches any of the 'Move In Date' keywords.
-    elif any(keyword == key for keyword in move_in_keywords):
-        return 'moveIn'
-    
-    # Check if the key matches any of the 'Move Out Date' keywords.
-    elif any(keyword == key for keyword in move_out_keywords):
-        return 'moveOut'
-    
-    # Check if the key matches any of the 'Lease Start Date' keywords.
-    elif any(keyword == key for keyword in lease_start_keywords):
-        return 'leaseStart'
-    
-    # Check if the key matches any of the 'Lease Expire Date' keywords.
-    elif any(keyword == key for keyword in lease_expire_keywords):
-        return 'leaseExpire'
-    
-    # Check if the key matches any of the 'Resident Deposit' keywords.
-    elif any(keyword == key for keyword in resident_deposit_keywords):
-        return 'residentDeposit'
-    
-    # Check if the key matches any of the 'Other Deposit' keywords.
-    elif any(keyword == key for keyword in other_deposit_keywords):
-        return 'otherDeposit'
-    
-    # Check if the key matches any of the 'Outstanding Balance' keywords.
-    elif any(keyword == key for keyword in balance_keywords):
-        return 'balance'
-    
-    # Check if the key matches any of the 'Total Value of Combined Charges' keywords.
-    elif any(keyword == key for keyword in total_keywords):
-        return 'total'
-    
-    # Check if the key matches any of the 'Charges (excl. rent)' keywords.
-    elif any(keyword == key for keyword in charge_codes):
-        return 'charges'
-    
-    # If the key doesn't match any category, classify as 'unclassified'.
+    Returns:
+    tuple: The category of the key, the cleaning step applied to its values ('field', 'integer', 'dollars', 'cents', 'charge', 'leaseDates' or 'unclassified'), and whether the key is a negative charge code.
+    """
+    category = classify_key(key)
+    if category in field_categories:
+        step = 'field'
+    elif category in integer_categories:
+        step = 'integer'
+    elif category in dollar_categories:
+        step = 'dollars'
+    elif category in cents_categories:
+        step = 'cents'
+    elif category == 'charges':
+        step = 'charge'
+    elif category == 'leaseDates':
+        step = 'leaseDates'
     else:
-        return 'unclassified'
+        step = 'unclassified'
+    return category, step, key in negative_charge_codes
 
 
 def clean_unit_data(data_array):
     """
     Clean and structure raw data into a more uniform format.
 
-    This function takes an array of dictionaries (representing rental property units) and cleans/converts relevant information into a standardized format. Irrelevant or unclassified data is preserved in the 'unclassified' field of the resulting dictionaries.
+    This function takes an array of dictionaries (representing rental property units) and cleans/converts relevant information into a standardized format. Irrelevant or unclassified data is preserved in the 'unclassified' field of the resulting records, which behave like dictionaries (see `leasepeek.readers.reader_functions.unit_record`). The unit's dates are also parsed into day ordinals under 'dates', for the date-based analyses; that field isn't stored.
+
+    Numeric values are parsed a whole column at a time with `parse_numeric_column`. Values that can't be parsed are set to 0 and reported in the parse diagnostics rather than one message per cell.
 
     Args:
     data_array (list): A list of dictionaries where each dictionary represents a unit and contains various information about it.
 
     Returns:
-    list: A list of cleaned dictionaries with a uniform structure, ready for analysis.
+    tuple: A list of cleaned `UnitRecord`s with a uniform structure, ready for analysis, and the parse diagnostics: a dictionary with the 'unit', 'key' and raw 'value' of each value that couldn't be parsed.
     """
     # Initialize an empty list to hold the cleaned data.
     cleaned_data = []
 
+    # The schema of the file: how each key is cleaned. Every unit of a file shares the same handful of keys, so each key is only classified the first time it is seen.
+    schema = {}
+
+    # The numeric cells of every unit, grouped into columns by how they are parsed.
+    numeric_cells = {'integer': [], 'dollars': [], 'cents': []}
 
     for entry in data_array:
 
-        # Initialize a dictionary with the structure we want each unit of data to have after cleaning.
-        cleaned_entry = {
-            'unit': None,
-            'address': None,
-            'floorplan': None,
-            'sqft': 0,
-            'market': 0,
-            'rent': 0,
-            'status': None,
-            'tenant': None,
-            'residentId': None,
-            'moveIn': None,
-            'moveOut': None,
-            'leaseStart': None,
-            'leaseExpire': None,
-            'residentDeposit': 0,
-            'otherDeposit': 0,
-            'balance': 0,
-            'total': 0,
-            'renovated': False,
-            'charges': [],
-            'unclassified': {}
-        }
+        # Initialize a record with the structure we want each unit of data to have after cleaning.
+        cleaned_entry = UnitRecord()
 
         # Iterate through each key-value pair in the current unit's dictionary.
         for key, value in entry.items():
-            # Determine the category of the current key using the classify_key function.
-            category = classify_key(key)
+            # Look up how the current key is cleaned, classifying it if it hasn't been seen in this file yet.
+            if key not in schema:
+                schema[key] = key_schema(key)
+            category, step, negative_charge = schema[key]
 
             # If the key belongs to certain predefined categories, assign the value to the corresponding field in the cleaned_entry.
-            if category in {'unit', 'address', 'floorplan', 'tenant', 'residentId', 'status', 'moveIn', 'moveOut', 'leaseStart','leaseExpire'}:
+            if step == 'field':
                 cleaned_entry[category] = value
 
-            # If the key belongs to categories related to monetary values, perform additional cleaning and conversion.
-            elif category in ['rent', 'total', 'market', 'residentDeposit', 'otherDeposit', 'sqft']:
-                # If the value is a string, clean it by removing certain characters and whitespace, then attempt to convert it to an integer.
-                if isinstance(value, str):
-                    value = value.replace('*', '').replace(',', '').strip()
-                    try:
-                        value = int(round(float(value)))
-                    except ValueError:
-                        # If conversion fails, log an error and keep the original raw value.
-                        print(f"Error converting '{value}' to integer for key '{key}'. Using raw value.")
-                # Assign the cleaned/conversion_attempted value to the corresponding field in the cleaned_entry.
-                if value == '':
-                    cleaned_entry[category] = 0
-                else:
-                    cleaned_entry[category] = value
-
-            # If the key belongs to categories related to monetary values with fixed-point arithmetic, perform additional cleaning and conversion
-            elif category in ['balance']:
-                if isinstance(value, str):
-                    value = value.replace('*', '').replace(',', '').strip()   
-                if value == '':
-                    cleaned_entry[category] = 0
-                else:
-                    value = Decimal(value)
-                    cleaned_entry[category] = value
-                
-            # Process entries categorized as 'charges'.
-            elif category == 'charges':
-                # Check if the value associated with the charge is a string.
-                if isinstance(value, str):
-                    # Remove any '*' or ',' characters and strip whitespace, as these can interfere with numerical conversion.
-                    value = value.replace('*', '').replace(',', '').strip()
-                    # Attempt to convert the cleaned string to a float
-                    try:
-                        value = float(value)
-                    except ValueError:
-                        # If the conversion fails (e.g., if the string contains non-numeric characters), log an error message and retain the original string value.
-                        print(f"Error converting '{value}' to integer for key '{key}'. Using raw value.")
-                # Check if the current key is in the list of codes representing negative charges.
-                if key in negative_charge_codes:
-                    # Ensure the value is stored as a negative number.
-                    value = -abs(value)
-                # Append a new dictionary to the 'charges' list in the cleaned_entry. 
-                cleaned_entry['charges'].append({'code': key, 'value': value})
+            # Numeric values are set aside and parsed column by column once every unit has been read.
+            elif step in numeric_cells:
+                numeric_cells[step].append(NumericCell(cleaned_entry, cleaned_entry, category, key, value, False))
+
+            # Process entries categorized as 'charges'. Their amounts are parsed along with the other numeric values.
+            elif step == 'charge':
+                charge = UnitCharge(key, value)
+                cleaned_entry['charges'].append(charge)
+                numeric_cells['cents'].append(NumericCell(cleaned_entry, charge, 'value', key, value, negative_charge))
             
             # If the key indicates lease dates (two dates in a single string) and the value has a specific length (21 = MM/DD/YYYY + ' ' + MM/DD/YYYY), split the value into separate 'leaseStart' and 'leaseExpire' dates.
-            elif category == 'leaseDates':
+            elif step == 'leaseDates':
                 if len(value) == 21:
                     # Split the value into start and end dates.
                     start, end = value.split()
@@ -241,14 +199,34 @@ def clean_unit_data(data_array):
             else:
                 cleaned_entry['unclassified'][key] = value
 
-        for charge in cleaned_entry.get('charges', []):
+        # Parse the unit's dates once, for the date-based analyses. The text of each date is kept as it is.
+        cleaned_entry['dates'] = parse_unit_dates(cleaned_entry)
+
+        # Add the cleaned_entry record to the cleaned_data list.
+        cleaned_data.append(cleaned_entry)
+
+    # Parse each numeric column in one go: sizes, rents and deposits written as text are rounded to whole numbers, and balances and charges to the cent. Amounts are stored in integer cents.
+    diagnostics = []
+    for step, cells in numeric_cells.items():
+        values, failed_positions = parse_numeric_column([cell.value for cell in cells], step_kinds[step])
+        # Dollar amounts are converted to cents with `to_cents`, so numeric cells holding cents, such as 512.05, are rounded to an exact integer rather than carried as float cents.
+        if step == 'dollars':
+            values = [to_cents(value) for value in values]
+        for cell, value in zip(cells, values):
+            # Ensure charges with negative charge codes are stored as negative numbers.
+            cell.target[cell.field] = -abs(value) if cell.negative_charge else value
+        # Values that can't be parsed are set to 0 and reported against the unit they came from.
+        for position in failed_positions:
+            cell = cells[position]
+            diagnostics.append({'unit': cell.unit['unit'], 'key': cell.key, 'value': cell.value})
+
+    # Fold vacancy and model losses into the unit's rent.
+    for cleaned_entry in cleaned_data:
+        for charge in cleaned_entry['charges']:
             if charge['code'] in vacancy_loss_charge_codes:
                 cleaned_entry['rent'] += charge['value']
             elif charge['code'] in model_loss_charge_codes:
                 cleaned_entry['rent'] += charge['value']
 
-        # Add the cleaned_entry dictionary to the cleaned_data list.
-        cleaned_data.append(cleaned_entry)
-
-    # Return the list of cleaned data.
-    return cleaned_data
\ No newline at end of file
+    # Return the list of cleaned data, along with the values that couldn't be parsed.
+    return cleaned_data, diagnostics
\ No newline at end of file
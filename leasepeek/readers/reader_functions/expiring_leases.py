@@ -1,22 +1,10 @@
-from datetime import datetime, timedelta
-
-def determine_date_format(date_str):
-        parts = date_str.split("/")
-
-        if len(parts) != 3:
-            raise ValueError("Invalid date format")
-        
-        first, third = parts[0], parts[2]
-        if len(first) == 4 and first.isdigit():
-            return "%Y/%m/%d"
-        elif len(third) == 4 and third.isdigit():
-            return "%m/%d/%Y"
-        else:
-            raise ValueError("Unknown date format")
+from datetime import datetime
+from leasepeek.readers.reader_functions.lease_dates import unit_dates
+from leasepeek.readers.reader_functions.money import to_cents, from_cents
 
 def expiring_leases(unit_data, as_of_date_str):
-    as_of_date = datetime.strptime(as_of_date_str, "%m/%d/%Y")
-    ninety_days_from_as_of_date = as_of_date + timedelta(days=90)
+    as_of_date = datetime.strptime(as_of_date_str, "%m/%d/%Y").toordinal()
+    ninety_days_from_as_of_date = as_of_date + 90
     floorplan_expiration_data = {}
 
     # Initialize floorplan data for all floorplans in unit_data
@@ -31,20 +19,21 @@ def expiring_leases(unit_data, as_of_date_str):
     for unit in unit_data:
         floorplan = unit['floorplan']
         if unit['leaseExpire']:
-            try:
-                expire_str = unit['leaseExpire'].replace('.', '/').replace('_', '/').replace('-', '/')
-                date_format = determine_date_format(expire_str)
-                lease_expire_date = datetime.strptime(expire_str, date_format)
+            lease_expire_date = unit_dates(unit)['leaseExpire']
 
-                if lease_expire_date >= as_of_date and lease_expire_date <= ninety_days_from_as_of_date:
-                    floorplan_expiration_data[floorplan]['expiring_in_90_days']['count'] += 1
-                    floorplan_expiration_data[floorplan]['expiring_in_90_days']['total_rent'] += unit['rent']
-                elif lease_expire_date <= as_of_date:
-                    floorplan_expiration_data[floorplan]['expired']['count'] += 1
-                    floorplan_expiration_data[floorplan]['expired']['total_rent'] += unit['rent']
-            
-            except ValueError:
-                # The date format is not valid or is empty
+            if lease_expire_date is None:
+                # The date format is not valid
                 print(f"Can not determine lease expire of unit. Invalid date format for unit: {unit}")
+            elif lease_expire_date >= as_of_date and lease_expire_date <= ninety_days_from_as_of_date:
+                floorplan_expiration_data[floorplan]['expiring_in_90_days']['count'] += 1
+                floorplan_expiration_data[floorplan]['expiring_in_90_days']['total_rent'] += to_cents(unit['rent'])
+            elif lease_expire_date <= as_of_date:
+                floorplan_expiration_data[floorplan]['expired']['count'] += 1
+                floorplan_expiration_data[floorplan]['expired']['total_rent'] += to_cents(unit['rent'])
+
+    # Rents are totalled in cents and reported in dollars
+    for expirations in floorplan_expiration_data.values():
+        for expiration in expirations.values():
+            expiration['total_rent'] = from_cents(expiration['total_rent'])
 
     return floorplan_expiration_data
\ No newline at end of file
@@ -7,5 +7,6 @@ def filter_personal_info(unit_data):
         unit.pop('address')
         unit.pop('residentId')
         unit.pop('unclassified')
+        unit.pop('dates', None)
 
     return unit_data
\ No newline at end of file
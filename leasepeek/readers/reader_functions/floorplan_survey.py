@@ -1,63 +1,156 @@
-# Defaultdict automatically initializes dictionary entries to a default value if the key has not been set yet. This means one doesn't need to check if the key exists in the dictionary before appending to it.
-from collections import defaultdict
+import numpy as np
+from leasepeek.readers.reader_functions.money import to_cents, from_cents
+from leasepeek.readers.reader_functions.status_resolution import non_surveyed_keywords as ignore_unit_keywords, occupied_keywords
 
-ignore_unit_keywords = {'upcoming', 'approved', 'Future Residents/Applicants', 'Applicant', 'applicant', 'Pending renewal', 'Former resident', 'Former applicant'}
-occupied_keywords = {'Occupied', 'occupied', 'Occupied-NTV', 'Occupied-NTVL', 'O', 'NR', 'NU'}
+# The rent distribution statistics reported with each floorplan, over its occupied units.
+distribution_keys = ('medianRent', 'p25Rent', 'p75Rent', 'rentPerSqft')
 
-def floorplan_survey(data):
-    # Initialize floor plans dictionary that will be returned using defaultdict
-    floorplans = defaultdict(list)
-
-    # Add unit floor plan data to the floor_plans dictionary
-    for unit in data:
-        if unit['status'] not in ignore_unit_keywords:
-            try:
-                market = unit['market']
-                rent = unit['rent']
-                sqft = unit['sqft']
-                status = unit['status']
-                floorplans[unit['floorplan']].append({'market': market, 'rent': rent, 'sqft': sqft, 'status': status})
-            except (ValueError, TypeError) as e:
-                print(f"Error converting values for unit. Details: {e}")
-        else:
+def group_codes(values):
+    """
+    Numbers the distinct values of a column in order of first appearance.
+
+    Parameters:
+        values (list): The column.
+
+    Returns:
+        tuple: The code of each value as an integer array, and the distinct values in code order.
+    """
+    groups = {}
+    codes = np.fromiter((groups.setdefault(value, len(groups)) for value in values), dtype=np.int64, count=len(values))
+    return codes, list(groups)
+
+
+def group_sums(codes, values, group_count, dtype=np.int64):
+    """
+    Sums a column per group.
+
+    Parameters:
+        codes (ndarray): The group code of each value.
+        values (list): The column.
+        group_count (int): The number of groups.
+        dtype (type): The type the column is summed as. Amounts in cents are summed exactly as integers; columns that may hold fractions, such as square footage, are summed as floats.
+
+    Returns:
+        list: The sum of each group, as Python numbers.
+    """
+    sums = np.zeros(group_count, dtype=dtype)
+    np.add.at(sums, codes, np.asarray(values, dtype=dtype))
+    return sums.tolist()
+
+
+def group_percentiles(codes, values, group_count, percentiles):
+    """
+    Computes percentiles of a column per group.
+
+    The column is sorted by group and value once, and every percentile of every group is then interpolated linearly between its two closest ranks, as `np.percentile` does, without looping over the groups.
+
+    Parameters:
+        codes (ndarray): The group code of each value.
+        values (list): The column.
+        group_count (int): The number of groups.
+        percentiles (iterable): The percentiles to compute, between 0 and 100.
+
+    Returns:
+        dict: For each percentile, an array of its value in each group. Groups without values get 0.
+    """
+    column = np.asarray(values, dtype=float)
+    sorted_values = column[np.lexsort((column, codes))]
+    counts = np.bincount(codes, minlength=group_count)
+    starts = np.cumsum(counts) - counts
+    has_values = counts > 0
+    last = max(len(sorted_values) - 1, 0)
+
+    results = {}
+    for percentile in percentiles:
+        positions = starts + percentile / 100 * np.maximum(counts - 1, 0)
+        lower = np.minimum(np.floor(positions).astype(np.int64), last)
+        upper = np.minimum(np.ceil(positions).astype(np.int64), last)
+        if not len(sorted_values):
+            results[percentile] = np.zeros(group_count)
             continue
+        fraction = positions - lower
+        interpolated = sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+        results[percentile] = np.where(has_values, interpolated, 0)
+    return results
+
+
+def summarize_floorplans(floorplans, markets, rents, sqfts, statuses, occupied):
+    """
+    Summarizes the surveyed units of each floorplan with a single grouped aggregation.
+
+    The units are given as columns. Every floorplan is numbered once, and the sums, counts, status counts and rent percentiles of all floorplans are then computed column by column instead of floorplan by floorplan.
+
+    Parameters:
+        floorplans (list): The floorplan of each surveyed unit, in unit order.
+        markets (list): The market rent of each unit, in cents.
+        rents (list): The rent of each unit, in cents.
+        sqfts (list): The square footage of each unit.
+        statuses (list): The canonical status of each unit.
+        occupied (list): Whether each unit is occupied. Only occupied units count towards the rent statistics.
+
+    Returns:
+        dict: The survey of each floorplan, in order of first appearance, with its amounts in dollars.
+    """
+    codes, plans = group_codes(floorplans)
+    plan_count = len(plans)
+    if not plan_count:
+        return {}
 
-    # Modify the floorplans dictionary to give relevant information
-    for plan, units in floorplans.items():
-        market_sum = sum(unit['market'] for unit in units)
-        plan_count = len(units)
-        rent_sum = sum(unit['rent'] for unit in units if unit['status'] in occupied_keywords)
-        rent_count = sum(1 for unit in units if unit['status'] in occupied_keywords)
-        sqft_sum = sum(unit['sqft'] for unit in units)
-        avg_market = round(market_sum / plan_count, 2)
-        avg_rent = round(rent_sum / rent_count, 2) if rent_count > 0 else 0
-        avg_sqft = round(sqft_sum / plan_count, 2) if sqft_sum > 0 else 0
-        
-        status_count = {}
-        for unit in units:
-            status = unit['status']
-            if status in status_count:
-                status_count[status] += 1
-            else:
-                status_count[status] = 1
-
-        floorplans[plan] = {
-            'avgRent': avg_rent,
-            'sumRent': rent_sum,
-            'avgMarket': avg_market,
-            'sumMarket': market_sum,
-            'unitCount': plan_count,
-            'avgSqft': avg_sqft,
-            'unitStatuses': status_count,
+    occupied = np.asarray(occupied, dtype=bool)
+    occupied_codes = codes[occupied]
+    occupied_rents = [rent for rent, is_occupied in zip(rents, occupied.tolist()) if is_occupied]
+    occupied_sqfts = [sqft for sqft, is_occupied in zip(sqfts, occupied.tolist()) if is_occupied]
+
+    market_sums = [from_cents(total) for total in group_sums(codes, markets, plan_count)]
+    sqft_sums = group_sums(codes, sqfts, plan_count, dtype=np.float64)
+    unit_counts = np.bincount(codes, minlength=plan_count).tolist()
+    rent_sums = [from_cents(total) for total in group_sums(occupied_codes, occupied_rents, plan_count)]
+    rent_counts = np.bincount(occupied_codes, minlength=plan_count).tolist()
+    occupied_sqft_sums = group_sums(occupied_codes, occupied_sqfts, plan_count, dtype=np.float64)
+    rent_percentiles = group_percentiles(occupied_codes, occupied_rents, plan_count, (25, 50, 75))
+
+    # Status counts, keyed by floorplan and status, each floorplan's statuses in order of first appearance.
+    status_codes, status_names = group_codes(statuses)
+    pairs = codes * len(status_names) + status_codes
+    distinct_pairs, first_seen, pair_counts = np.unique(pairs, return_index=True, return_counts=True)
+    unit_statuses = [{} for plan in plans]
+    for position in np.argsort(first_seen, kind='stable').tolist():
+        plan_code, status_code = divmod(int(distinct_pairs[position]), len(status_names))
+        unit_statuses[plan_code][status_names[status_code]] = int(pair_counts[position])
+
+    survey = {}
+    for code, plan in enumerate(plans):
+        rent_count = rent_counts[code]
+        survey[plan] = {
+            'avgRent': round(rent_sums[code] / rent_count, 2) if rent_count > 0 else 0,
+            'sumRent': rent_sums[code],
+            'avgMarket': round(market_sums[code] / unit_counts[code], 2),
+            'sumMarket': market_sums[code],
+            'unitCount': unit_counts[code],
+            'avgSqft': round(sqft_sums[code] / unit_counts[code], 2) if sqft_sums[code] > 0 else 0,
+            'medianRent': round(float(rent_percentiles[50][code]) / 100, 2),
+            'p25Rent': round(float(rent_percentiles[25][code]) / 100, 2),
+            'p75Rent': round(float(rent_percentiles[75][code]) / 100, 2),
+            'rentPerSqft': round(rent_sums[code] / occupied_sqft_sums[code], 2) if occupied_sqft_sums[code] > 0 else 0,
+            'unitStatuses': unit_statuses[code],
             'planName': plan,
             'planType': 'residential',
             'beds': "0",
             'baths': "0",
             "renovated": False,
         }
+    return survey
+
+
+def floorplan_survey(data):
+    # Only survey units that are (or will soon be) leased out; applicants and former residents are left out.
+    surveyed = [unit for unit in data if unit['status'] not in ignore_unit_keywords]
 
-    # for i, plan in enumerate(floorplans):
-    #     print(f"07_TEST_FILE_FLOORPLAN_{i+1} = '{plan}'")
-        
-    # Convert defaultdict back to dic for the return value
-    return dict(floorplans)
\ No newline at end of file
+    return summarize_floorplans(
+        [unit['floorplan'] for unit in surveyed],
+        [to_cents(unit['market']) for unit in surveyed],
+        [to_cents(unit['rent']) for unit in surveyed],
+        [unit['sqft'] for unit in surveyed],
+        [unit['status'] for unit in surveyed],
+        [unit['status'] in occupied_keywords for unit in surveyed],
+    )
@@ -0,0 +1,138 @@
+"""
+This module parses the lease dates of rental units into day ordinals.
+
+Dates reach the cleaned unit data as text: 'YYYY-MM-DD' for date cells, or whatever the spreadsheet holds for text cells, typically 'MM/DD/YYYY' but also 'YYYY/MM/DD' or dates separated with '.', '-' or '_'. Each date is parsed once, when the units are cleaned, into a day ordinal (`date.toordinal()`). The date-based analyses compare and bucket those integers instead of parsing the text again. The text itself is stored unchanged.
+
+Functions:
+    parse_date_ordinal(value): Parses a date into a day ordinal.
+    parse_unit_dates(unit): Parses every date field of a unit.
+    unit_dates(unit): Returns the parsed date fields of a unit, parsing them if the unit wasn't cleaned with them.
+    lease_date_ordinal(unit, dates): Returns the date a unit's lease was signed.
+    month_index(ordinal): Returns the month of a day ordinal as a month index.
+    month_index_key(index): Formats a month index as 'YYYY-MM'.
+
+Variables:
+    date_fields: The date fields of a unit.
+    date_pattern: Pattern matching a date with the year either first or last.
+"""
+from datetime import date
+from functools import lru_cache
+import re
+
+# The date fields of a unit.
+date_fields = ('moveIn', 'moveOut', 'leaseStart', 'leaseExpire')
+
+# A date with a four digit year either first ('YYYY/MM/DD') or last ('MM/DD/YYYY'), separated with '/', '.', '-' or '_'.
+date_pattern = re.compile(r'(?:(\d{4})[/._-](\d{1,2})[/._-](\d{1,2})|(\d{1,2})[/._-](\d{1,2})[/._-](\d{4}))')
+
+@lru_cache(maxsize=4096)
+def parse_date_text(text):
+    """
+    Parses date text into a day ordinal. Cached by `parse_date_ordinal`.
+
+    Args:
+    text (str): The date text.
+
+    Returns:
+    int: The day ordinal of the date, or None if the text isn't a valid date.
+    """
+    match = date_pattern.fullmatch(text.strip())
+    if not match:
+        return None
+    if match.group(1):
+        year, month, day = match.group(1, 2, 3)
+    else:
+        month, day, year = match.group(4, 5, 6)
+    try:
+        return date(int(year), int(month), int(day)).toordinal()
+    except ValueError:
+        return None
+
+
+def parse_date_ordinal(value):
+    """
+    Parses a date into a day ordinal.
+
+    Rent rolls repeat the same handful of dates many times over, so parsed text is cached.
+
+    Args:
+    value (str): The date, with the year either first or last.
+
+    Returns:
+    int: The day ordinal of the date, or None if the value is empty or isn't a valid date.
+    """
+    if not isinstance(value, str):
+        return None
+    return parse_date_text(value)
+
+
+def parse_unit_dates(unit):
+    """
+    Parses every date field of a unit.
+
+    Args:
+    unit (dict): The data of a single rental unit.
+
+    Returns:
+    dict: The day ordinal of each of the `date_fields`, or None where the field is empty or invalid.
+    """
+    return {field: parse_date_ordinal(unit.get(field)) for field in date_fields}
+
+
+def unit_dates(unit):
+    """
+    Returns the parsed date fields of a unit.
+
+    Units cleaned by `clean_unit_data` carry their parsed dates under 'dates'. Units read back from the database don't, so their dates are parsed here.
+
+    Args:
+    unit (dict): The data of a single rental unit.
+
+    Returns:
+    dict: The day ordinal of each of the `date_fields`.
+    """
+    dates = unit.get('dates')
+    return dates if dates is not None else parse_unit_dates(unit)
+
+
+def lease_date_ordinal(unit, dates):
+    """
+    Returns the date a unit's lease was signed: its move in date, or its lease start date if it has no move in date.
+
+    Args:
+    unit (dict): The data of a single rental unit.
+    dates (dict): The parsed date fields of the unit, as returned by `unit_dates`.
+
+    Returns:
+    int: The day ordinal of the lease date, or None if it is missing or invalid.
+    """
+    return dates['moveIn'] if unit.get('moveIn') else dates['leaseStart']
+
+
+@lru_cache(maxsize=1024)
+def month_index(ordinal):
+    """
+    Returns the month of a day ordinal as a month index, `year * 12 + month - 1`, so consecutive months are consecutive integers.
+
+    Args:
+    ordinal (int): The day ordinal.
+
+    Returns:
+    int: The month index of the date.
+    """
+    day = date.fromordinal(ordinal)
+    return day.year * 12 + day.month - 1
+
+
+def month_index_key(index):
+    """
+    Formats a month index as 'YYYY-MM'.
+
+    Args:
+    index (int): The month index, as returned by `month_index`.
+
+    Returns:
+    str: The year and month.
+    """
+    year, month = divmod(index, 12)
+    return f'{year:04d}-{month + 1:02d}'
@@ -1,84 +1,71 @@
-from datetime import datetime, timedelta
-import calendar
+from datetime import datetime
+import numpy as np
+from leasepeek.readers.reader_functions.lease_dates import unit_dates, lease_date_ordinal, month_index, month_index_key
+from leasepeek.readers.reader_functions.money import to_cents, from_cents
+from leasepeek.readers.reader_functions.status_resolution import non_trend_lease_keywords as keywords
 
-keywords = {'Former applicant', 'Future Residents/Applicants'}
+# The default lease trend horizon, in months back from the 'as of' date. The trends stored with a property cover this horizon.
+default_trend_months = 12
 
-def analyze_lease_trends(unit_data, as_of_date_str):
+def summarize_lease_trends(floorplans, leases, as_of_month, months=default_trend_months):
+    """
+    Summarizes the leases signed each month, per floorplan, over the last `months` months.
 
-    # Convert the as of date into a date object
-    as_of_date = datetime.strptime(as_of_date_str, '%m/%d/%Y')
+    Every lease is bucketed by its floorplan and its month, as an offset from the first month of the horizon. The lease counts, rent totals and square footage totals of all buckets are then taken with one `np.bincount` each, so the cost doesn't grow with the number of months.
+
+    Parameters:
+        floorplans (list): The floorplans to report, in order.
+        leases (list): The (floorplan position, month index, sqft, rent in cents) of each lease, in unit order. The floorplan position is the floorplan's index in `floorplans`.
+        as_of_month (int): The month index of the 'as of' date, the last month of the horizon.
+        months (int): The number of months to report.
+
+    Returns:
+        dict: For each month from the earliest, formatted as 'YYYY-MM', the number of leases and the average rent per square foot of each floorplan.
+    """
+    first_month = as_of_month - months + 1
+    bucket_count = len(floorplans) * months
 
-    # Initialize the last twelve months
-    months = []
+    lease_counts = np.zeros(bucket_count, dtype=np.int64)
+    rent_totals = np.zeros(bucket_count)
+    sqft_totals = np.zeros(bucket_count)
+    if leases:
+        positions, lease_months, sqft, rents = (np.asarray(column, dtype=float) for column in zip(*leases))
+        in_horizon = (lease_months >= first_month) & (lease_months <= as_of_month)
+        buckets = (positions[in_horizon] * months + lease_months[in_horizon] - first_month).astype(np.int64)
+        lease_counts = np.bincount(buckets, minlength=bucket_count)
+        rent_totals = np.bincount(buckets, weights=rents[in_horizon], minlength=bucket_count)
+        sqft_totals = np.bincount(buckets, weights=sqft[in_horizon], minlength=bucket_count)
 
-    for i in range(12):
-        month = as_of_date.month - i
-        year = as_of_date.year
-        if month <= 0:
-            month += 12
-            year -= 1
-        # Create datetime object to add to months list
-        month_date = datetime(year, month, 1)
-        months.append(month_date)
-    
-    # Reverse the list to start with the earliest month
-    months.reverse()
+    results = {}
+    for offset in range(months):
+        month_results = results[month_index_key(first_month + offset)] = {}
+        for position, floorplan in enumerate(floorplans):
+            bucket = position * months + offset
+            total_rent = from_cents(rent_totals[bucket])
+            total_sqft = float(sqft_totals[bucket])
+            month_results[floorplan] = {
+                "NumOfLeases": int(lease_counts[bucket]),
+                "AvgLeasePerSqFt": round(total_rent / total_sqft, 2) if total_sqft else 0
+            }
 
-    def parse_date(date_str):
-        if isinstance(date_str, str) and date_str.strip():
-            try:
-                return datetime.strptime(date_str, '%m/%d/%Y')
-            except ValueError:
-                pass
-            try:
-                return datetime.strptime(date_str, '%Y-%m-%d')
-            except ValueError:
-                return None  
-        return None
+    return results
 
-    # Initialize a dictionary to hold data for each month
-    monthly_data = {month.strftime("%Y-%m"): {} for month in months}
 
-    # Initialize each floor plan for each month
-    for unit in unit_data:
-        floorplan = unit['floorplan']
-        for month in monthly_data:
-            if floorplan not in monthly_data[month]:
-                monthly_data[month][floorplan] = []
+def analyze_lease_trends(unit_data, as_of_date_str, months=default_trend_months):
 
-    # Add SqFt and Rent to each month
+    # Convert the as of date into a month index
+    as_of_date = datetime.strptime(as_of_date_str, '%m/%d/%Y')
+    as_of_month = as_of_date.year * 12 + as_of_date.month - 1
+
+    # Every floor plan is reported, in order of first appearance
+    floorplans = {}
+    leases = []
     for unit in unit_data:
+        position = floorplans.setdefault(unit['floorplan'], len(floorplans))
         if unit['status'] in keywords:
             continue
-        sort_date = parse_date(unit['moveIn'] or unit['leaseStart'])
-        sqft = unit['sqft']
-        rent = unit['rent']
-        floorplan = unit['floorplan']
+        sort_date = lease_date_ordinal(unit, unit_dates(unit))
         if sort_date:
-            for month in months:
-                if sort_date.year == month.year and sort_date.month == month.month:
-                    month_key = month.strftime("%Y-%m")
-                    monthly_data[month_key][floorplan].append({
-                        'sqft': sqft,
-                        'rent': rent,
-                    })
-        
-    # Calculate Number of Leases and Avg Lease per Sqft for each month
-    results = {}
-    for month in monthly_data:
-        results[month] = {}
-        for floorplan in monthly_data[month]:
-            leases = monthly_data[month][floorplan]
-            total_rent = sum(lease['rent'] for lease in leases)
-            total_sqft = sum(lease['sqft'] for lease in leases)
+            leases.append((position, month_index(sort_date), unit['sqft'], to_cents(unit['rent'])))
 
-            avg_lease_per_sqft = round(total_rent / total_sqft, 2) if total_sqft else 0
-            
-            lease_count = len(leases)
-
-            results[month][floorplan] = {
-                "NumOfLeases": lease_count,
-                "AvgLeasePerSqFt": avg_lease_per_sqft
-            }
-        
-    return results
\ No newline at end of file
+    return summarize_lease_trends(list(floorplans), leases, as_of_month, months)
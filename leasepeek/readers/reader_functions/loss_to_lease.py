@@ -1,16 +1,15 @@
-
-
-status_keywords = {'upcoming', 'approved', 'Future Residents/Applicants', 'Applicant', 'Pending renewal', 'Former resident', 'Former applicant', 'applicant'}
+from leasepeek.readers.reader_functions.money import to_cents, from_cents
+from leasepeek.readers.reader_functions.status_resolution import non_surveyed_keywords as status_keywords
 
 def find_loss_to_lease(unit_data):
     market_sum = 0
     rent_income = 0
     for unit in unit_data:
         if unit['status'] not in status_keywords:
-            market_sum += unit['market']
-            rent_income += unit['rent']
+            market_sum += to_cents(unit['market'])
+            rent_income += to_cents(unit['rent'])
     
     return {
-        'marketSum': market_sum,
-        'rentIncome': rent_income
+        'marketSum': from_cents(market_sum),
+        'rentIncome': from_cents(rent_income)
     }
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+This module holds the fixed-point representation of money used by the reader pipeline.
+
+Amounts are carried as integer numbers of cents from the moment they are parsed out of a rent roll to the moment the property document is built. Every total is a sum of integers, so it is exact and independent of the order units are added in, and it is cheaper to compute than the same sum over Decimals. Amounts are converted back to the API's numeric form, dollars, only when they are stored: whole dollar amounts as integers and the rest as floats rounded to cents. Balances are always reported as floats.
+
+The standalone analysis functions, such as `floorplan_survey` or `recent_leases`, take units as they are stored, in dollars, and convert their amounts to cents as they read them.
+
+Rents, market rents, totals and deposits written as text are still rounded to whole dollars when parsed, as they always have been, and numeric cells keep their cents; either way they are carried as integer cents like every other amount.
+
+Functions:
+    to_cents(value): Converts an amount in dollars into cents.
+    from_cents(cents): Converts cents into the dollar amount reported by the API.
+    balance_from_cents(cents): Converts a balance in cents into dollars, as a float.
+    unit_money_to_dollars(unit): Converts the amounts of a unit from cents to dollars.
+
+Variables:
+    unit_money_fields: The fields of a cleaned unit holding amounts, other than its balance and charges.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+import numbers
+
+# The fields of a cleaned unit holding amounts, other than its balance and charges.
+unit_money_fields = ('market', 'rent', 'residentDeposit', 'otherDeposit', 'total')
+
+def to_cents(value):
+    """
+    Converts an amount in dollars into cents.
+
+    Args:
+    value (int, float or Decimal): The amount in dollars.
+
+    Returns:
+    int: The amount in cents. Decimals are rounded half up to the nearest cent. Floats are rounded to the nearest cent with `round`, which breaks ties to even; a float amount is only ever within a rounding error of a whole number of cents, so its ties aren't real ones.
+    """
+    if isinstance(value, numbers.Integral):
+        return int(value) * 100
+    if isinstance(value, float):
+        # A float such as 512.05 is stored as 512.0499..., so it is rounded rather than truncated to cents.
+        return int(round(value * 100))
+    return int((Decimal(value) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents):
+    """
+    Converts cents into the dollar amount reported by the API.
+
+    Args:
+    cents (int): The amount in cents. Any other number is rounded to the nearest cent rather than truncated.
+
+    Returns:
+    int or float: The amount in dollars, as an integer if it is a whole number of dollars.
+    """
+    cents = int(round(cents))
+    if cents % 100 == 0:
+        return cents // 100
+    return cents / 100
+
+
+def balance_from_cents(cents):
+    """
+    Converts a balance in cents into dollars. Balances are always reported as floats.
+
+    Args:
+    cents (int): The balance in cents. Any other number is rounded to the nearest cent rather than truncated.
+
+    Returns:
+    float: The balance in dollars.
+    """
+    return int(round(cents)) / 100
+
+
+def unit_money_to_dollars(unit):
+    """
+    Converts the amounts of a cleaned unit from cents to dollars, in place, once nothing needs them in cents anymore.
+
+    Args:
+    unit (dict): The data of a single rental unit, with its amounts in cents.
+
+    Returns:
+    dict: The same unit.
+    """
+    for field in unit_money_fields:
+        unit[field] = from_cents(unit[field])
+    unit['balance'] = balance_from_cents(unit['balance'])
+    for charge in unit['charges']:
+        charge['value'] = from_cents(charge['value'])
+    return unit
@@ -0,0 +1,86 @@
+"""
+This module parses whole columns of numeric values taken from rent roll spreadsheets.
+
+Money and size figures come out of spreadsheets either as numbers or as text such as '1,250.00', '975.00*' or '(12.50)'. Rather than cleaning and converting each cell on its own, the values of a column are gathered into a single Series, cleaned with vectorized string operations and converted in one pass. Text that can't be read as a number is recorded in a diagnostics report and replaced with 0, instead of being reported cell by cell.
+
+Functions:
+    clean_numeric_text(text): Strips formatting from a Series of numeric strings and turns parenthesized amounts into negatives.
+    parse_numeric_column(values, kind): Converts a column of raw values into integers, floats, Decimals or cents.
+
+Variables:
+    numeric_kinds: The kinds of numbers a column can be parsed into.
+"""
+import numbers
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from leasepeek.readers.reader_functions.money import to_cents
+
+# The kinds of numbers a column can be parsed into: rounded integers, floats, exact Decimals, or amounts in integer cents.
+numeric_kinds = {'integer', 'float', 'decimal', 'cents'}
+
+def clean_numeric_text(text):
+    """
+    Strips formatting from a Series of numeric strings.
+
+    Thousands separators, whitespace and '*' markers are removed, and accounting-style parenthesized amounts such as '(12.50)' are turned into negatives.
+
+    Args:
+    text (Series): The strings to clean.
+
+    Returns:
+    Series: The cleaned strings.
+    """
+    text = text.str.replace(r'[*,\s]', '', regex=True)
+    parenthesized = text.str.match(r'^\(.*\)$')
+    return text.where(~parenthesized, '-' + text.str[1:-1])
+
+
+def parse_numeric_column(values, kind):
+    """
+    Converts a column of raw values into numbers.
+
+    Values that are already numbers are kept as they are ('decimal' columns convert them to Decimal and 'cents' columns to cents). Strings are cleaned with `clean_numeric_text` and converted: 'integer' columns round them to the nearest integer, 'float' columns keep them as floats, 'decimal' columns parse them exactly as Decimals and 'cents' columns round them to the nearest cent. Empty strings become 0. Any other value becomes 0 and its position is reported back to the caller.
+
+    Args:
+    values (list): The raw values of the column.
+    kind (str): The kind of number to convert to, one of `numeric_kinds`.
+
+    Returns:
+    tuple: The converted values in the same order, and the positions of the values that could not be parsed.
+    """
+    if kind not in numeric_kinds:
+        raise ValueError(f"Unknown numeric kind: {kind}")
+
+    column = pd.Series(values, dtype=object)
+    parsed = column.copy()
+
+    # Numbers pass through untouched; booleans are not amounts.
+    is_number = column.map(lambda value: isinstance(value, numbers.Real) and not isinstance(value, bool)).astype(bool)
+    is_text = column.map(lambda value: isinstance(value, str)).astype(bool)
+
+    text = clean_numeric_text(column[is_text].astype(str))
+    converted = pd.to_numeric(text, errors='coerce')
+    is_empty = text == ''
+    is_valid = converted.notna() & ~is_empty
+
+    if kind == 'integer':
+        parsed[is_valid[is_valid].index] = [int(value) for value in np.round(converted[is_valid].to_numpy(dtype=float))]
+    elif kind == 'float':
+        parsed[is_valid[is_valid].index] = [float(value) for value in converted[is_valid]]
+    elif kind == 'cents':
+        parsed[is_valid[is_valid].index] = [int(value) for value in np.round(converted[is_valid].to_numpy(dtype=float) * 100)]
+        parsed[is_number] = [to_cents(value) for value in column[is_number]]
+    else:
+        parsed[is_valid[is_valid].index] = [Decimal(value) for value in text[is_valid]]
+        parsed[is_number] = [Decimal(value) for value in column[is_number]]
+    parsed[is_empty[is_empty].index] = 0
+
+    # Everything left over could not be read as a number.
+    failed = ~is_number
+    failed[is_text[is_text].index] = ~(is_valid | is_empty)
+    parsed[failed] = 0
+
+    return parsed.tolist(), np.flatnonzero(failed.to_numpy()).tolist()
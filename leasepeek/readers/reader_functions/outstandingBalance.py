@@ -1,9 +1,12 @@
+from leasepeek.readers.reader_functions.money import to_cents, balance_from_cents
+
 def calculate_outstanding_balance(unit_data):
+    # Balances are totalled in cents
     balance = 0
 
     for unit in unit_data:
         if unit['balance']:
-            balance += unit['balance']
+            balance += to_cents(unit['balance'])
         unit['balance'] = float(unit['balance'])
 
-    return float(balance)
+    return balance_from_cents(balance)
\ No newline at end of file
@@ -7,17 +7,36 @@ The main function in this module looks for certain indicators in the data to rec
 
 Functions:
     process_unit_data(df, data_types): Extracts unit data from the provided DataFrame based on the specified data types.
+    extract_unit_blocks(body, main_data_types, charge_codes, unit_index, section_rows): Builds the unit records out of the body of the unit data, one block of rows per unit.
+    extract_unit_charges(body, charge_columns, block_ids, skip_rows): Totals the charges of every unit block with a grouped reduction.
+    is_charge_amount(value): Checks whether a cell holds a charge amount.
+    charge_total(amount): Rounds a charge total to cents.
+    is_charge_line(value): Checks whether a cell holds a charge description.
+    row_charges(values): Pairs the charge descriptions and amounts of a single row.
+    process_unit_rows(rows, data_types): Extracts unit data from an iterator of worksheet rows, yielding one unit at a time.
 
 Variables:
     keywords: Keywords indicating the end of the data section in the DataFrame.
+    data_end_pattern: Compiled pattern matching any of the end keywords.
+    section_markers: Section header rows giving the status of the units that follow.
     charge_types: Keywords identifying the types of charges in the data.
     unit_describers: Keywords identifying unit descriptors in the data.
 """
 import datetime
+import numbers
+import re
+import numpy as np
+import pandas as pd
 
 # Set of keywords used to identify the end of the data section in the DataFrame
 data_end_keywords = {'Total', 'Totals', 'Totals:', 'Total Market Rent', 'Applications', 'Summary Groups'}
 
+# A single pattern matching any of the `data_end_keywords`, so the first column can be scanned in one pass
+data_end_pattern = re.compile('|'.join(re.escape(keyword) for keyword in sorted(data_end_keywords)))
+
+# Rows used as section headers within the data, where unit statuses are given as row separators rather than in a column
+section_markers = ("Current/Notice/Vacant Residents", "Future Residents/Applicants")
+
 # Set of keywords representing various types of charges in the data. These charges can include rent but typically are more granular, encompassing specific fees such as those for garage, pet, or laundry.
 charge_types = {'Charge Code', 'Amount', 'Rent Charge Description', 'Rent Charge Amount', 'Description', 'Charge Amount', 'Credit Amount'}
 
@@ -28,7 +47,7 @@ def process_unit_data(df, data_types):
     """ 
     Processes and extracts unit data from the input DataFrame.
 
-    The function first identifies the start and end of the data section based on the "Title Row" and specific `data_end_keywords`, then categorizes each data entry according to predefined `data_types` and structures the data into a more usable format. It also handles a special case where unit statuses (e.g., "Current/Notice/Vacant Residents," "Future Residents/Applicants") are used as row separators within the data rather than standard column headers, identifying these statuses and including them in the extracted data.
+    The function first identifies the start and end of the data section based on the "Title Row" and specific `data_end_keywords`, reading to the end of the sheet if no `data_end_keywords` row is found, then categorizes each data entry according to predefined `data_types` and structures the data into a more usable format. It also handles a special case where unit statuses (e.g., "Current/Notice/Vacant Residents," "Future Residents/Applicants") are used as row separators within the data rather than standard column headers, identifying these statuses and including them in the extracted data.
 
     Parameters:
         df (DataFrame): The input data in a pandas DataFrame format.
@@ -44,17 +63,16 @@ def process_unit_data(df, data_types):
     data_starting_row = data_types["Title Row"] + 1
     data_types.pop("Title Row")
 
-    # Initialize the variable that will hold the row number where the data ends.
-    data_ending_row = 0
-    # Iterate through each row in the DataFrame to find where the relevant data ends, based on specific `data_end_keywords`.
-    for i, row in df.iterrows():
-        cell_value = str(row.iloc[0])
-        if any(keyword in cell_value for keyword in data_end_keywords):
-            data_ending_row = i
-            break
-    # If no ending row is found, report an error.
-    if data_ending_row == 0:
-        print("Data read error. No ending row for unit data recognized.")
+    # Find where the relevant data ends: the first row whose first cell contains one of the `data_end_keywords`. The whole column is matched against a single compiled pattern rather than row by row.
+    first_column = df.iloc[:, 0]
+    end_rows = np.flatnonzero(first_column.astype(str).str.contains(data_end_pattern.pattern, regex=True).to_numpy())
+    data_ending_row = int(end_rows[0]) if len(end_rows) else len(df)
+    # If no ending row is found, every remaining row is processed, as `process_unit_rows` does.
+    if not len(end_rows):
+        print("No ending row for unit data recognized. Reading to the end of the sheet.")
+
+    # Locate the status section headers in the same column, mapping each header's row to the status it introduces.
+    section_rows = {int(i): first_column.iat[i] for i in np.flatnonzero(first_column.isin(section_markers).to_numpy())}
 
     # Separate charge codes from other data types in the initial data_types dictionary. This distinction is necessary because charge codes are represented differently and require a different processing approach to accurately extract their information.
     main_data_types = {}
@@ -65,15 +83,6 @@ def process_unit_data(df, data_types):
         else:
             main_data_types[data_types[d]] = d
     
-    # Initialize the list that will store the processed data dictionaries.
-    data = []
-
-    # Determine whether there are any charges to find based on the presence of charge codes.
-    find_charges = bool(charge_codes)
-
-    # Initialize the dictionary that will hold the current unit's data.
-    current_unit = {}
-    
     # Identify the column number for the unit description, based on predefined `unit_describers`. This column's value will later be checked to determine if it's string value is 'nan' (indicating the end of the current unit's data) or an inputted string value (indicating a new unit to process). If no describer is found in data_types, the script will raise an error to avoid unintended behavior.
     unit_index = None
     for unit in unit_describers:
@@ -83,77 +92,278 @@ def process_unit_data(df, data_types):
     if unit_index is None:
         raise ValueError("No valid unit describer found in data types.")
 
-    # Initialize the unit status in the case where unit statuses are used as row separators within the data rather than standard column headers.
-    status=''
+    # Take the body of the data as a plain object array once, rather than looking up every cell through `df.iloc`.
+    body = df.iloc[data_starting_row:max(data_starting_row, data_ending_row)].to_numpy(dtype=object)
+    body_sections = {row_index - data_starting_row: section_rows[row_index] for row_index in section_rows if data_starting_row <= row_index < data_ending_row}
+
+    # Return the list of processed data.
+    return extract_unit_blocks(body, main_data_types, charge_codes, unit_index, body_sections)
+
+
+def extract_unit_blocks(body, main_data_types, charge_codes, unit_index, section_rows):
+    """
+    Builds the unit records out of the body of the unit data.
+
+    Every row holding a unit number or a status section header starts a new block of rows, and each block is turned into one unit record: its first row provides the unit's fields, and every row of the block may contribute charges. Rows before the first block start, and rows following a section header, form blocks of their own.
 
-    # Process each row in the range of the data, extracting relevant information.
-    for row_index in range(data_starting_row, data_ending_row):
-        # Skip the row if it's a status header or doesn't contain unit data.
-        if df.iloc[row_index, 0] == "Current/Notice/Vacant Residents":
+    Parameters:
+        body (ndarray): The rows of the data section as a two-dimensional object array, with missing values stored as NaN.
+        main_data_types (dict): The column numbers of the unit fields, mapped to their descriptions.
+        charge_codes (dict): The column numbers of the charge descriptions and amounts, mapped to their descriptions.
+        unit_index (int): The column number of the unit description.
+        section_rows (dict): The positions of the status section headers within `body`, mapped to the status they introduce.
+
+    Returns:
+        list: A list of dictionaries, where each dictionary contains processed data of a single unit, including its status if available.
+    """
+
+    # Mark the rows starting a block; the block id of every row is the number of block starts up to and including it.
+    is_unit = np.fromiter((str(value) != 'nan' for value in body[:, unit_index]), dtype=bool, count=len(body)) if len(body) else np.zeros(0, dtype=bool)
+    is_section = np.zeros(len(body), dtype=bool)
+    is_section[list(section_rows)] = True
+    block_ids = np.cumsum(is_unit | is_section)
+    block_starts = np.flatnonzero(np.diff(block_ids, prepend=0))
+    block_bounds = zip(np.concatenate(([0], block_starts)), np.concatenate((block_starts, [len(body)])))
+
+    # Total the charges of every block up front, with one grouped reduction over the whole body.
+    block_charges = extract_unit_charges(body, sorted(charge_codes), block_ids, is_section)
+
+    data = []
+    current_unit = {}
+    status = ''
+    for block_id, (block_start, block_end) in enumerate(block_bounds):
+        if block_start < block_end and (is_section[block_start] or is_unit[block_start]):
             # If there's existing data in the current unit, add it to the list and start a new unit. Add the edge case status if necessary.
             if current_unit:
                 if status:
                     current_unit['Status'] = status
                 data.append(current_unit)
-                current_unit = {}
-            status = "Current/Notice/Vacant Residents"
+            current_unit = {}
+
+            if is_section[block_start]:
+                # Status headers only change the status of the units that follow; the header row itself holds no data.
+                status = section_rows[block_start]
+            else:
+                # Extract and store each piece of information from the block's first row into the current_unit dictionary.
+                row = body[block_start]
+                for data_column_index in main_data_types:
+                    cell_value = row[data_column_index]
+                    # Convert datetime objects to string format.
+                    if isinstance(cell_value, datetime.datetime):
+                        cell_value = cell_value.strftime('%Y-%m-%d')
+                    # Convert NaN values to an empty string.
+                    if str(cell_value) == 'nan':
+                        cell_value = ''
+                    current_unit[main_data_types[data_column_index]] = cell_value
+
+        # Store the block's charge totals in the current unit.
+        for charge_line, charge_amount in block_charges.get(block_id, ()):
+            current_unit[charge_line] = charge_amount
+
+    # Add the last unit to the data list. Add the `status` edge case if necessary.
+    if status:
+        current_unit['Status'] = status
+    data.append(current_unit)
+
+    return data
+
+
+def is_charge_amount(value):
+    """
+    Checks whether a cell holds a charge amount: a non-zero number, integer or not.
+
+    Parameters:
+        value: The cell value.
+
+    Returns:
+        bool: True if the value can be recorded as a charge amount.
+    """
+    return isinstance(value, numbers.Real) and not isinstance(value, bool) and value == value and value != 0
+
+
+def is_charge_line(value):
+    """
+    Checks whether a cell holds a charge description: a non-empty string.
+
+    Parameters:
+        value: The cell value.
+
+    Returns:
+        bool: True if the value can be recorded as a charge description.
+    """
+    return type(value) == str and value != ''
+
+
+def row_charges(values):
+    """
+    Pairs the charge descriptions and amounts of a single row.
+
+    The charge cells are scanned from left to right. Each description is paired with the first charge amount after it, skipping empty cells and zero amounts, so a credit-only line such as 'Concession | | -50' in a 'Description | Charge Amount | Credit Amount' layout keeps its credit. A description without an amount is replaced by the next description; amounts without a description are ignored.
+
+    Parameters:
+        values (iterable): The values of the row's charge cells, from left to right.
+
+    Yields:
+        tuple: The charge description and amount of each charge of the row.
+    """
+    charge_line = None
+    for value in values:
+        if is_charge_line(value):
+            charge_line = value
+        elif charge_line is not None and is_charge_amount(value):
+            yield charge_line, value
+            charge_line = None
+
+
+def charge_total(amount):
+    """
+    Rounds a charge total to cents, storing whole amounts as integers.
+
+    Parameters:
+        amount (float): The summed charge amount.
+
+    Returns:
+        int or float: The rounded charge amount.
+    """
+    amount = round(float(amount), 2)
+    return int(amount) if amount.is_integer() else amount
+
+
+def extract_unit_charges(body, charge_columns, block_ids, skip_rows):
+    """
+    Totals the charges of every unit block in the body of the unit data.
+
+    Descriptions and amounts are paired as `row_charges` pairs them, a column at a time: every description column is paired with each charge column to its right in turn, keeping the rows where that column holds the first amount after the description, until another description or an amount ends the description's rows. The paired description and amount vectors are then reduced per unit block with a grouped sum, so repeated charge codes within a unit are added up instead of overwriting each other. Integer and decimal amounts are both accepted; zero amounts are ignored.
+
+    Parameters:
+        body (ndarray): The rows of the data section as a two-dimensional object array.
+        charge_columns (list): The column numbers of the charge descriptions and amounts, from left to right.
+        block_ids (ndarray): The unit block id of every row of `body`.
+        skip_rows (ndarray): A boolean mask of rows that never hold charges, such as status section headers.
+
+    Returns:
+        dict: The charges of each block id, as a list of (charge description, total amount) pairs in order of first appearance.
+    """
+    is_line = {column: np.fromiter((is_charge_line(value) for value in body[:, column]), dtype=bool, count=len(body)) for column in charge_columns}
+    is_amount = {column: np.fromiter((is_charge_amount(value) for value in body[:, column]), dtype=bool, count=len(body)) for column in charge_columns}
+
+    charge_rows, charge_lines, charge_amounts = [], [], []
+    for position, code_column in enumerate(charge_columns):
+        # The rows whose description in this column is still waiting for its amount.
+        waiting = is_line[code_column] & ~skip_rows
+        for amount_column in charge_columns[position + 1:]:
+            if not waiting.any():
+                break
+            rows = np.flatnonzero(waiting & is_amount[amount_column])
+            charge_rows.append(rows)
+            charge_lines.append(body[rows, code_column])
+            charge_amounts.append(body[rows, amount_column].astype(float))
+            waiting &= ~(is_amount[amount_column] | is_line[amount_column])
+
+    if not charge_rows or not sum(len(rows) for rows in charge_rows):
+        return {}
+
+    # Order the charge lines the way they appear in the sheet, so each unit's charges keep their first-appearance order.
+    charges = pd.DataFrame({'row': np.concatenate(charge_rows), 'line': np.concatenate(charge_lines), 'amount': np.concatenate(charge_amounts)})
+    charges = charges.sort_values('row', kind='stable')
+    charges['block'] = block_ids[charges['row'].to_numpy()]
+    totals = charges.groupby(['block', 'line'], sort=False)['amount'].sum()
+
+    block_charges = {}
+    for (block_id, charge_line), amount in totals.items():
+        block_charges.setdefault(block_id, []).append((charge_line, charge_total(amount)))
+    return block_charges
+
+
+def process_unit_rows(rows, data_types):
+    """
+    Processes and extracts unit data from an iterator of worksheet rows.
+
+    This is the streaming counterpart of `process_unit_data`. Rows are consumed one at a time, as yielded by `leasepeek.readers.xlsx_stream.iter_xlsx_rows`, and each unit is yielded as soon as its block of rows is complete, so only one unit block is held in memory at a time. Missing cells are represented by None instead of NaN.
+
+    Unlike `process_unit_data`, the end of the data section does not have to be located up front. If no `data_end_keywords` row is found, every remaining row is processed, as `process_unit_data` does.
+
+    Parameters:
+        rows (iterable): The worksheet rows, starting from the first row of the sheet. Each row is a sequence of cell values.
+        data_types (dict): The column mapping returned by `find_unit_data_types`, including the "Title Row" entry.
+
+    Yields:
+        dict: The processed data of a single unit, including its status if available.
+    """
+
+    # Determine the row where the data starts. Unlike `process_unit_data`, the caller's mapping is left untouched.
+    data_starting_row = data_types["Title Row"] + 1
+    data_types = {d: data_types[d] for d in data_types if d != "Title Row"}
+
+    # Separate charge codes from other data types, as in `process_unit_data`.
+    main_data_types = {}
+    charge_codes = {}
+    for d in data_types:
+        if d in charge_types:
+            charge_codes[data_types[d]] = d
+        else:
+            main_data_types[data_types[d]] = d
+
+    unit_index = None
+    for unit in unit_describers:
+        if unit in data_types:
+            unit_index = data_types[unit]
+            break
+    if unit_index is None:
+        raise ValueError("No valid unit describer found in data types.")
+
+    # Rows exported with trailing empty cells trimmed may be shorter than the mapped columns.
+    def cell(row, index):
+        return row[index] if index < len(row) else None
+
+    charge_columns = sorted(charge_codes)
+
+    current_unit = {}
+    unit_charges = {}
+    status = ''
+    for row_index, row in enumerate(rows):
+        first_cell = cell(row, 0)
+
+        # The data section ends at the first row whose first cell contains one of the `data_end_keywords`.
+        if data_end_pattern.search(str(first_cell)):
+            break
+        if row_index < data_starting_row:
             continue
-        if df.iloc[row_index, 0] == "Future Residents/Applicants":
-            # If there's existing data in the current unit, add it to the list and start a new unit. Add the edge case status if necessary.
+
+        # Status headers separate units rather than describing them.
+        if first_cell in section_markers:
             if current_unit:
                 if status:
                     current_unit['Status'] = status
-                data.append(current_unit)
+                yield current_unit
                 current_unit = {}
-            status = "Future Residents/Applicants"
+                unit_charges = {}
+            status = first_cell
             continue
 
-        # If the unit field is not empty, append the current unit (if it exists) and begin to process a new unit at the current row.
-        if str(df.iloc[row_index, unit_index]) != 'nan':
-            # If there's existing data in the current unit, add it to the list and start a new unit. Add the edge case status if necessary.
+        # A value in the unit column starts a new unit.
+        if cell(row, unit_index) is not None:
             if current_unit:
                 if status:
                     current_unit['Status'] = status
-                data.append(current_unit)
-            
-            # Reset current unit dictionary before processing. 
-            current_unit = {} 
+                yield current_unit
+            current_unit = {}
+            unit_charges = {}
 
-            # Extract and store each piece of information from the current row into the current_unit dictionary.
             for data_column_index in main_data_types:
-                cell_value = df.iloc[row_index, data_column_index]
-                # Convert datetime objects to string format.
+                cell_value = cell(row, data_column_index)
                 if isinstance(cell_value, datetime.datetime):
                     cell_value = cell_value.strftime('%Y-%m-%d')
-                # Convert NaN values to an empty string.
-                if str(cell_value) == 'nan':
+                if cell_value is None:
                     cell_value = ''
-                data_description = main_data_types[data_column_index]
-                current_unit[data_description] = cell_value
-
-        # If there are charges in the row, process them separately and store the description and values in the current unit.
-        if find_charges:
-            charge_line = ""
-            charge_amount = 0
-            # Process each potential charge in the row.
-            for charge_index in charge_codes:
-                # Identify the charge description.
-                if type(df.iloc[row_index, charge_index]) == str:
-                    charge_line = df.iloc[row_index, charge_index]
-                # Identify the charge amount.
-                if type(df.iloc[row_index, charge_index]) == int:
-                    charge_amount = df.iloc[row_index, charge_index]
-                # If both charge description and amount are identified, store them in the current unit.
-                if charge_line and charge_amount:
-                    current_unit[charge_line] = charge_amount
-                    charge_line = ""
-                    charge_amount = 0
-
-
-    # Add the last unit to the data list after finishing the row iteration. Add the `status` edge case if necessary.
+                current_unit[main_data_types[data_column_index]] = cell_value
+
+        # Charges are paired and totalled per unit the same way `extract_unit_charges` does it.
+        for charge_line, charge_amount in row_charges(cell(row, column) for column in charge_columns):
+            unit_charges[charge_line] = unit_charges.get(charge_line, 0) + charge_amount
+            current_unit[charge_line] = charge_total(unit_charges[charge_line])
+
+    # Yield the last unit once the rows are exhausted, matching `process_unit_data`.
     if status:
         current_unit['Status'] = status
-    data.append(current_unit) 
-
-    # Return the list of processed data.
-    return data
\ No newline at end of file
+    yield current_unit
\ No newline at end of file
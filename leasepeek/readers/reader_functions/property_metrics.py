@@ -0,0 +1,173 @@
+"""
+Property Metrics Module
+
+This module computes every summary stored in a property document in a single traversal of the cleaned unit data. It replaces calling `find_total_units`, `calculate_outstanding_balance`, `vacancy`, `floorplan_survey`, `find_loss_to_lease`, `charge_codes`, `recent_leases`, `expiring_leases`, `analyze_lease_trends` and `filter_personal_info` one after another, each of which walks the whole unit list again.
+
+Each unit is visited once. Its status is resolved first by `resolve_unit_status`, exactly as `vacancy` does it, and every other summary filters on the flags of that one resolution rather than matching the status against its own keywords. The unit then feeds per-floorplan and per-status accumulators, and its personal information is removed once nothing else needs it. Lease dates are compared as the day ordinals parsed by `clean_unit_data` (see `leasepeek.readers.reader_functions.lease_dates`). Amounts are summed in integer cents, as `clean_unit_data` stores them, and each unit and total is converted back to dollars only once it is complete (see `leasepeek.readers.reader_functions.money`).
+
+Functions:
+    summarize_units(unit_data, as_of_date_str): Computes the property metrics of the cleaned unit data in one pass.
+"""
+from datetime import datetime
+
+from leasepeek.readers.reader_functions.status_resolution import resolve_unit_status
+from leasepeek.readers.reader_functions.vacancy import vacancy_report
+from leasepeek.readers.reader_functions.floorplan_survey import summarize_floorplans
+from leasepeek.readers.reader_functions.recent_leases import default_windows, recent_lease_as_of, summarize_recent_leases
+from leasepeek.readers.reader_functions.lease_trends import default_trend_months, summarize_lease_trends
+from leasepeek.readers.reader_functions.lease_dates import unit_dates, lease_date_ordinal, month_index
+from leasepeek.readers.reader_functions.money import from_cents, balance_from_cents, unit_money_to_dollars
+
+# Personal information removed from each unit before it is stored, along with the parsed dates only used for the analysis.
+personal_info_keys = ('tenant', 'address', 'residentId', 'unclassified')
+analysis_keys = ('dates',)
+
+
+def summarize_units(unit_data, as_of_date_str, recent_lease_windows=default_windows, trend_months=default_trend_months):
+    """
+    Compute the property metrics of the cleaned unit data in a single pass.
+
+    Like the individual analysis functions, this rewrites each unit's 'status' to its canonical form and removes its personal information. Its amounts are converted from cents to dollars, with its 'balance' as a float.
+
+    Args:
+    unit_data (list): The cleaned units, as returned by `clean_unit_data`, with their amounts in cents. `UnitRecord`s and dicts are both accepted.
+    as_of_date_str (str): The 'as of' date of the data, in 'MM/DD/YYYY' format.
+    recent_lease_windows (iterable): The sizes of the recent lease windows, in days.
+    trend_months (int): The number of months of lease trends.
+
+    Returns:
+    dict: The 'totalUnits', 'totalBalance', 'floorplans', 'vacancy', 'lossToLease', 'charges', 'recentLeases', 'expiringLeases' and 'leaseTrends' entries of the property document, and the filtered units under 'data', still as records until `unit_document` materializes them.
+    """
+    # Reference dates of the lease analyses, as day ordinals and, for the lease trends, as a month index.
+    recent_as_of_date = recent_lease_as_of(as_of_date_str)
+    as_of_date = datetime.strptime(as_of_date_str, '%m/%d/%Y')
+    as_of_day = as_of_date.toordinal()
+    ninety_days_from_as_of_day = as_of_day + 90
+    as_of_month = as_of_date.year * 12 + as_of_date.month - 1
+
+    # Property-wide accumulators.
+    unit_names = set()
+    balance = 0
+    vacancy_statuses = {}
+    market_sum = 0
+    rent_income = 0
+    charges = {'rent': {'value': 0, 'type': 'contractualRent'}}
+    rent_charges = 0
+
+    # Per-floorplan accumulators. `floorplan_order` maps every floorplan to its position in order of first appearance. The columns of the units included in the floorplan survey are aggregated per floorplan once they are complete.
+    floorplan_order = {}
+    survey_columns = {'floorplans': [], 'markets': [], 'rents': [], 'sqfts': [], 'statuses': [], 'occupied': []}
+    plan_leases = {}
+    plan_expirations = {}
+    trend_leases = []
+
+    for unit in unit_data:
+        unit_names.add(unit['unit'])
+
+        if unit['balance']:
+            balance += unit['balance']
+
+        # Resolve the status first; the remaining summaries depend on the canonical status and its flags.
+        resolution = resolve_unit_status(unit)
+        status = unit['status'] = resolution.status
+        vacancy_status = resolution.vacancy_status
+        if vacancy_status is not None:
+            vacancy_statuses[vacancy_status] = vacancy_statuses.get(vacancy_status, 0) + 1
+
+        floorplan = unit['floorplan']
+        if floorplan not in floorplan_order:
+            floorplan_order[floorplan] = len(floorplan_order)
+            plan_leases[floorplan] = []
+            plan_expirations[floorplan] = {
+                'expiring_in_90_days': {'count': 0, 'total_rent': 0},
+                'expired': {'count': 0, 'total_rent': 0}
+            }
+
+        # Floorplan survey and loss to lease.
+        if resolution.surveyed:
+            survey_columns['floorplans'].append(floorplan)
+            survey_columns['markets'].append(unit['market'])
+            survey_columns['rents'].append(unit['rent'])
+            survey_columns['sqfts'].append(unit['sqft'])
+            survey_columns['statuses'].append(status)
+            survey_columns['occupied'].append(resolution.occupied)
+            market_sum += unit['market']
+            rent_income += unit['rent']
+
+        # Charge codes. Charges coded as 'rent' are added to the contractual rent once it is known.
+        for charge in unit['charges']:
+            code = charge['code']
+            if code == 'rent':
+                rent_charges += charge['value']
+            elif code in charges:
+                charges[code]['value'] += charge['value']
+            else:
+                charges[code] = {
+                    'value': charge['value'],
+                    'type': ''
+                }
+
+        # Recent leases and lease trends both date a lease by its move in, falling back to its lease start.
+        dates = unit_dates(unit)
+        lease_date = lease_date_ordinal(unit, dates)
+        if lease_date:
+            if lease_date <= recent_as_of_date and resolution.recent_lease:
+                plan_leases[floorplan].append((lease_date, unit.get('rent', 0)))
+            if resolution.trend_lease:
+                trend_leases.append((floorplan_order[floorplan], month_index(lease_date), unit['sqft'], unit['rent']))
+
+        # Expiring leases.
+        if unit['leaseExpire']:
+            lease_expire_date = dates['leaseExpire']
+            expirations = plan_expirations[floorplan]
+            if lease_expire_date is None:
+                # The date format is not valid
+                print(f"Can not determine lease expire of unit. Invalid date format for unit: {unit}")
+            elif lease_expire_date >= as_of_day and lease_expire_date <= ninety_days_from_as_of_day:
+                expirations['expiring_in_90_days']['count'] += 1
+                expirations['expiring_in_90_days']['total_rent'] += unit['rent']
+            elif lease_expire_date <= as_of_day:
+                expirations['expired']['count'] += 1
+                expirations['expired']['total_rent'] += unit['rent']
+
+        # Filter out personal data now that nothing else reads it, and convert the unit's amounts to dollars.
+        for key in personal_info_keys:
+            unit.pop(key)
+        for key in analysis_keys:
+            unit.pop(key, None)
+        unit_money_to_dollars(unit)
+
+    # Floorplan survey.
+    floorplans = summarize_floorplans(**survey_columns)
+
+    # Charge codes, starting with the contractual rent.
+    charges['rent']['value'] = rent_income + rent_charges
+    for charge in charges.values():
+        charge['value'] = from_cents(charge['value'])
+
+    # Expiring leases.
+    for expirations in plan_expirations.values():
+        for expiration in expirations.values():
+            expiration['total_rent'] = from_cents(expiration['total_rent'])
+
+    # Recent leases, with every window read off the floorplan's leases sorted most recent first.
+    recent_lease_data = {floorplan: summarize_recent_leases(plan_leases[floorplan], recent_as_of_date, recent_lease_windows) for floorplan in floorplan_order}
+
+    # Lease trends of the last `trend_months` months.
+    lease_trends = summarize_lease_trends(list(floorplan_order), trend_leases, as_of_month, trend_months)
+
+    return {
+        'totalUnits': len(unit_names),
+        'totalBalance': balance_from_cents(balance),
+        'floorplans': floorplans,
+        'vacancy': vacancy_report(vacancy_statuses, len(unit_data)),
+        'lossToLease': {
+            'marketSum': from_cents(market_sum),
+            'rentIncome': from_cents(rent_income)
+        },
+        'charges': charges,
+        'recentLeases': recent_lease_data,
+        'expiringLeases': plan_expirations,
+        'leaseTrends': lease_trends,
+        'data': unit_data,
+    }
@@ -1,123 +1,81 @@
-from datetime import datetime, timedelta
-
-keywords = {'Former applicant', 'Future Residents/Applicants', 'Applicant', 'applicant'}
-
-def recent_leases(unit_data, as_of_date_str):
+from bisect import bisect_right
+from datetime import datetime
+from itertools import accumulate
+from leasepeek.readers.reader_functions.lease_dates import unit_dates, lease_date_ordinal
+from leasepeek.readers.reader_functions.money import to_cents, from_cents
+from leasepeek.readers.reader_functions.status_resolution import non_recent_lease_keywords as keywords
+
+# The default recent lease windows, in days back from the 'as of' date. Each window is reported as 'last_<days>_days'.
+default_windows = (180, 150, 120, 90, 60, 30)
+
+def recent_lease_as_of(as_of_date_str):
+    """
+    Returns the date recent leases are measured back from.
+
+    Parameters:
+        as_of_date_str (str): The 'as of' date of the data, in 'MM/DD/YYYY' format, or 'Date not found'.
+
+    Returns:
+        int: The day ordinal of the 'as of' date, or of today if it wasn't found.
+    """
     if as_of_date_str == 'Date not found':
-        as_of_date = datetime.today()
-    else:
-        as_of_date = datetime.strptime(as_of_date_str, '%m/%d/%Y')
-
-    date_180_days_ago = as_of_date - timedelta(days=180)
-    # print(f"90 days ago is: {date_180_days_ago}")
-    date_150_days_ago = as_of_date - timedelta(days=150)
-    # print(f"90 days ago is: {date_150_days_ago}")
-    date_120_days_ago = as_of_date - timedelta(days=120)
-    # print(f"90 days ago is: {date_120_days_ago}")
-    date_90_days_ago = as_of_date - timedelta(days=90)
-    # print(f"90 days ago is: {date_90_days_ago}")
-    date_60_days_ago = as_of_date - timedelta(days=60)
-    # print(f"60 days ago is: {date_60_days_ago}")
-    date_30_days_ago = as_of_date - timedelta(days=30)
-    # print(f"30 days ago is: {date_30_days_ago}")
-
-    recent_two = {}
-    recent_time_windows = {
-        'last_180_days': {},
-        'last_150_days': {},
-        'last_120_days': {},
-        'last_90_days': {},
-        'last_60_days': {},
-        'last_30_days': {}
+        return datetime.today().toordinal()
+    return datetime.strptime(as_of_date_str, '%m/%d/%Y').toordinal()
+
+
+def summarize_recent_leases(leases, as_of_date, windows=default_windows):
+    """
+    Summarizes the recent leases of a single floorplan.
+
+    The leases are sorted most recent first once. Every window then covers a prefix of that order, so its lease count is found with a binary search on the window's start date, and its rent total is read from the running rent totals.
+
+    Parameters:
+        leases (list): The (lease date ordinal, rent in cents) pairs of the floorplan's leases signed on or before the 'as of' date, in unit order.
+        as_of_date (int): The day ordinal of the 'as of' date.
+        windows (iterable): The window sizes, in days.
+
+    Returns:
+        dict: The 'recent_two' summary of the two most recent leases, and the 'recent_leases' summary of each window, in dollars.
+    """
+    # Most recent first; leases signed on the same day keep their unit order.
+    leases = sorted(leases, key=lambda lease: lease[0], reverse=True)
+    # Negated dates are ascending, so leases on or after a start date form the prefix found by bisect.
+    negated_dates = [-lease_date for lease_date, rent in leases]
+    rent_totals = list(accumulate((rent for lease_date, rent in leases), initial=0))
+
+    recent_two_count = min(2, len(leases))
+    recent_two_rent = from_cents(rent_totals[recent_two_count])
+
+    recent_windows = {}
+    for days in windows:
+        lease_count = bisect_right(negated_dates, -(as_of_date - days))
+        total_rent = from_cents(rent_totals[lease_count])
+        recent_windows[f'last_{days}_days'] = {
+            'count': lease_count,
+            'total_rent': total_rent,
+            'average_rent': round(total_rent / lease_count, 2) if lease_count > 0 else 0
+        }
+
+    return {
+        'recent_two': {
+            'count': recent_two_count,
+            'total_rent': recent_two_rent,
+            'average_rent': recent_two_rent / recent_two_count if recent_two_count > 0 else 0
+        },
+        'recent_leases': recent_windows
     }
 
-    floorplan_data = {}
 
-    # Initialize floorplan data for all floorplans in unit_data
+def recent_leases(unit_data, as_of_date_str, windows=default_windows):
+    as_of_date = recent_lease_as_of(as_of_date_str)
+
+    # Gather the leases of each floorplan, dated by their move in falling back to their lease start. Every floorplan is reported, even without recent leases.
+    floorplan_leases = {}
     for unit in unit_data:
         floorplan = unit['floorplan']
-        if floorplan not in floorplan_data:
-            floorplan_data[floorplan] = {
-                'recent_two': {
-                    'count': 0,
-                    'total_rent': 0,
-                    'average_rent': 0
-                },
-                'recent_leases': {
-                    'last_180_days': {'count': 0, 'total_rent': 0, 'average_rent': 0},
-                    'last_150_days': {'count': 0, 'total_rent': 0, 'average_rent': 0},
-                    'last_120_days': {'count': 0, 'total_rent': 0, 'average_rent': 0},
-                    'last_90_days': {'count': 0, 'total_rent': 0, 'average_rent': 0},
-                    'last_60_days': {'count': 0, 'total_rent': 0, 'average_rent': 0},
-                    'last_30_days': {'count': 0, 'total_rent': 0, 'average_rent': 0}
-                }
-            }
-
-    def parse_date(date_str):
-        if isinstance(date_str, str) and date_str.strip():
-            try:
-                return datetime.strptime(date_str, '%m/%d/%Y')
-            except ValueError:
-                pass
-            try:
-                return datetime.strptime(date_str, '%Y-%m-%d')
-            except ValueError:
-                return None  
-        return None
-
-    unit_data_sorted = sorted(unit_data, key=lambda unit: parse_date(unit.get('moveIn') or unit.get('leaseStart')) or datetime.min, reverse=True)
-
-    for unit in unit_data_sorted:
-        floorplan = unit['floorplan']
-        sort_date = parse_date(unit.get('moveIn') or unit.get('leaseStart'))
-
+        leases = floorplan_leases.setdefault(floorplan, [])
+        sort_date = lease_date_ordinal(unit, unit_dates(unit))
         if sort_date and sort_date <= as_of_date and unit['status'] not in keywords:
-            if floorplan not in recent_two:
-                recent_two[floorplan] = {'count': 0, 'total_rent': 0}
-
-            if recent_two[floorplan]['count'] < 2:
-                recent_two[floorplan]['count'] += 1
-                recent_two[floorplan]['total_rent'] += unit.get('rent', 0)
-
-            for window in recent_time_windows.keys():
-                start_date = {
-                    'last_180_days': date_180_days_ago,
-                    'last_150_days': date_150_days_ago,
-                    'last_120_days': date_120_days_ago,
-                    'last_90_days': date_90_days_ago,
-                    'last_60_days': date_60_days_ago,
-                    'last_30_days': date_30_days_ago
-                }[window]
-
-                if start_date <= sort_date <= as_of_date:
-                    if floorplan not in recent_time_windows[window]:
-                        recent_time_windows[window][floorplan] = []
-
-                    window_data = recent_time_windows[window][floorplan]
-                    window_data.append(unit)
-
-    # Calculate average rent for recent_two and each time window
-    for floorplan in floorplan_data:
-        # Calculate average rent for recent_two
-        recent_two_data = recent_two.get(floorplan, {'count': 0, 'total_rent': 0})
-        count_recent_two = recent_two_data['count']
-        total_rent_recent_two = recent_two_data['total_rent']
-        average_rent_recent_two = total_rent_recent_two / count_recent_two if count_recent_two > 0 else 0
-        floorplan_data[floorplan]['recent_two'] = {
-            'count': count_recent_two,
-            'total_rent': total_rent_recent_two,
-            'average_rent': average_rent_recent_two
-        }
+            leases.append((sort_date, to_cents(unit.get('rent', 0))))
 
-        # Calculate averages for each time window
-        for window in recent_time_windows:
-            lease_count = len(recent_time_windows[window].get(floorplan, []))
-            total_rent = sum(unit.get('rent', 0) for unit in recent_time_windows[window].get(floorplan, []))
-            average_rent = round(total_rent / lease_count, 2) if lease_count > 0 else 0
-            floorplan_data[floorplan]['recent_leases'][window] = {
-                'count': lease_count,
-                'total_rent': total_rent,
-                'average_rent': average_rent
-            }
-            
-    return floorplan_data
\ No newline at end of file
+    return {floorplan: summarize_recent_leases(leases, as_of_date, windows) for floorplan, leases in floorplan_leases.items()}
@@ -0,0 +1,189 @@
+"""
+Status Resolution Module
+
+This module resolves the status of a rental unit once, for every analysis that depends on it. Rent rolls describe unit statuses in many ways: explicit statuses ('Occupied', 'VU', 'Model'), status section headers ("Current/Notice/Vacant Residents") that leave the real status to the tenant name ('VACANT', 'MODEL', 'DOWN'), or no status at all.
+
+A unit's status is resolved from two values: its raw status and a marker normalized out of its tenant name ('vacant', 'model', 'model-like', 'down' or ''). The pair is mapped to a canonical status, the vacancy status the unit is counted under, its status type, and the flags the other analyses filter on. Rent rolls only hold a handful of distinct pairs, so each resolution is memoized and computed once per distinct pair rather than once per unit per analysis.
+
+Functions:
+    tenant_marker(tenant): Normalizes a tenant name into the marker used to resolve statuses.
+    status_type(vacancy_status): Returns the status type reported for a vacancy status.
+    resolve_status(raw_status, marker): Resolves a raw status and tenant marker.
+    resolve_unit_status(unit): Resolves the status of a unit.
+    resolve_stored_status(status): Resolves a canonical status stored on a unit, or a status set by a user.
+
+Variables:
+    combined_vacancy_keywords, occupied_keywords, vacant_keywords, down_unit_keywords, model_unit_keywords, future_resident_keywords, ignore_keywords: Keywords used to resolve statuses and their types.
+    non_surveyed_keywords: Canonical statuses excluded from the floorplan survey and loss to lease.
+    non_recent_lease_keywords, non_trend_lease_keywords: Canonical statuses excluded from the recent lease and lease trend analyses.
+    canonical_statuses: The canonical statuses of counted units, the only statuses a user can set.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+# Status section headers, which leave the status of the units that follow to their tenant names.
+combined_vacancy_keywords = {"Current/Notice/Vacant Residents", "Future Residents/Applicants"}
+occupied_keywords = {'Occupied', 'occupied', 'Occupied-NTV', 'Occupied-NTVL', 'O', 'NR', 'NU'}
+vacant_keywords = {'Vacant', 'vacant', 'Vacant-Leased', 'VU', 'VR'}
+down_unit_keywords = {'Down', 'down'}
+model_unit_keywords = {'Model', 'model'}
+future_resident_keywords = {'Applicant', 'applicant', 'upcoming'}
+ignore_keywords = {'Former resident', 'Former applicant'}
+
+# Canonical statuses left out of the floorplan survey and loss to lease.
+non_surveyed_keywords = {'upcoming', 'approved', 'Future Residents/Applicants', 'Applicant', 'applicant', 'Pending renewal', 'Former resident', 'Former applicant'}
+# Canonical statuses whose leases aren't counted as recent leases, or in the lease trends.
+non_recent_lease_keywords = {'Former applicant', 'Future Residents/Applicants', 'Applicant', 'applicant'}
+non_trend_lease_keywords = {'Former applicant', 'Future Residents/Applicants'}
+
+# The canonical statuses of counted units, the only statuses a user can set on a unit.
+canonical_statuses = ('occupied', 'vacant', 'model', 'down', 'applicant')
+
+# The resolved status of a unit:
+# - status: The canonical status stored on the unit.
+# - vacancy_status: The vacancy status the unit is counted under, or None if it isn't counted.
+# - status_type: The type reported for the vacancy status ('occupied', 'vacant', 'nonRevenue', 'futureResident' or '').
+# - surveyed: Whether the unit is included in the floorplan survey and loss to lease.
+# - occupied: Whether the unit's rent counts towards its floorplan's average rent.
+# - recent_lease: Whether the unit's lease can count as a recent lease.
+# - trend_lease: Whether the unit's lease counts in the lease trends.
+StatusResolution = namedtuple('StatusResolution', ['status', 'vacancy_status', 'status_type', 'surveyed', 'occupied', 'recent_lease', 'trend_lease'])
+
+def tenant_marker(tenant):
+    """
+    Normalizes a tenant name into the marker used to resolve statuses.
+
+    Args:
+    tenant (str): The tenant name of a unit.
+
+    Returns:
+    str: 'vacant' if the name mentions 'vacant', 'model' if it is exactly 'model', 'model-like' if it otherwise mentions 'model', 'down' if it is exactly 'down', and '' otherwise. Case is ignored.
+    """
+    if not tenant or not isinstance(tenant, str):
+        return ''
+    tenant = tenant.lower()
+    if 'vacant' in tenant:
+        return 'vacant'
+    if tenant == 'model':
+        return 'model'
+    if 'model' in tenant:
+        return 'model-like'
+    if tenant == 'down':
+        return 'down'
+    return ''
+
+
+@lru_cache(maxsize=256)
+def status_type(vacancy_status):
+    """
+    Returns the status type reported for a vacancy status.
+
+    Args:
+    vacancy_status (str): The vacancy status.
+
+    Returns:
+    str: 'occupied', 'vacant', 'nonRevenue', 'futureResident', or '' if the status has no type.
+    """
+    if vacancy_status in occupied_keywords:
+        return 'occupied'
+    if vacancy_status in vacant_keywords:
+        return 'vacant'
+    if vacancy_status in model_unit_keywords or vacancy_status in down_unit_keywords:
+        return 'nonRevenue'
+    if vacancy_status in future_resident_keywords:
+        return 'futureResident'
+    return ''
+
+
+def explicit_status(raw_status):
+    """
+    Resolves an explicit status into its canonical status and vacancy status.
+
+    Args:
+    raw_status (str): The raw status.
+
+    Returns:
+    tuple: The canonical status and vacancy status. Unrecognized statuses are kept and counted under their own name; ignored statuses aren't counted.
+    """
+    if raw_status in occupied_keywords:
+        return 'occupied', 'Occupied'
+    if raw_status in vacant_keywords:
+        return 'vacant', 'Vacant'
+    if raw_status in model_unit_keywords:
+        return 'model', 'Model'
+    if raw_status in down_unit_keywords:
+        return 'down', 'Down'
+    if raw_status in ignore_keywords:
+        return raw_status, None
+    return raw_status, raw_status
+
+
+# Statuses given by a tenant marker, depending on whether the marker is read under a status section header, where only exact 'model' names count, or anywhere else.
+section_marker_statuses = {'vacant': ('vacant', 'Vacant'), 'model': ('model', 'Model'), 'down': ('down', 'Down')}
+marker_statuses = {'vacant': ('vacant', 'Vacant'), 'model': ('model', 'Model'), 'model-like': ('model', 'Model'), 'down': ('down', 'Down')}
+
+@lru_cache(maxsize=1024)
+def resolve_status(raw_status, marker):
+    """
+    Resolves a raw status and tenant marker.
+
+    Units under the "Future Residents/Applicants" header are applicants. Units under the "Current/Notice/Vacant Residents" header, and units without a status, are resolved from their tenant marker and otherwise occupied. A tenant marker also overrides an explicit status; without one, the explicit status is resolved on its own.
+
+    Args:
+    raw_status (str): The raw status of the unit.
+    marker (str): The tenant marker of the unit, as returned by `tenant_marker`.
+
+    Returns:
+    StatusResolution: The resolved status.
+    """
+    if raw_status in combined_vacancy_keywords:
+        if raw_status == "Future Residents/Applicants":
+            status, vacancy_status = 'applicant', 'Applicant'
+        else:
+            status, vacancy_status = section_marker_statuses.get(marker, ('occupied', 'Occupied'))
+    elif marker in marker_statuses:
+        status, vacancy_status = marker_statuses[marker]
+    elif raw_status:
+        status, vacancy_status = explicit_status(raw_status)
+    else:
+        status, vacancy_status = 'occupied', 'Occupied'
+
+    return StatusResolution(
+        status=status,
+        vacancy_status=vacancy_status,
+        status_type=status_type(vacancy_status),
+        surveyed=status not in non_surveyed_keywords,
+        occupied=status in occupied_keywords,
+        recent_lease=status not in non_recent_lease_keywords,
+        trend_lease=status not in non_trend_lease_keywords,
+    )
+
+
+def resolve_unit_status(unit):
+    """
+    Resolves the status of a unit from its 'status' and 'tenant' fields.
+
+    Args:
+    unit (dict): The data of a single rental unit.
+
+    Returns:
+    StatusResolution: The resolved status.
+    """
+    return resolve_status(unit['status'], tenant_marker(unit['tenant']))
+
+
+def resolve_stored_status(status):
+    """
+    Resolves a canonical status stored on a unit, or a status set by a user, without a tenant name.
+
+    Canonical statuses resolve to themselves. 'applicant' is the canonical status of units under the "Future Residents/Applicants" header, so it is resolved like one.
+
+    Args:
+    status (str): The status.
+
+    Returns:
+    StatusResolution: The resolved status.
+    """
+    if status == 'applicant':
+        return resolve_status("Future Residents/Applicants", '')
+    return resolve_status(status, '')
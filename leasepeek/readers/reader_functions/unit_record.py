@@ -0,0 +1,158 @@
+"""
+This module defines the compact records cleaned units are carried in between the stages of the reader pipeline.
+
+A cleaned unit has a fixed set of fields, so `clean_unit_data` stores each unit in a `UnitRecord`, a class with `__slots__` instead of a 20-key dictionary, and each of its charges in a `UnitCharge`. Slotted records hold their fields in a fixed array rather than a hash table, so a unit takes a fraction of the memory of the equivalent dict.
+
+Both records support the dictionary operations the reader functions use (`unit['rent']`, `unit.get('moveIn')`, `unit.pop('tenant')`, ...), so every reader function accepts them as well as plain dicts, such as units read back from the database. Dicts are only built when the property document is, by `unit_document`.
+
+Classes:
+    UnitCharge: A charge of a unit.
+    UnitRecord: A cleaned unit.
+
+Functions:
+    unit_document(unit, exclude): Materializes a unit as the dictionary stored in the property document.
+
+Variables:
+    unit_fields: The fields of a cleaned unit, in the order they are stored.
+"""
+
+# The fields of a cleaned unit, in the order they are stored, followed by the parsed dates only used for the analysis.
+unit_fields = (
+    'unit', 'address', 'floorplan', 'sqft', 'market', 'rent', 'status', 'tenant', 'residentId',
+    'moveIn', 'moveOut', 'leaseStart', 'leaseExpire', 'residentDeposit', 'otherDeposit', 'balance', 'total',
+    'renovated', 'charges', 'unclassified',
+)
+
+# Distinguishes a missing default from a None default in `pop`.
+_missing = object()
+
+
+class UnitCharge:
+    """
+    A charge of a unit: its charge code and amount.
+    """
+    __slots__ = ('code', 'value')
+
+    def __init__(self, code, value):
+        self.code = code
+        self.value = value
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def to_dict(self):
+        return {'code': self.code, 'value': self.value}
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+
+class UnitRecord:
+    """
+    A cleaned unit, with a slot for each of the `unit_fields` and one for its parsed 'dates'.
+
+    Fields can be read, set and removed like the keys of a dict. A removed field, such as personal information popped before the unit is stored, no longer counts as one of the unit's keys.
+    """
+    __slots__ = unit_fields + ('dates',)
+
+    def __init__(self):
+        self.unit = None
+        self.address = None
+        self.floorplan = None
+        self.sqft = 0
+        self.market = 0
+        self.rent = 0
+        self.status = None
+        self.tenant = None
+        self.residentId = None
+        self.moveIn = None
+        self.moveOut = None
+        self.leaseStart = None
+        self.leaseExpire = None
+        self.residentDeposit = 0
+        self.otherDeposit = 0
+        self.balance = 0
+        self.total = 0
+        self.renovated = False
+        self.charges = []
+        self.unclassified = {}
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__ and hasattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def pop(self, key, default=_missing):
+        if key in self:
+            value = getattr(self, key)
+            delattr(self, key)
+            return value
+        if default is _missing:
+            raise KeyError(key)
+        return default
+
+    def keys(self):
+        return [key for key in self.__slots__ if hasattr(self, key)]
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.keys()]
+
+    def to_dict(self, exclude=()):
+        """
+        Materializes the unit as a dict, with its charges as dicts too.
+
+        Args:
+        exclude (iterable): Fields to leave out.
+
+        Returns:
+        dict: The unit's fields, in the order of `unit_fields`.
+        """
+        unit = {}
+        for key in self.__slots__:
+            if key in exclude or not hasattr(self, key):
+                continue
+            value = getattr(self, key)
+            if key == 'charges':
+                value = [charge.to_dict() if isinstance(charge, UnitCharge) else charge for charge in value]
+            unit[key] = value
+        return unit
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+
+def unit_document(unit, exclude=()):
+    """
+    Materializes a unit as the dictionary stored in the property document.
+
+    Args:
+    unit (UnitRecord or dict): The unit.
+    exclude (iterable): Fields to leave out.
+
+    Returns:
+    dict: The unit as a plain dictionary.
+    """
+    if isinstance(unit, UnitRecord):
+        return unit.to_dict(exclude)
+    return {key: value for key, value in unit.items() if key not in exclude}
@@ -0,0 +1,158 @@
+"""
+Module Description:
+This module runs the reader pipeline as a graph of stages. Each stage wraps a reader function and declares the named
+values it reads and the named values it produces. The executor only runs the stages needed for the requested outputs,
+starts every stage as soon as its inputs are available, runs independent stages concurrently on a worker pool, and times
+each stage individually.
+
+Functions:
+- stage: Declares a stage of the pipeline.
+- required_stages: Selects the stages needed to produce the requested outputs.
+- run_stages: Runs the stages needed for the requested outputs.
+
+"""
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Default number of worker threads stages are run on.
+stage_workers = 4
+
+# A stage of the pipeline: its name, the function it runs, the names of the values passed to the function, in order, and the names of the values it returns.
+Stage = namedtuple('Stage', ['name', 'function', 'inputs', 'outputs'])
+
+def stage(name, function, inputs, outputs):
+    """
+    Declares a stage of the pipeline.
+
+    Parameters:
+    - name (str): The name of the stage, used in its timing.
+    - function (callable): The function run by the stage. It is called with the values named in `inputs`, as positional arguments.
+    - inputs (tuple): The names of the values the stage reads.
+    - outputs (tuple or str): The names of the values the stage produces. A stage with a single output returns its value; a stage with several outputs returns a tuple of values in the same order.
+
+    Returns:
+    - Stage: The stage.
+    """
+    if isinstance(outputs, str):
+        outputs = (outputs,)
+    return Stage(name, function, tuple(inputs), tuple(outputs))
+
+
+def required_stages(stages, available, outputs):
+    """
+    Selects the stages needed to produce the requested outputs.
+
+    Parameters:
+    - stages (list): The stages of the pipeline.
+    - available (iterable): The names of the values given to the pipeline.
+    - outputs (iterable): The names of the requested outputs.
+
+    Returns:
+    - list: The needed stages, in the order they were declared.
+
+    Raises:
+    - ValueError: If an output, or the input of a needed stage, is neither given nor produced by any stage.
+    """
+    producers = {}
+    for declared in stages:
+        for output in declared.outputs:
+            producers[output] = declared
+
+    available = set(available)
+    needed = set()
+    pending = list(outputs)
+    while pending:
+        name = pending.pop()
+        if name in available:
+            continue
+        producer = producers.get(name)
+        if producer is None:
+            raise ValueError(f"No stage produces '{name}'.")
+        if producer.name not in needed:
+            needed.add(producer.name)
+            pending.extend(producer.inputs)
+
+    return [declared for declared in stages if declared.name in needed]
+
+
+def timed_call(declared, arguments):
+    """
+    Calls the function of a stage and measures how long it takes.
+
+    Returns:
+    - tuple: The values produced by the stage, in the order of its outputs, and the time taken in milliseconds.
+    """
+    start = time.perf_counter()
+    result = declared.function(*arguments)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if len(declared.outputs) == 1:
+        result = (result,)
+    return result, elapsed_ms
+
+
+def run_stages(stages, values, outputs, max_workers=stage_workers, timings=None):
+    """
+    Runs the stages needed for the requested outputs.
+
+    A stage is submitted to the worker pool as soon as every one of its inputs is available, so stages that don't depend on each other run concurrently. If a stage fails, the stages still waiting are not started and its exception is raised.
+
+    Parameters:
+    - stages (list): The stages of the pipeline.
+    - values (dict): The values given to the pipeline, by name.
+    - outputs (iterable): The names of the requested outputs.
+    - max_workers (int): The number of worker threads. With a single worker, stages run one after another in the calling thread.
+    - timings (dict): If provided, the time taken by each stage that ran is stored in it, in milliseconds, by stage name.
+
+    Returns:
+    - dict: The requested outputs, by name.
+
+    Raises:
+    - ValueError: If a requested output can't be produced, or the needed stages depend on each other in a cycle.
+    """
+    outputs = tuple(outputs)
+    values = dict(values)
+    waiting = required_stages(stages, values, outputs)
+
+    def record(declared, result, elapsed_ms):
+        values.update(zip(declared.outputs, result))
+        logger.debug(f"Stage '{declared.name}' took {elapsed_ms:.1f} ms")
+        if timings is not None:
+            timings[declared.name] = elapsed_ms
+
+    def ready_stages():
+        ready = [declared for declared in waiting if all(name in values for name in declared.inputs)]
+        for declared in ready:
+            waiting.remove(declared)
+        return ready
+
+    if max_workers <= 1:
+        while waiting:
+            ready = ready_stages()
+            if not ready:
+                raise ValueError(f"Stages {[declared.name for declared in waiting]} depend on each other.")
+            for declared in ready:
+                record(declared, *timed_call(declared, [values[name] for name in declared.inputs]))
+        return {name: values[name] for name in outputs}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running = {}
+        while waiting or running:
+            for declared in ready_stages():
+                running[executor.submit(timed_call, declared, [values[name] for name in declared.inputs])] = declared
+            if not running:
+                raise ValueError(f"Stages {[declared.name for declared in waiting]} depend on each other.")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                declared = running.pop(future)
+                try:
+                    record(declared, *future.result())
+                except BaseException:
+                    for other in running:
+                        other.cancel()
+                    raise
+
+    return {name: values[name] for name in outputs}
@@ -9,108 +9,245 @@ Imported functions:
 - find_as_of_date: Determines the 'as of' date from the Excel data or filename.
 - find_unit_data_types: Identifies the different types of unit data in the Excel sheet.
 - process_unit_data: Processes raw unit data into a structured format.
-- clean_unit_data: Cleans and normalizes the processed unit data.
-- vacancy: Computes the vacancy data based on the cleaned unit data.
-- floorplan_survey: Generates a survey of floorplans based on the cleaned unit data.
+- clean_unit_data: Cleans and normalizes the processed unit data, reporting the values it couldn't parse.
+- summarize_units: Computes the vacancy, floorplan, charge and lease metrics of the cleaned unit data in a single pass.
+
+The helper functions run as the stages of a graph (see `leasepeek.readers.stage_graph`). Each stage declares the values it reads
+and produces, so independent stages run concurrently, each stage is timed, and callers can compute only some of the outputs.
 
 Functions:
 - read_xlsx: Main function that orchestrates the reading and processing of the Excel data.
+- read_xlsx_rows: Streaming counterpart of read_xlsx that consumes worksheet rows one at a time.
+- read_xlsx_file: Reads an uploaded .xlsx file with the selected ingestion engine.
+- log_parse_diagnostics: Logs the values of an upload that couldn't be parsed.
 
 """
 from leasepeek.readers.reader_functions.property_name import find_property_name
 from leasepeek.readers.reader_functions.as_of_date import find_as_of_date
 from leasepeek.readers.reader_functions.unit_data_types import find_unit_data_types
-from leasepeek.readers.reader_functions.process_unit_data import process_unit_data
+from leasepeek.readers.reader_functions.process_unit_data import process_unit_data, process_unit_rows
 from leasepeek.readers.reader_functions.clean_unit_data import clean_unit_data
-from leasepeek.readers.reader_functions.vacancy import vacancy
-from leasepeek.readers.reader_functions.total_units import find_total_units
-from leasepeek.readers.reader_functions.floorplan_survey import floorplan_survey
-from leasepeek.readers.reader_functions.loss_to_lease import find_loss_to_lease
-from leasepeek.readers.reader_functions.charges import charge_codes
-from leasepeek.readers.reader_functions.expiring_leases import expiring_leases
-from leasepeek.readers.reader_functions.recent_leases import recent_leases
-from leasepeek.readers.reader_functions.lease_trends import analyze_lease_trends
-from leasepeek.readers.reader_functions.outstandingBalance import calculate_outstanding_balance
-from leasepeek.readers.reader_functions.filter_personal_information import filter_personal_info
+from leasepeek.readers.reader_functions.property_metrics import summarize_units
+from leasepeek.readers.reader_functions.recent_leases import default_windows
+from leasepeek.readers.reader_functions.lease_trends import default_trend_months
+from leasepeek.readers.reader_functions.unit_record import unit_document
+from leasepeek.readers.xlsx_stream import iter_xlsx_rows, header_frame
+from leasepeek.readers.xlsx_sax import XlsxSheetReader, find_data_extent
+from leasepeek.readers.stage_graph import stage, run_stages, stage_workers
 from datetime import datetime, timezone
+from functools import partial
+from itertools import chain, islice
+import logging
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Number of rows searched for column titles by `find_unit_data_types`.
+header_row_count = 15
+
+# Engines accepted by `read_xlsx_file`.
+xlsx_engines = {'pandas', 'openpyxl', 'sax'}
+
+# Number of unparsed values listed in the warning logged for an upload.
+logged_diagnostics_count = 10
+
+# The metrics stored in the property document, in order. 'data' holds the unit documents.
+metric_keys = ('totalUnits', 'totalBalance', 'floorplans', 'vacancy', 'lossToLease', 'charges', 'recentLeases', 'expiringLeases', 'leaseTrends', 'data')
+
+def title_row_of(unit_data_types):
+    """
+    Returns the row that separates background information from unit-specific data.
+    """
+    return unit_data_types['Title Row']
+
+
+def read_header_rows(read_rows):
+    """
+    Phase one of a streamed read: buffers the rows that may hold the property name, the 'as of' date and the column titles.
+    """
+    return list(islice(read_rows(), header_row_count))
+
+
+def process_frame(data_frame, unit_data_types):
+    """
+    Processes the unit data of a DataFrame of the whole sheet. `process_unit_data` consumes the 'Title Row' entry of its mapping, so it is given a copy that stages running alongside it don't share.
+    """
+    return process_unit_data(data_frame, dict(unit_data_types))
+
 
-def read_xlsx(data_frame, user_id, file_name):
+def process_sheet_rows(read_rows, header_rows, unit_data_types):
+    """
+    Phase two of a streamed read: processes the unit data from the buffered rows followed by the rest of the sheet.
+
+    The rest of the sheet is read restricted to the mapped columns. Column 0 holds the section and end-of-data markers.
+    """
+    body_rows = iter(())
+    if len(header_rows) == header_row_count:
+        mapped_columns = {0} | {column for title, column in unit_data_types.items() if title != 'Title Row'}
+        body_rows = read_rows(min_row=header_row_count, columns=mapped_columns)
+    return process_unit_rows(chain(header_rows, body_rows), unit_data_types)
+
+
+def metric_values(cleaned_unit_data, as_of_date, recent_lease_windows, trend_months):
+    """
+    Computes the property metrics in a single pass over the cleaned data, as the outputs of the 'summarize_units' stage. This also filters out personal data.
+    """
+    metrics = summarize_units(cleaned_unit_data, as_of_date, recent_lease_windows, trend_months)
+    return tuple(metrics[key] for key in metric_keys[:-1]) + (metrics['data'],)
+
+
+def unit_documents(filtered_units):
+    """
+    Materializes the filtered units as the dictionaries stored in the property document. The cleaned units are compact records until then.
+    """
+    return [unit_document(unit) for unit in filtered_units]
+
+
+def property_document(user_id, location, as_of_date, *metric_values):
+    """
+    Constructs the final structured property document out of the location, the 'as of' date and the values of `metric_keys`.
+    """
+    metrics = dict(zip(metric_keys, metric_values))
+    property_data = {'user_id': user_id,
+                 'date': datetime.now(timezone.utc).isoformat(),
+                 'location': location,
+                 'asOf': as_of_date,
+                 'totalUnits': metrics.pop('totalUnits'),
+                 'unitsConfirmed': False,
+                 }
+    property_data.update(metrics)
+    return property_data
+
+
+def header_stages(frame):
+    """
+    Returns the stages that read the preamble of the sheet, held in the value named `frame`.
+    """
+    return [
+        stage('find_unit_data_types', find_unit_data_types, (frame,), 'unit_data_types'),
+        stage('title_row', title_row_of, ('unit_data_types',), 'title_row'),
+        stage('find_property_name', find_property_name, (frame, 'title_row'), 'location'),
+        stage('find_as_of_date', find_as_of_date, (frame, 'title_row', 'file_name'), 'asOf'),
+    ]
+
+# Stages that turn the processed unit data into the property document. Cleaning runs alongside the header stages; the metrics wait for the 'as of' date.
+document_stages = [
+    stage('clean_unit_data', clean_unit_data, ('processed_unit_data',), ('cleaned_unit_data', 'parse_diagnostics')),
+    stage('summarize_units', metric_values, ('cleaned_unit_data', 'asOf', 'recent_lease_windows', 'trend_months'), metric_keys[:-1] + ('filtered_units',)),
+    stage('unit_documents', unit_documents, ('filtered_units',), 'data'),
+    stage('property_document', property_document, ('user_id', 'location', 'asOf') + metric_keys, 'property_data'),
+]
+
+# The pipeline of `read_xlsx`, over a DataFrame of the whole sheet.
+frame_stages = header_stages('data_frame') + [
+    stage('process_unit_data', process_frame, ('data_frame', 'unit_data_types'), 'processed_unit_data'),
+] + document_stages
+
+# The pipeline of `read_xlsx_rows`, over a worksheet streamed row by row. `process_unit_rows` yields units lazily, so the time spent reading the body of the sheet is counted under 'clean_unit_data'.
+row_stages = [
+    stage('read_header_rows', read_header_rows, ('read_rows',), 'header_rows'),
+    stage('header_frame', header_frame, ('header_rows',), 'header_data_frame'),
+] + header_stages('header_data_frame') + [
+    stage('process_unit_rows', process_sheet_rows, ('read_rows', 'header_rows', 'unit_data_types'), 'processed_unit_data'),
+] + document_stages
+
+
+def log_parse_diagnostics(parse_diagnostics, file_name):
+    """
+    Logs the values of an upload that couldn't be parsed and were set to 0, as reported by `clean_unit_data`. A single warning is logged for the file, listing the first `logged_diagnostics_count` values.
+    """
+    if not parse_diagnostics:
+        return
+    listed = ', '.join(f"unit {failure['unit']} {failure['key']!r}: {failure['value']!r}" for failure in parse_diagnostics[:logged_diagnostics_count])
+    if len(parse_diagnostics) > logged_diagnostics_count:
+        listed += ', ...'
+    logger.warning(f"{len(parse_diagnostics)} numeric values in {file_name} could not be parsed and were set to 0 ({listed}).")
+
+
+def run_reader(stages, values, outputs, timings, max_workers):
+    """
+    Runs a reader pipeline. Returns the property document when no outputs are requested, logging the parse diagnostics of the upload, and the requested outputs by name otherwise.
+    """
+    if outputs is None:
+        results = run_stages(stages, values, ('property_data', 'parse_diagnostics'), max_workers, timings)
+        log_parse_diagnostics(results['parse_diagnostics'], values['file_name'])
+        return results['property_data']
+    return run_stages(stages, values, outputs, max_workers, timings)
+
+
+def read_xlsx(data_frame, user_id, file_name, outputs=None, timings=None, max_workers=stage_workers, recent_lease_windows=default_windows, trend_months=default_trend_months):
     """
     Processes the given Excel data frame to extract, clean, and structure property-related data.
 
+    The reader functions run as the stages of `frame_stages`: the property name and 'as of' date are found while the unit data is processed and cleaned, and only the stages needed for the requested outputs are run.
+
     Parameters:
     - data_frame (DataFrame): The raw Excel data.
     - user_id (str): The ID of the user uploading/processing the data.
     - file_name (str): The name of the uploaded Excel file.
+    - outputs (iterable): The values to compute, such as ('location', 'asOf'), ('vacancy',) or ('parse_diagnostics',). Any key of the property document, or value produced by a stage, can be requested. Defaults to the whole property document.
+    - timings (dict): If provided, the time taken by each stage is stored in it, in milliseconds.
+    - max_workers (int): The number of worker threads the stages run on.
+    - recent_lease_windows (iterable): The sizes of the recent lease windows, in days.
+    - trend_months (int): The number of months of lease trends.
 
     Returns:
-    - dict: A structured dictionary containing various metrics and data related to the property.
+    - dict: A structured dictionary containing various metrics and data related to the property, or the requested outputs by name.
     """
+    values = {'data_frame': data_frame, 'user_id': user_id, 'file_name': file_name, 'recent_lease_windows': tuple(recent_lease_windows), 'trend_months': trend_months}
+    return run_reader(frame_stages, values, outputs, timings, max_workers)
 
-    # Identify the different types of unit data present in the Excel sheet
-    unit_data_types = find_unit_data_types(data_frame)
-
-    # Determine the row that separates background information from unit-specific data
-    title_row = unit_data_types['Title Row']
-    
-    # Extract the name of the property from the Excel data
-    property = find_property_name(data_frame, title_row)
-
-    # Determine the 'as of' date either from the data or the file name
-    as_of_date = find_as_of_date(data_frame, title_row, file_name)
-
-    # Process and structure the raw unit data from the Excel sheet
-    processed_unit_data = process_unit_data(data_frame, unit_data_types)
 
-    # Clean and normalize the processed unit data
-    cleaned_unit_data = clean_unit_data(processed_unit_data)
+def read_xlsx_rows(read_rows, user_id, file_name, outputs=None, timings=None, max_workers=stage_workers, recent_lease_windows=default_windows, trend_months=default_trend_months):
+    """
+    Processes a worksheet streamed row by row to extract, clean, and structure property-related data without building a DataFrame of the whole sheet.
 
-    # Calculate the total number of units from the cleaned data
-    total_units = find_total_units(cleaned_unit_data)    
+    The sheet is read in two phases. Phase one reads only the first `header_row_count` rows, which hold the preamble and the column titles, and builds the column mapping from them. Phase two reads the rest of the sheet restricted to the mapped columns, so trailing blank or formatted columns are never converted. The body rows are consumed one unit block at a time and reading stops at the end of the unit data.
 
-    # Calculate the total outstanding balance from the cleaned data
-    outstanding_balance = calculate_outstanding_balance(cleaned_unit_data)
+    The reader functions run as the stages of `row_stages`, like `read_xlsx`.
 
-    # Calculate vacancy metrics based on the cleaned unit data
-    vacancy_data = vacancy(cleaned_unit_data)
+    Parameters:
+    - read_rows (callable): Opens a row stream over the worksheet, such as `iter_sheet_rows` bound to a file. It is called as read_rows() for phase one and as read_rows(min_row=..., columns=...) for phase two.
+    - user_id (str): The ID of the user uploading/processing the data.
+    - file_name (str): The name of the uploaded Excel file.
+    - outputs (iterable): The values to compute. Defaults to the whole property document.
+    - timings (dict): If provided, the time taken by each stage is stored in it, in milliseconds.
+    - max_workers (int): The number of worker threads the stages run on.
+    - recent_lease_windows (iterable): The sizes of the recent lease windows, in days.
+    - trend_months (int): The number of months of lease trends.
 
-    # Survey the floorplans from the cleaned unit data
-    surveyed_floorplans = floorplan_survey(cleaned_unit_data)
+    Returns:
+    - dict: A structured dictionary containing various metrics and data related to the property, or the requested outputs by name.
+    """
+    values = {'read_rows': read_rows, 'user_id': user_id, 'file_name': file_name, 'recent_lease_windows': tuple(recent_lease_windows), 'trend_months': trend_months}
+    return run_reader(row_stages, values, outputs, timings, max_workers)
 
-    # Calculate loss to lease using the cleaned unit data
-    loss_to_lease = find_loss_to_lease(cleaned_unit_data)
 
-    # Charge codes
-    charges = charge_codes(cleaned_unit_data, loss_to_lease)
+def read_xlsx_file(file_obj, user_id, file_name, engine='pandas', **stage_options):
+    """
+    Reads an uploaded .xlsx file with the selected ingestion engine.
 
-    # Recent lease signing analysis
-    recent_leases_analysis = recent_leases(cleaned_unit_data, as_of_date)
+    Parameters:
+    - file_obj: A path or a binary file-like object containing the workbook.
+    - user_id (str): The ID of the user uploading/processing the data.
+    - file_name (str): The name of the uploaded Excel file.
+    - engine (str): 'pandas' reads the whole sheet into a DataFrame. 'openpyxl' streams the sheet row by row, keeping memory bounded by one unit block. 'sax' streams the sheet XML directly with `leasepeek.readers.xlsx_sax`, skipping openpyxl's cell objects. Both streaming engines use the two-phase, column-pruned read of `read_xlsx_rows`.
 
-    # Expiring leases
-    expired_leases = expiring_leases(cleaned_unit_data, as_of_date)
+    Any `outputs`, `timings`, `max_workers`, `recent_lease_windows` or `trend_months` options are passed on to `read_xlsx` or `read_xlsx_rows`.
 
-    # Analyze Lease trends of last 12 months
-    lease_trends = analyze_lease_trends(cleaned_unit_data, as_of_date)
+    Formatted but empty trailing rows and columns are trimmed before they are read. The 'pandas' and 'openpyxl' engines are limited to the extent found by `find_data_extent`, which scans the sheet XML once before the engine reads it; the 'sax' engine skips empty cells and rows as it reads. The sheet's declared <dimension> is never used as a limit, since exports often understate it.
 
-    # Filter personal out personal data
-    filtered_clean_data = filter_personal_info(cleaned_unit_data)
+    Returns:
+    - dict: A structured dictionary containing various metrics and data related to the property.
+    """
+    if engine == 'pandas':
+        data_rows, data_columns = find_data_extent(file_obj)
+        data_frame = pd.read_excel(file_obj, header=None, nrows=data_rows, usecols=range(data_columns) if data_columns else None)
+        return read_xlsx(data_frame, user_id, file_name, **stage_options)
+    if engine == 'openpyxl':
+        return read_xlsx_rows(partial(iter_xlsx_rows, file_obj, extent=find_data_extent(file_obj)), user_id, file_name, **stage_options)
+    if engine == 'sax':
+        with XlsxSheetReader(file_obj) as reader:
+            return read_xlsx_rows(reader.rows, user_id, file_name, **stage_options)
+    raise ValueError(f"Unknown xlsx engine '{engine}'. Expected one of: {', '.join(sorted(xlsx_engines))}.")
 
-    # Construct the final structured data 
-    property_data = {'user_id': user_id,
-                 'date': datetime.now(timezone.utc).isoformat(),
-                 'location': property,
-                 'asOf': as_of_date,
-                 'totalUnits': total_units,
-                 'unitsConfirmed': False,
-                 'totalBalance': outstanding_balance,
-                 'floorplans': surveyed_floorplans,
-                 'vacancy': vacancy_data,
-                 'lossToLease': loss_to_lease,
-                 'charges': charges,
-                 'recentLeases': recent_leases_analysis,
-                 'expiringLeases': expired_leases,
-                 'leaseTrends': lease_trends,
-                 'data': filtered_clean_data,
-                 }          
-
-    return property_data
\ No newline at end of file
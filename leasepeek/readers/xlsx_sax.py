@@ -0,0 +1,386 @@
+"""
+Module Description:
+This module is a lightweight .xlsx sheet reader built directly on `zipfile` and `xml.etree.ElementTree.iterparse`. It streams the worksheet XML instead of going through pandas and openpyxl, which build a cell object (including its style) for every cell of the sheet before any of it is used.
+
+Only the parts of the workbook needed to produce cell values are read:
+- xl/workbook.xml and its relationships, to locate the first worksheet and the date system in use.
+- xl/styles.xml, to find the cell formats that display dates.
+- xl/sharedStrings.xml, which is parsed lazily, only as far as the highest string index referenced so far.
+
+Rows are yielded in the same form as `leasepeek.readers.xlsx_stream.iter_xlsx_rows`, so the two readers are interchangeable.
+
+Property-management exports often carry thousands of formatted but empty rows and columns past the data. The reader never allocates those: cells without a value are skipped and trailing empty rows are never yielded. The sheet's <dimension> is not relied on, since exports often understate it; the extent comes from the cells themselves. `find_data_extent` reports the real extent of the data so the other engines can be trimmed the same way.
+
+Classes:
+- XlsxSheetReader: Opens a workbook and streams the rows of its first worksheet.
+
+Functions:
+- excel_serial_to_datetime: Converts an Excel serial date number into a datetime.
+- iter_sheet_rows: Yields the normalized rows of the first worksheet of an .xlsx file.
+- find_data_extent: Finds the number of rows and columns spanned by the non-empty cells of the first worksheet.
+"""
+from leasepeek.readers.xlsx_stream import normalize_cell
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+from xml.etree.ElementTree import iterparse
+from datetime import datetime, timedelta
+import posixpath
+import zipfile
+
+# XML namespaces used by SpreadsheetML parts.
+main_ns = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+relationship_ns = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+package_relationship_ns = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# Day zero of the two date systems Excel supports. The 1900 system is anchored at 1899-12-30 to absorb Excel's fictitious 1900-02-29.
+windows_epoch = datetime(1899, 12, 30)
+mac_epoch = datetime(1904, 1, 1)
+
+def excel_serial_to_datetime(serial, epoch=windows_epoch):
+    """
+    Converts an Excel serial date number into a datetime.
+
+    Args:
+    serial (int or float): The number of days since the workbook's epoch. The fractional part is the time of day.
+    epoch (datetime): The workbook's day zero, `windows_epoch` or `mac_epoch`.
+
+    Returns:
+    datetime: The date and time represented by the serial number, rounded to the millisecond.
+    """
+    # Serials before 1900-03-01 precede Excel's fictitious leap day, so they are one day later than the epoch suggests.
+    if epoch == windows_epoch and 0 < serial < 60:
+        serial += 1
+    days, fraction = divmod(serial, 1)
+    return epoch + timedelta(days=days, milliseconds=round(fraction * 86400000))
+
+
+def column_index(reference):
+    """
+    Converts a cell reference such as 'AB12' into its zero-based column index.
+    """
+    index = 0
+    for character in reference:
+        if character.isdigit():
+            break
+        index = index * 26 + ord(character) - 64
+    return index - 1
+
+
+def sheet_row_elements(source):
+    """
+    Yields the <row> elements of a worksheet as they are parsed, releasing each one once the caller moves on to the next.
+
+    Clearing a row alone doesn't bound memory: the <sheetData> element still holds every emptied row. Each processed row is therefore also removed from it, so memory stays bounded by a single row however long the sheet is.
+
+    Args:
+    source: The worksheet XML, as a binary file-like object.
+
+    Yields:
+    Element: Each <row> element, with its cells.
+    """
+    row_tag = main_ns + 'row'
+    sheet_data_tag = main_ns + 'sheetData'
+    sheet_data = None
+    for event, element in iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            if element.tag == sheet_data_tag:
+                sheet_data = element
+            continue
+        if element.tag != row_tag:
+            continue
+        yield element
+        element.clear()
+        if sheet_data is not None:
+            sheet_data.remove(element)
+
+
+class SharedStrings:
+    """
+    Lazily parsed shared strings table.
+
+    Strings are read from xl/sharedStrings.xml only as far as the highest index requested so far, so a sheet that references the first few hundred strings never parses the rest of the table.
+    """
+    def __init__(self, archive, path):
+        self.strings = []
+        self.parser = None
+        # The <sst> root, from which parsed string items are removed so they don't accumulate.
+        self.root = None
+        if path in archive.namelist():
+            self.source = archive.open(path)
+            self.parser = iterparse(self.source, events=('start', 'end'))
+
+    def __getitem__(self, index):
+        while index >= len(self.strings) and self.parser is not None:
+            try:
+                event, element = next(self.parser)
+            except StopIteration:
+                self.close()
+                break
+            if event == 'start':
+                if self.root is None:
+                    self.root = element
+                continue
+            if element.tag == main_ns + 'si':
+                self.strings.append(self.read_string_item(element))
+                element.clear()
+                self.root.remove(element)
+        return self.strings[index]
+
+    def read_string_item(self, element):
+        # Plain strings hold a single <t>; rich text splits the string across <r><t> runs. Phonetic runs (<rPh>) are not part of the value.
+        text = element.find(main_ns + 't')
+        if text is not None:
+            return text.text or ''
+        return ''.join(run.findtext(main_ns + 't') or '' for run in element.iter(main_ns + 'r'))
+
+    def close(self):
+        if self.parser is not None:
+            self.source.close()
+            self.parser = None
+
+
+class XlsxSheetReader:
+    """
+    Streams the rows of the first worksheet of an .xlsx file.
+
+    Usage:
+    >>> with XlsxSheetReader(file_obj) as reader:
+    ...     for row in reader.rows():
+    ...         ...
+
+    Args:
+    file_obj: A path or a binary file-like object containing the workbook.
+    """
+    def __init__(self, file_obj):
+        self.archive = zipfile.ZipFile(file_obj)
+        self.epoch = windows_epoch
+        self.sheet_path = 'xl/worksheets/sheet1.xml'
+        self.shared_strings_path = 'xl/sharedStrings.xml'
+        self.read_workbook()
+        self.date_styles = self.read_date_styles()
+        self.shared_strings = SharedStrings(self.archive, self.shared_strings_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.shared_strings.close()
+        self.archive.close()
+
+    def read_workbook(self):
+        """
+        Locates the first worksheet and the shared strings table, and detects the 1904 date system.
+        """
+        names = set(self.archive.namelist())
+        if 'xl/workbook.xml' not in names:
+            return
+
+        first_sheet_id = None
+        with self.archive.open('xl/workbook.xml') as source:
+            for event, element in iterparse(source):
+                if element.tag == main_ns + 'workbookPr' and element.get('date1904') in ('1', 'true'):
+                    self.epoch = mac_epoch
+                elif element.tag == main_ns + 'sheet' and first_sheet_id is None:
+                    first_sheet_id = element.get(relationship_ns + 'id')
+
+        if 'xl/_rels/workbook.xml.rels' not in names:
+            return
+        with self.archive.open('xl/_rels/workbook.xml.rels') as source:
+            for event, element in iterparse(source):
+                if element.tag != package_relationship_ns + 'Relationship':
+                    continue
+                # Targets are relative to xl/ unless they start with a slash.
+                target = element.get('Target', '')
+                target = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+                if element.get('Id') == first_sheet_id and target in names:
+                    self.sheet_path = target
+                elif element.get('Type', '').endswith('/sharedStrings'):
+                    self.shared_strings_path = target
+
+    def read_date_styles(self):
+        """
+        Returns the indices of the cell formats (cellXfs) whose number format displays a date.
+        """
+        if 'xl/styles.xml' not in self.archive.namelist():
+            return set()
+
+        custom_formats = {}
+        style_format_ids = []
+        in_cell_formats = False
+        with self.archive.open('xl/styles.xml') as source:
+            for event, element in iterparse(source, events=('start', 'end')):
+                if element.tag == main_ns + 'cellXfs':
+                    in_cell_formats = event == 'start'
+                elif event == 'end' and element.tag == main_ns + 'numFmt':
+                    custom_formats[int(element.get('numFmtId'))] = element.get('formatCode', '')
+                elif event == 'end' and element.tag == main_ns + 'xf' and in_cell_formats:
+                    style_format_ids.append(int(element.get('numFmtId', 0)))
+
+        date_styles = set()
+        for style_index, format_id in enumerate(style_format_ids):
+            format_code = custom_formats.get(format_id, BUILTIN_FORMATS.get(format_id, 'General'))
+            if is_date_format(format_code):
+                date_styles.add(style_index)
+        return date_styles
+
+    def data_extent(self):
+        """
+        Finds the number of rows and columns spanned by the non-empty cells of the worksheet.
+
+        Only the cell tags are inspected; values are not converted. Every row is scanned, whatever range the sheet's <dimension> declares, since exports often understate it.
+
+        Returns:
+        tuple: (rows, columns) of the smallest range, anchored at A1, that holds every non-empty cell.
+        """
+        cell_tag = main_ns + 'c'
+        value_tag = main_ns + 'v'
+        last_row = last_col = 0
+
+        with self.archive.open(self.sheet_path) as source:
+            next_row = 0
+            for element in sheet_row_elements(source):
+                row_number = element.get('r')
+                row_index = int(row_number) - 1 if row_number else next_row
+                next_row = row_index + 1
+
+                position = 0
+                for cell in element.iter(cell_tag):
+                    reference = cell.get('r')
+                    column = column_index(reference) if reference else position
+                    position = column + 1
+                    # Error cells are read as missing values, so they do not extend the data.
+                    if cell.get('t') == 'e' or (cell.find(value_tag) is None and cell.get('t') != 'inlineStr'):
+                        continue
+                    last_row = row_index + 1
+                    last_col = max(last_col, column + 1)
+
+        return last_row, last_col
+
+    def cell_value(self, cell):
+        """
+        Converts a <c> element into its Python value.
+        """
+        cell_type = cell.get('t', 'n')
+        if cell_type == 'inlineStr':
+            inline_string = cell.find(main_ns + 'is')
+            return None if inline_string is None else self.shared_strings.read_string_item(inline_string)
+
+        value = cell.findtext(main_ns + 'v')
+        if value is None:
+            return None
+        if cell_type == 's':
+            return self.shared_strings[int(value)]
+        if cell_type == 'str':
+            return value
+        if cell_type == 'b':
+            return value == '1'
+        if cell_type == 'e':
+            return None
+        if cell_type == 'd':
+            return datetime.fromisoformat(value)
+
+        number = float(value) if '.' in value or 'E' in value or 'e' in value else int(value)
+        if int(cell.get('s', 0)) in self.date_styles:
+            return excel_serial_to_datetime(number, self.epoch)
+        return number
+
+    def rows(self, min_row=0, columns=None):
+        """
+        Yields the normalized values of each row of the worksheet.
+
+        Missing rows are yielded as empty tuples so row positions line up with the equivalent DataFrame. Cells without a value are skipped rather than padded, and empty rows after the last non-empty row are never yielded.
+
+        Args:
+        min_row (int): The zero-based index of the first row to yield. Earlier rows are skipped without reading their cells.
+        columns (set): The zero-based indices of the columns to read. Other cells are skipped without being converted and are returned as None. Defaults to every column.
+
+        Yields:
+        tuple: The normalized cell values of each row, starting with row `min_row`.
+        """
+        cell_tag = main_ns + 'c'
+        # Column letters repeat on every row, so their indices are computed once.
+        column_indices = {}
+
+        with self.archive.open(self.sheet_path) as source:
+            next_row = 0
+            # Empty rows are only yielded once a non-empty row follows them.
+            pending_empty_rows = 0
+            # Each row's parsed cells are released once the next row is read, so memory stays bounded by a single row.
+            for element in sheet_row_elements(source):
+                row_number = element.get('r')
+                row_index = int(row_number) - 1 if row_number else next_row
+                if row_index < min_row:
+                    next_row = row_index + 1
+                    continue
+                pending_empty_rows += row_index - max(next_row, min_row)
+                next_row = row_index + 1
+
+                values = []
+                for cell in element.iter(cell_tag):
+                    reference = cell.get('r')
+                    if reference:
+                        letters = reference.rstrip('0123456789')
+                        column = column_indices.get(letters)
+                        if column is None:
+                            column = column_indices[letters] = column_index(letters)
+                    else:
+                        column = len(values)
+                    if columns is not None and column not in columns:
+                        # Keep positions aligned for cells without a reference.
+                        if not reference:
+                            values.append(None)
+                        continue
+                    value = normalize_cell(self.cell_value(cell))
+                    if value is None:
+                        if not reference:
+                            values.append(None)
+                        continue
+                    if column < len(values):
+                        values[column] = value
+                        continue
+                    values.extend([None] * (column - len(values)))
+                    values.append(value)
+
+                while values and values[-1] is None:
+                    values.pop()
+                if not values:
+                    pending_empty_rows += 1
+                    continue
+                for _ in range(pending_empty_rows):
+                    yield ()
+                pending_empty_rows = 0
+                yield tuple(values)
+
+
+def iter_sheet_rows(file_obj, min_row=0, columns=None):
+    """
+    Yields the normalized rows of the first worksheet of an .xlsx file.
+
+    Args:
+    file_obj: A path or a binary file-like object containing the workbook.
+    min_row (int): The zero-based index of the first row to yield.
+    columns (set): The zero-based indices of the columns to read. Defaults to every column.
+
+    Yields:
+    tuple: The normalized cell values of each row, starting with row `min_row`.
+    """
+    with XlsxSheetReader(file_obj) as reader:
+        yield from reader.rows(min_row, columns)
+
+
+def find_data_extent(file_obj):
+    """
+    Finds the number of rows and columns spanned by the non-empty cells of the first worksheet of an .xlsx file.
+
+    This is the trimming stage for engines that cannot skip empty cells themselves: reading no more than this many rows and columns leaves out the formatted but empty rows and columns some exports carry.
+
+    Args:
+    file_obj: A path or a binary file-like object containing the workbook.
+
+    Returns:
+    tuple: (rows, columns) of the smallest range, anchored at A1, that holds every non-empty cell.
+    """
+    with XlsxSheetReader(file_obj) as reader:
+        return reader.data_extent()
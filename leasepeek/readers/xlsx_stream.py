@@ -0,0 +1,90 @@
+"""
+Module Description:
+This module provides a streaming alternative to `pd.read_excel` for uploaded rent rolls. Rather than materializing the whole workbook as a DataFrame, it iterates the first worksheet row by row with openpyxl's read-only mode, so only the row currently being processed is held in memory.
+
+Rows are yielded as tuples of plain Python values, normalized the same way pandas normalizes cells when it reads a workbook: empty cells, error cells and the default NA strings become None, and integral floats become integers. The row index of a yielded row matches the row index of the equivalent DataFrame.
+
+Functions:
+- normalize_cell: Converts a raw cell value into the value pandas would have produced for it.
+- iter_xlsx_rows: Yields the normalized rows of the first worksheet of an .xlsx file.
+- header_frame: Builds a small DataFrame out of buffered header rows for the preamble readers.
+"""
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES
+import numpy as np
+import pandas as pd
+
+# Strings that pandas treats as missing values by default when reading a workbook.
+na_strings = {'', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'}
+
+def normalize_cell(value):
+    """
+    Converts a raw cell value into the value pandas would have produced for it.
+
+    Args:
+    value: The cell value as read from the worksheet.
+
+    Returns:
+    The normalized value. Missing values are returned as None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        if value in na_strings or value in ERROR_CODES:
+            return None
+        return value
+    # Integral floats are stored as integers, matching pandas' handling of numeric cells.
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def iter_xlsx_rows(file_obj, min_row=0, columns=None, extent=None):
+    """
+    Yields the rows of the first worksheet of an .xlsx file without loading the whole workbook.
+
+    The workbook is opened in read-only mode and each row is normalized with `normalize_cell` before it is yielded. Missing rows are yielded as empty tuples so row positions line up with the equivalent DataFrame. The workbook is closed once the generator is exhausted or discarded.
+
+    Args:
+    file_obj: A path or a binary file-like object containing the workbook.
+    min_row (int): The zero-based index of the first row to yield.
+    columns (set): The zero-based indices of the columns to read. Cells past the last of these columns are not created, and other cells are returned as None. Defaults to every column.
+    extent (tuple): The (rows, columns) spanned by the data, as returned by `leasepeek.readers.xlsx_sax.find_data_extent`. Rows and columns past it are neither created nor iterated. Defaults to the whole sheet.
+
+    Yields:
+    tuple: The normalized cell values of each row, starting with row `min_row`.
+    """
+    workbook = load_workbook(file_obj, read_only=True, data_only=True, keep_links=False)
+    try:
+        worksheet = workbook.worksheets[0]
+        # Dimensions written by exporters are often wrong; let openpyxl size each row from its own cells instead.
+        worksheet.reset_dimensions()
+        max_row, max_col = extent or (None, None)
+        if columns:
+            max_col = min(max(columns) + 1, max_col or max(columns) + 1)
+        if max_row is not None and max_row <= min_row:
+            return
+        for row in worksheet.iter_rows(min_row=min_row + 1, max_row=max_row, max_col=max_col, values_only=True):
+            if columns is None:
+                yield tuple(normalize_cell(value) for value in row)
+            else:
+                yield tuple(normalize_cell(value) if index in columns else None for index, value in enumerate(row))
+    finally:
+        workbook.close()
+
+
+def header_frame(rows):
+    """
+    Builds a DataFrame out of buffered header rows.
+
+    The preamble readers (`find_unit_data_types`, `find_property_name` and `find_as_of_date`) only ever look at the first few rows of a sheet. This builds a DataFrame that looks like the top of `pd.read_excel(file_obj, header=None)` so those readers can run unchanged against a streamed workbook.
+
+    Args:
+    rows (list): The first rows of the worksheet, as yielded by `iter_xlsx_rows`.
+
+    Returns:
+    DataFrame: An object-dtype DataFrame with missing values stored as NaN.
+    """
+    width = max((len(row) for row in rows), default=0)
+    padded_rows = [[np.nan if value is None else value for value in row] + [np.nan] * (width - len(row)) for row in rows]
+    return pd.DataFrame(padded_rows, dtype=object)
@@ -0,0 +1,28 @@
+import os
+from django.test import SimpleTestCase
+from leasepeek.readers.xlsx import read_xlsx_file
+from leasepeek.data_updaters.basic_data_updates import date_relative_analytics, lease_date_fields
+from leasepeek.readers.reader_functions.recent_leases import recent_leases
+from leasepeek.readers.reader_functions.lease_trends import analyze_lease_trends
+
+class DateRelativeAnalyticsTest(SimpleTestCase):
+    # Test that the analytics recomputed from the projected stored units match the ones computed on upload
+    def test_matches_upload(self):
+        BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        document = read_xlsx_file(os.path.join(BASE_DIR, 'test_data', 'good_test_data.xlsx'), 'testuser', 'good_test_data.xlsx')
+        stored_units = [{field: unit[field] for field in lease_date_fields if field in unit} for unit in document['data']]
+
+        analytics = date_relative_analytics(stored_units, document['asOf'])
+
+        for key in ('recentLeases', 'expiringLeases', 'leaseTrends'):
+            self.assertEqual(analytics[key], document[key])
+
+    # Test that recent lease windows and a lease trend horizon passed to the reader are the ones computed
+    def test_reader_windows_and_horizon(self):
+        BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        document = read_xlsx_file(os.path.join(BASE_DIR, 'test_data', 'good_test_data.xlsx'), 'testuser', 'good_test_data.xlsx', recent_lease_windows=(365, 30), trend_months=24)
+        stored_units = [{field: unit[field] for field in lease_date_fields if field in unit} for unit in document['data']]
+
+        self.assertEqual(document['recentLeases'], recent_leases(stored_units, document['asOf'], (365, 30)))
+        self.assertEqual(document['leaseTrends'], analyze_lease_trends(stored_units, document['asOf'], 24))
+        self.assertEqual(len(document['leaseTrends']), 24)
@@ -0,0 +1,25 @@
+from django.test import SimpleTestCase
+from leasepeek.readers.reader_functions.floorplan_survey import floorplan_survey
+from leasepeek.readers.reader_functions.status_resolution import resolve_stored_status
+from leasepeek.data_updaters.unit_aggregates import survey_plan
+
+class FloorplanSurveyTest(SimpleTestCase):
+    def setUp(self):
+        # Stored units of a single floorplan with fractional square footage
+        self.units = [
+            {'unit': '101', 'floorplan': 'A1', 'market': 1000, 'rent': 900, 'sqft': 775.5, 'status': 'occupied'},
+            {'unit': '102', 'floorplan': 'A1', 'market': 1100, 'rent': 1000, 'sqft': 600.25, 'status': 'occupied'},
+        ]
+
+    # Test that fractional square footage is summed as it is, not truncated
+    def test_fractional_sqft(self):
+        plan = floorplan_survey(self.units)['A1']
+        self.assertEqual(plan['avgSqft'], 687.88)
+        self.assertEqual(plan['rentPerSqft'], round(1900 / 1375.75, 2))
+
+    # Test that the survey recomputed when units are edited handles fractional square footage the same way
+    def test_fractional_sqft_recomputed_survey(self):
+        resolutions = [resolve_stored_status(unit['status']) for unit in self.units]
+        plan = survey_plan(self.units, resolutions, 'A1')
+        self.assertEqual(plan['avgSqft'], 687.88)
+        self.assertEqual(plan, floorplan_survey(self.units)['A1'])
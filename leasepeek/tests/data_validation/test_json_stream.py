@@ -0,0 +1,29 @@
+import os
+import json
+import bson
+from bson.raw_bson import RawBSONDocument
+from django.test import SimpleTestCase
+from django.core.serializers.json import DjangoJSONEncoder
+from leasepeek.readers.xlsx import read_xlsx_file
+from leasepeek.json_stream import property_json_chunks, raw_codec_options
+
+class JsonStreamTest(SimpleTestCase):
+    def setUp(self):
+        # Read the test file as the stored property document, and the JSON JsonResponse would return for it
+        BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.document = read_xlsx_file(os.path.join(BASE_DIR, 'test_data', 'good_test_data.xlsx'), 'testuser', 'good_test_data.xlsx')
+        self.expected = json.dumps([self.document], cls=DjangoJSONEncoder)
+
+    def raw_document(self, document):
+        # Helper method to encode a document as MongoDB would return it with the raw codec options
+        return RawBSONDocument(bson.encode(document), raw_codec_options)
+
+    # Test that a property embedding its units streams the same JSON as JsonResponse
+    def test_embedded_units(self):
+        self.assertEqual(''.join(property_json_chunks(self.raw_document(self.document))), self.expected)
+
+    # Test that a property whose units are read from their own collection streams the same JSON as JsonResponse
+    def test_separate_units(self):
+        summaries = {key: value for key, value in self.document.items() if key != 'data'}
+        units = (self.raw_document(unit) for unit in self.document['data'])
+        self.assertEqual(''.join(property_json_chunks(self.raw_document(summaries), units)), self.expected)
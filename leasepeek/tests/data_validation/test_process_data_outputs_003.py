@@ -5,7 +5,7 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
-from leasepeek.mongo_models import data_collection
+from leasepeek.mongo_models import data_collection, units_collection
 
 class ProcessDataViewValuesTest(APITestCase):
     def setUp(self):
@@ -55,7 +55,7 @@ class ProcessDataViewValuesTest(APITestCase):
         file_name = os.environ.get('03_TEST_FILE_NAME')
         objectId = self.upload_test_file(file_name)
         response = self.client.get(self.read_data_url, {'objectId': objectId}, HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
-        response_data = json.loads(response.content)[0]
+        response_data = json.loads(response.getvalue())[0]
         days_90 = 'last_90_days'
         days_60 = 'last_60_days'
         days_30 = 'last_30_days'
@@ -316,5 +316,6 @@ class ProcessDataViewValuesTest(APITestCase):
         # Delete all documents in the dat collection
         try:
             data_collection.delete_many({})
+            units_collection.delete_many({})
         except Exception as e:
             print(f"An error occurred during teardown: {e}")
\ No newline at end of file
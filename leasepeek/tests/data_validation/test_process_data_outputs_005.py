@@ -4,7 +4,7 @@ from django.urls import reverse
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
-from leasepeek.mongo_models import data_collection
+from leasepeek.mongo_models import data_collection, units_collection
 
 class ProcessDataViewValuesTest(APITestCase):
     def setUp(self):
@@ -53,7 +53,7 @@ class ProcessDataViewValuesTest(APITestCase):
         file_name = os.environ.get('05_TEST_FILE_NAME')
         objectId = self.upload_test_file(file_name)
         response = self.client.get(self.read_data_url, {'objectId': objectId}, HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
-        response_data = json.loads(response.content)[0]
+        response_data = json.loads(response.getvalue())[0]
 
 
         self.assertEqual(response_data['asOf'], os.environ.get('05_TEST_FILE_AS_OF'))
@@ -339,5 +339,6 @@ class ProcessDataViewValuesTest(APITestCase):
         # Delete all documents in the dat collection
         try:
             data_collection.delete_many({})
+            units_collection.delete_many({})
         except Exception as e:
             print(f"An error occurred during teardown: {e}")
\ No newline at end of file
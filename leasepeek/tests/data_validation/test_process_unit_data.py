@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+from leasepeek.readers.reader_functions.process_unit_data import process_unit_data, process_unit_rows
+
+class ProcessUnitDataTest(SimpleTestCase):
+    def process(self, rows, data_types):
+        # Helper method processing the same rows as a DataFrame and as a row stream
+        data_frame = pd.DataFrame([[np.nan if value is None else value for value in row] for row in rows], dtype=object)
+        return process_unit_data(data_frame, dict(data_types)), list(process_unit_rows(rows, data_types))
+
+    # Test that charges are read from a layout with separate charge and credit amount columns, credit-only lines included
+    def test_credit_amount_column(self):
+        rows = [
+            ['Unit', 'Name', 'Description', 'Charge Amount', 'Credit Amount'],
+            ['101', 'Jane Doe', 'Rent', 1000, None],
+            [None, None, 'Concession', None, -50],
+            [None, None, 'Parking', 0, -25.5],
+            ['102', 'John Doe', 'Rent', 1200, None],
+            [None, None, 'Rent', 10.25, None],
+            ['Total', None, None, None, None],
+        ]
+        data_types = {'Title Row': 0, 'Unit': 0, 'Name': 1, 'Description': 2, 'Charge Amount': 3, 'Credit Amount': 4}
+
+        expected = [
+            {'Unit': '101', 'Name': 'Jane Doe', 'Rent': 1000, 'Concession': -50, 'Parking': -25.5},
+            {'Unit': '102', 'Name': 'John Doe', 'Rent': 1210.25},
+        ]
+        for units in self.process(rows, data_types):
+            self.assertEqual(units, expected)
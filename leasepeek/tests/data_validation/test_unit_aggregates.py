@@ -0,0 +1,108 @@
+import os
+from collections import Counter
+from django.test import SimpleTestCase
+from leasepeek.readers.xlsx import read_xlsx_file
+from leasepeek.readers.reader_functions.floorplan_survey import floorplan_survey
+from leasepeek.readers.reader_functions.loss_to_lease import find_loss_to_lease
+from leasepeek.readers.reader_functions.status_resolution import resolve_stored_status
+from leasepeek.data_updaters.unit_aggregates import unit_status_update, emptied_vacancy_updates
+
+class UnitAggregatesTest(SimpleTestCase):
+    def setUp(self):
+        # Read the test file once per test, as the stored property document
+        BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.document = read_xlsx_file(os.path.join(BASE_DIR, 'test_data', 'good_test_data.xlsx'), 'testuser', 'good_test_data.xlsx')
+
+    def apply_update(self, update):
+        # Helper method applying the '$inc', '$set' and '$unset' paths of an update to the document, as the database would
+        for path, delta in update.get('$inc', {}).items():
+            target, field = self.resolve_path(path, create=True)
+            target[field] = target.get(field, 0) + delta
+        for path, value in update.get('$set', {}).items():
+            target, field = self.resolve_path(path, create=True)
+            if isinstance(target, list):
+                target[int(field)] = value
+            else:
+                target[field] = value
+        for path in update.get('$unset', {}):
+            target, field = self.resolve_path(path)
+            target.pop(field)
+
+    def resolve_path(self, path, create=False):
+        # Helper method returning the parent of a dotted path and the field it ends with, creating missing parents if asked to
+        *parents, field = path.split('.')
+        target = self.document
+        for key in parents:
+            if isinstance(target, list):
+                target = target[int(key)]
+            else:
+                target = target.setdefault(key, {}) if create else target[key]
+        return target, field
+
+    def apply_emptied_vacancy_updates(self, update):
+        # Helper method applying the updates dropping emptied vacancy statuses, where their filter matches the document
+        for query, vacancy_update in emptied_vacancy_updates(update):
+            (path, condition), = query.items()
+            target, field = self.resolve_path(path)
+            if target[field] <= condition['$lte']:
+                self.apply_update(vacancy_update)
+
+    # Test that the incrementally updated aggregates match the ones computed from the edited units
+    def test_status_edits_match_recomputed_aggregates(self):
+        units = self.document['data']
+        new_statuses = {units[0]['unit']: 'vacant', units[1]['unit']: 'down', units[2]['unit']: 'occupied'}
+
+        update, unit_statuses = unit_status_update(self.document, new_statuses)
+        self.apply_update(update)
+        self.apply_emptied_vacancy_updates(update)
+        for index, unit_status in unit_statuses.items():
+            units[index]['status'] = unit_status
+
+        counts = {status: vacancy['count'] for status, vacancy in self.document['vacancy'].items()}
+        self.assertEqual(counts, dict(Counter(resolve_stored_status(unit['status']).vacancy_status for unit in units)))
+
+        survey = floorplan_survey(units)
+        for plan_name, plan in survey.items():
+            for field, value in plan.items():
+                self.assertEqual(self.document['floorplans'][plan_name][field], value)
+        self.assertEqual(set(self.document['floorplans']), set(survey))
+
+        loss_to_lease = find_loss_to_lease(units)
+        self.assertEqual(self.document['lossToLease']['marketSum'], loss_to_lease['marketSum'])
+        self.assertEqual(self.document['lossToLease']['rentIncome'], loss_to_lease['rentIncome'])
+
+    # Test that an edit that doesn't change any status leaves the document alone
+    def test_unchanged_status(self):
+        unit = self.document['data'][0]
+        self.assertEqual(unit_status_update(self.document, {unit['unit']: unit['status']}), ({}, {}))
+
+    # Test that totals are incremented rather than overwritten, so concurrent edits of the same property add up
+    def test_concurrent_edits_add_up(self):
+        units = self.document['data']
+        occupied = [unit for unit in units if unit['status'] == 'occupied'][:2]
+        first_update, first_statuses = unit_status_update(self.document, {occupied[0]['unit']: 'applicant'})
+        second_update, second_statuses = unit_status_update(self.document, {occupied[1]['unit']: 'applicant'})
+
+        # Both edits were built from the same stored property, as concurrent requests would be
+        for update, unit_statuses in ((first_update, first_statuses), (second_update, second_statuses)):
+            self.apply_update({operator: paths for operator, paths in update.items() if operator == '$inc'})
+            for index, unit_status in unit_statuses.items():
+                units[index]['status'] = unit_status
+
+        counts = {status: vacancy['count'] for status, vacancy in self.document['vacancy'].items()}
+        self.assertEqual(counts, dict(Counter(resolve_stored_status(unit['status']).vacancy_status for unit in units)))
+        loss_to_lease = find_loss_to_lease(units)
+        self.assertEqual(self.document['lossToLease']['marketSum'], loss_to_lease['marketSum'])
+        self.assertEqual(self.document['lossToLease']['rentIncome'], loss_to_lease['rentIncome'])
+
+    # Test that a vacancy status is dropped once its last unit is edited away
+    def test_emptied_vacancy_status(self):
+        units = self.document['data']
+        vacancy_status = min((status for status in self.document['vacancy'] if status != 'Occupied'), key=lambda status: self.document['vacancy'][status]['count'])
+        emptied = [unit for unit in units if resolve_stored_status(unit['status']).vacancy_status == vacancy_status]
+
+        update, unit_statuses = unit_status_update(self.document, {unit['unit']: 'occupied' for unit in emptied})
+        self.apply_update(update)
+        self.apply_emptied_vacancy_updates(update)
+        self.assertNotIn(vacancy_status, self.document['vacancy'])
+        self.assertEqual(self.document['vacancy']['Occupied']['count'], sum(resolve_stored_status(unit['status']).vacancy_status == 'Occupied' for unit in units) + len(emptied))
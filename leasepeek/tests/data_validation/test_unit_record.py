@@ -0,0 +1,22 @@
+from django.test import SimpleTestCase
+from leasepeek.readers.reader_functions.unit_record import UnitRecord, UnitCharge
+
+class UnitRecordTest(SimpleTestCase):
+    # Test that only the fields of a record can be read and set like the keys of a dict
+    def test_item_access_is_limited_to_fields(self):
+        for record in [UnitRecord(), UnitCharge('rub', 0)]:
+            for key in ['keys', 'to_dict', '__slots__', '__class__']:
+                with self.subTest(record=type(record).__name__, key=key):
+                    with self.assertRaises(KeyError):
+                        record[key]
+                    with self.assertRaises(KeyError):
+                        record[key] = None
+
+    # Test that a removed field can no longer be read, but can be set again
+    def test_removed_field(self):
+        unit = UnitRecord()
+        unit.pop('tenant')
+        with self.assertRaises(KeyError):
+            unit['tenant']
+        unit['tenant'] = 'Jane Doe'
+        self.assertEqual(unit['tenant'], 'Jane Doe')
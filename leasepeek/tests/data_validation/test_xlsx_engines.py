@@ -0,0 +1,129 @@
+import io
+import os
+import re
+import zipfile
+from django.test import SimpleTestCase
+from leasepeek.readers.xlsx import read_xlsx_file
+
+class XlsxEngineTest(SimpleTestCase):
+    def build_test_path(self, filename):
+        # Helper method to build the path of a test file
+        BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return os.path.join(BASE_DIR, 'test_data', filename)
+
+    def read_document(self, filename, engine):
+        # Helper method to read a test file with the given engine, dropping the processing timestamp
+        with open(self.build_test_path(filename), 'rb') as file_obj:
+            document = read_xlsx_file(file_obj, 'testuser', filename, engine=engine)
+        document.pop('date')
+        return document
+
+    # Test that the streaming engines produce the same document as the pandas engine on every test layout
+    def test_engines_match_pandas(self):
+        test_files = ['good_test_data.xlsx'] + [os.environ.get(f'0{i}_TEST_FILE_NAME') for i in range(1, 8)]
+
+        for name in filter(None, test_files):
+            reference = self.read_document(name, 'pandas')
+            for engine in ['openpyxl', 'sax']:
+                with self.subTest(file=name, engine=engine):
+                    self.assertEqual(self.read_document(name, engine), reference)
+
+    # Test that an unknown engine is rejected
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            read_xlsx_file(self.build_test_path('good_test_data.xlsx'), 'testuser', 'good_test_data.xlsx', engine='xlrd')
+
+    # Test that requesting some outputs only runs the stages they need, and matches the full document
+    def test_output_subset(self):
+        reference = self.read_document('good_test_data.xlsx', 'pandas')
+
+        for engine in ['pandas', 'openpyxl', 'sax']:
+            with self.subTest(engine=engine):
+                timings = {}
+                outputs = read_xlsx_file(self.build_test_path('good_test_data.xlsx'), 'testuser', 'good_test_data.xlsx', engine=engine, outputs=('location', 'asOf'), timings=timings)
+                self.assertEqual(outputs, {'location': reference['location'], 'asOf': reference['asOf']})
+                self.assertIn('find_as_of_date', timings)
+                self.assertNotIn('clean_unit_data', timings)
+
+    # Test that values that can't be parsed are reported in the parse diagnostics by every engine, and logged once for the upload
+    def test_parse_diagnostics(self):
+        # Copy the test file, replacing the size of the first unit with text
+        workbook = io.BytesIO()
+        with zipfile.ZipFile(self.build_test_path('good_test_data.xlsx')) as source, zipfile.ZipFile(workbook, 'w') as target:
+            for name in source.namelist():
+                content = source.read(name)
+                if name == 'xl/worksheets/sheet1.xml':
+                    content = content.replace(b'<c r="C8" s="9"><v>775.0</v></c>', b'<c r="C8" t="inlineStr"><is><t>n/a sqft</t></is></c>')
+                target.writestr(name, content)
+
+        for engine in ['pandas', 'openpyxl', 'sax']:
+            with self.subTest(engine=engine):
+                workbook.seek(0)
+                outputs = read_xlsx_file(workbook, 'testuser', 'good_test_data.xlsx', engine=engine, outputs=('parse_diagnostics',))
+                self.assertEqual(outputs['parse_diagnostics'], [{'unit': '1101', 'key': 'Unit Sq Ft', 'value': 'n/a sqft'}])
+
+                workbook.seek(0)
+                with self.assertLogs('leasepeek.readers.xlsx', level='WARNING') as logs:
+                    document = read_xlsx_file(workbook, 'testuser', 'good_test_data.xlsx', engine=engine)
+                self.assertEqual(len(logs.output), 1)
+                self.assertEqual(document['data'][0]['sqft'], 0)
+
+    # Test that numeric market and rent cells holding cents are stored to the exact cent by every engine
+    def test_cent_valued_amounts(self):
+        # Copy the test file, giving the first unit, alone in its floorplan, a market rent and rent with cents
+        workbook = io.BytesIO()
+        with zipfile.ZipFile(self.build_test_path('good_test_data.xlsx')) as source, zipfile.ZipFile(workbook, 'w') as target:
+            for name in source.namelist():
+                content = source.read(name)
+                if name == 'xl/worksheets/sheet1.xml':
+                    content = content.replace(b'<c r="F8" s="9"><v>1450.0</v></c>', b'<c r="F8" s="9"><v>512.05</v></c>')
+                    content = content.replace(b'<c r="H9" s="9"><v>1450.0</v></c>', b'<c r="H9" s="9"><v>1234.57</v></c>')
+                target.writestr(name, content)
+
+        for engine in ['pandas', 'openpyxl', 'sax']:
+            with self.subTest(engine=engine):
+                workbook.seek(0)
+                document = read_xlsx_file(workbook, 'testuser', 'good_test_data.xlsx', engine=engine)
+                self.assertEqual((document['data'][0]['market'], document['data'][0]['rent']), (512.05, 1234.57))
+                plan = document['floorplans'][document['data'][0]['floorplan']]
+                self.assertEqual((plan['sumMarket'], plan['avgMarket'], plan['sumRent'], plan['avgRent']), (512.05, 512.05, 1234.57, 1234.57))
+
+    # Test that every engine reads a sheet without an end of data row to its end, finding the same units as with one
+    def test_missing_end_row(self):
+        reference = self.read_document('good_test_data.xlsx', 'pandas')
+
+        # Copy the test file, dropping the summary rows from the 'Summary Groups' row on
+        workbook = io.BytesIO()
+        with zipfile.ZipFile(self.build_test_path('good_test_data.xlsx')) as source, zipfile.ZipFile(workbook, 'w') as target:
+            for name in source.namelist():
+                content = source.read(name)
+                if name == 'xl/worksheets/sheet1.xml':
+                    content = re.sub(rb'<row r="(8[7-9]|9\d)".*?</row>', b'', content)
+                target.writestr(name, content)
+
+        for engine in ['pandas', 'openpyxl', 'sax']:
+            with self.subTest(engine=engine):
+                workbook.seek(0)
+                document = read_xlsx_file(workbook, 'testuser', 'good_test_data.xlsx', engine=engine)
+                document.pop('date')
+                self.assertEqual(document, reference)
+
+    # Test that a sheet whose <dimension> understates its data is still read in full by every engine
+    def test_understated_dimension(self):
+        reference = self.read_document('good_test_data.xlsx', 'pandas')
+
+        # Copy the test file, declaring a dimension that ends well before the last unit
+        workbook = io.BytesIO()
+        with zipfile.ZipFile(self.build_test_path('good_test_data.xlsx')) as source, zipfile.ZipFile(workbook, 'w') as target:
+            for name in source.namelist():
+                content = source.read(name)
+                if name == 'xl/worksheets/sheet1.xml':
+                    content = re.sub(rb'(<worksheet[^>]*>)', rb'\1<dimension ref="A1:Z40"/>', content, count=1)
+                target.writestr(name, content)
+
+        for engine in ['pandas', 'openpyxl', 'sax']:
+            with self.subTest(engine=engine):
+                workbook.seek(0)
+                document = read_xlsx_file(workbook, 'testuser', 'good_test_data.xlsx', engine=engine)
+                document.pop('date')
+                self.assertEqual(document, reference)
@@ -6,7 +6,8 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
-from leasepeek.mongo_models import data_collection
+from leasepeek.mongo_models import data_collection, units_collection
+from bson.objectid import ObjectId
 
 class ReadUserDataViewTest(APITestCase):
     @classmethod
@@ -77,6 +78,9 @@ class ReadUserDataViewTest(APITestCase):
          # Check that the response status code is 200 OK
         self.check_response_code(response, status.HTTP_200_OK)
 
+        # Check that the units of the property were deleted with it
+        self.assertEqual(units_collection.count_documents({'property_id': ObjectId(self.objectId)}), 0)
+
     # Test delete property with invalid credentials
     def test_delete_property_invalid_credentials(self):
         # Assume the setup has created an objectId
@@ -126,6 +130,7 @@ class ReadUserDataViewTest(APITestCase):
         # Delete all documents in the dat collection
         try:
             data_collection.delete_many({})
+            units_collection.delete_many({})
         except Exception as e:
             print(f"An error occurred during teardown: {e}")
 
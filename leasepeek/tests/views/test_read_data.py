@@ -6,7 +6,8 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
-from leasepeek.mongo_models import data_collection
+from leasepeek.mongo_models import data_collection, units_collection
+from bson.objectid import ObjectId
 
 class ReadDataViewTest(APITestCase):
     def setUp(self):
@@ -61,6 +62,10 @@ class ReadDataViewTest(APITestCase):
         # Check that the data read was successful
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+        # Check that the data was streamed as JSON
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
     # Test read data with invalid objectId
     def test_read_data_invalid_objectId(self):
         # A objectId of a MongoDB document is required for the read data request
@@ -86,10 +91,85 @@ class ReadDataViewTest(APITestCase):
         # Check that the data read was unauthorized
         self.assertEqual(data_read_response.status_code, status.HTTP_401_UNAUTHORIZED)
     
+    # Test that units stored in the units collection are assembled under 'data'
+    def test_read_data_assembles_units(self):
+        # Upload the test file
+        objectId = self.upload_test_file('good_test_data.xlsx')
+
+        # The property document keeps only the summaries
+        stored = data_collection.find_one({'_id': ObjectId(objectId)})
+        self.assertNotIn('data', stored)
+        unit_count = units_collection.count_documents({'property_id': ObjectId(objectId)})
+        self.assertGreater(unit_count, 0)
+
+        # Send read data GET request and check that every unit is returned in rent roll order
+        response = self.client.get(self.read_data_url, {'objectId': objectId}, HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+        units = json.loads(response.getvalue())[0]['data']
+        self.assertEqual(len(units), unit_count)
+        self.assertEqual([unit['unit'] for unit in units], [unit['unit'] for unit in units_collection.find({'property_id': ObjectId(objectId)}).sort('seq', 1)])
+        self.assertNotIn('property_id', units[0])
+
+    # Test that a property stored with embedded units is still read
+    def test_read_data_embedded_units(self):
+        # Store a property the way it was stored before units had their own collection
+        objectId = data_collection.insert_one({'user_id': self.user.user_id, 'totalUnits': 1, 'data': [{'unit': '101'}]}).inserted_id
+
+        # Send read data GET request and check that the embedded units are returned
+        response = self.client.get(self.read_data_url, {'objectId': str(objectId)}, HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+        self.assertEqual(json.loads(response.getvalue())[0]['data'], [{'unit': '101'}])
+
+    # Test reading only the requested fields of a property
+    def test_read_data_fields(self):
+        # Upload the test file
+        objectId = self.upload_test_file('good_test_data.xlsx')
+
+        # Send read data GET request for the floorplans and vacancy of the property
+        response = self.client.get(self.read_data_url, {'objectId': objectId, 'fields': 'floorplans,vacancy'}, HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+
+        # Check that only those fields were returned
+        self.assertEqual(set(json.loads(response.getvalue())[0]), {'floorplans', 'vacancy'})
+
+    # Test reading a slice of the units of a property, with some of their fields
+    def test_read_data_unit_slice(self):
+        # Upload the test file
+        objectId = self.upload_test_file('good_test_data.xlsx')
+        units = json.loads(self.client.get(self.read_data_url, {'objectId': objectId}, HTTP_AUTHORIZATION=f'Bearer {self.access_token}').getvalue())[0]['data']
+
+        # Send read data GET request for the names and statuses of the second and third units
+        response = self.client.get(self.read_data_url, {'objectId': objectId, 'fields': 'data.unit,data.status', 'unitSkip': 1, 'unitLimit': 2}, HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+
+        # Check that only those units and fields were returned
+        self.assertEqual(json.loads(response.getvalue())[0], {'data': [{'unit': unit['unit'], 'status': unit['status']} for unit in units[1:3]]})
+
+    # Test reading a field that doesn't exist
+    def test_read_data_invalid_field(self):
+        # Upload the test file
+        objectId = self.upload_test_file('good_test_data.xlsx')
+
+        # Send read data GET request for a field that isn't part of a property
+        response = self.client.get(self.read_data_url, {'objectId': objectId, 'fields': 'user_id'}, HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+
+        # Check that the request was rejected
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    # Test requesting fields that overlap, or no fields at all
+    def test_read_data_overlapping_or_empty_fields(self):
+        # Upload the test file
+        objectId = self.upload_test_file('good_test_data.xlsx')
+
+        # Send read data GET requests for a field along with one of its subfields, and for an empty list of fields
+        for fields in ['location,location.buildingName', 'data.unit,data', 'floorplans,,floorplans.a.b', ',', ' , ']:
+            with self.subTest(fields=fields):
+                response = self.client.get(self.read_data_url, {'objectId': objectId, 'fields': fields}, HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+
+                # Check that the request was rejected
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     # Tear down function to clean data from the test MongoDB
     def tearDown(self):
         # Delete all documents in the dat collection
         try:
             data_collection.delete_many({})
+            units_collection.delete_many({})
         except Exception as e:
             print(f"An error occurred during teardown: {e}")
\ No newline at end of file
@@ -5,7 +5,7 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
-from leasepeek.mongo_models import data_collection
+from leasepeek.mongo_models import data_collection, units_collection
 
 class ReadUserDataViewTest(APITestCase):
     @classmethod
@@ -92,10 +92,51 @@ class ReadUserDataViewTest(APITestCase):
         # Check that the response status code is 401 Unauthorized due to the invalid token
         self.check_response_code(response, status.HTTP_401_UNAUTHORIZED)
 
+    # Test that every uploaded property is listed, with only its summary fields
+    def test_read_user_data_lists_every_property(self):
+        # Upload the test data file twice
+        self.upload_test_file()
+        self.upload_test_file()
+
+        # Make the GET request to read user data with authentication
+        response = self.client.get(self.read_user_data_url, HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+
+        # Check that both properties are listed, without their units, and that there is no next page
+        self.assertEqual(len(response.data['data']), 2)
+        self.assertNotIn('data', response.data['data'][0])
+        self.assertIsNone(response.data['next'])
+
+    # Test paging through the properties with limit and after
+    def test_read_user_data_pagination(self):
+        # Upload the test data file three times
+        for _ in range(3):
+            self.upload_test_file()
+
+        # Read the properties two at a time
+        first_page = self.client.get(self.read_user_data_url, {'limit': 2}, HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+        second_page = self.client.get(self.read_user_data_url, {'limit': 2, 'after': first_page.data['next']}, HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+
+        # Check that the pages hold every property once, in order
+        self.assertEqual(len(first_page.data['data']), 2)
+        self.assertEqual(first_page.data['next'], first_page.data['data'][-1]['objectId'])
+        self.assertEqual(len(second_page.data['data']), 1)
+        self.assertIsNone(second_page.data['next'])
+        object_ids = [item['objectId'] for item in first_page.data['data'] + second_page.data['data']]
+        self.assertEqual(object_ids, sorted(set(object_ids)))
+
+    # Test reading user data with an invalid after objectId
+    def test_read_user_data_invalid_after(self):
+        # Make the GET request with an after objectId in the wrong format
+        response = self.client.get(self.read_user_data_url, {'after': 'invalid-object-id'}, HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+
+        # Check that the response status code is 400 BAD REQUEST
+        self.check_response_code(response, status.HTTP_400_BAD_REQUEST)
+
     # Tear down function to clean data from the test MongoDB
     def tearDown(self):
         # Delete all documents in the dat collection
         try:
             data_collection.delete_many({})
+            units_collection.delete_many({})
         except Exception as e:
             print(f"An error occurred during teardown: {e}")
\ No newline at end of file
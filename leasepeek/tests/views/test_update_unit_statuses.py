@@ -0,0 +1,85 @@
+# Required libraries/modules for testing the unit status edits of the data update endpoint
+import os
+import json
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from leasepeek.mongo_models import data_collection, units_collection
+from bson.objectid import ObjectId
+
+class UpdateUnitStatusesViewTest(APITestCase):
+    def setUp(self):
+        # Establish required end points
+        self.login_url = reverse('login')
+        self.process_data_url = reverse('process_data')
+        self.read_data_url = reverse('read_data')
+        self.update_data_url = reverse('update_data')
+
+        # Get the User model
+        self.User = get_user_model()
+
+        # Create a User
+        self.user = self.User.objects.create_user(username='testuserstatusupdate', email='testuserstatusupdate@test.com', password='testpass')
+
+        # Log in the test user and save the access token for authenticating further requests
+        login_response = self.client.post(self.login_url, {'email': 'testuserstatusupdate@test.com', 'password': 'testpass'}, format='json')
+        self.access_token = login_response.data['access']
+
+        # Upload the test file
+        BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with open(os.path.join(BASE_DIR, 'test_data', 'good_test_data.xlsx'), 'rb') as real_file:
+            file = SimpleUploadedFile(name='good_test_data.xlsx', content=real_file.read(), content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+        response = self.client.post(self.process_data_url, {'file': file}, format='multipart', HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+        self.objectId = json.loads(response.content)['objectId']
+
+    def tearDown(self):
+        # Clean up the uploaded property and its units
+        data_collection.delete_one({'_id': ObjectId(self.objectId)})
+        units_collection.delete_many({'property_id': ObjectId(self.objectId)})
+
+    def read_document(self):
+        # Helper method reading the stored property through the read endpoint
+        response = self.client.get(self.read_data_url, {'objectId': self.objectId}, HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+        return json.loads(response.getvalue())[0]
+
+    def update_statuses(self, units):
+        # Helper method sending unit status edits to the update endpoint
+        return self.client.put(self.update_data_url, {'form': 'unitStatus', 'objectId': self.objectId, 'units': units}, format='json', HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+
+    # Test that a status edit is applied to the unit and its vacancy counts
+    def test_update_status(self):
+        document = self.read_document()
+        unit = next(unit for unit in document['data'] if unit['status'] == 'occupied')
+
+        response = self.update_statuses([{'unit': unit['unit'], 'status': 'down'}])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        updated = self.read_document()
+        self.assertEqual(next(row for row in updated['data'] if row['unit'] == unit['unit'])['status'], 'down')
+        self.assertEqual(updated['vacancy']['Down']['count'], document['vacancy'].get('Down', {}).get('count', 0) + 1)
+        self.assertEqual(updated['vacancy']['Occupied']['count'], document['vacancy']['Occupied']['count'] - 1)
+
+    # Test that edits which aren't a unit name and a canonical status are rejected, leaving the property alone
+    def test_invalid_status_edits(self):
+        document = self.read_document()
+        unit = document['data'][0]['unit']
+        invalid_edits = [
+            [{'unit': unit, 'status': 'a.b'}],
+            [{'unit': unit, 'status': '$set'}],
+            [{'unit': unit, 'status': ''}],
+            [{'unit': unit, 'status': None}],
+            [{'unit': unit, 'status': 'Occupied'}],
+            [{'unit': unit}],
+            [{'status': 'vacant'}],
+            [{'unit': None, 'status': 'vacant'}],
+            ['vacant'],
+            {'unit': unit, 'status': 'vacant'},
+        ]
+        for units in invalid_edits:
+            with self.subTest(units=units):
+                response = self.update_statuses(units)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(self.read_document(), document)
@@ -0,0 +1,229 @@
+"""
+Module Description:
+This module stores the unit rows of each property in their own collection, `units_collection`, instead of embedding them in the
+property document under 'data'. A large portfolio's unit array can bring a property document close to MongoDB's 16 MB document
+limit, and every read or update of the document would carry the whole array. Property documents keep only their summaries, and
+units are assembled on demand.
+
+Each unit is stored as its own document with the 'property_id' of its property and its 'seq', its position in the rent roll.
+Properties stored before this collection existed still embed their units under 'data'; every function here accepts both.
+
+Functions:
+- insert_property: Stores a property document and its units.
+- has_embedded_units: Whether a stored property embeds its units.
+- units_cursor: Opens a cursor over the units of a property, in rent roll order.
+- find_units: Reads the units of a property, in rent roll order.
+- load_units: Returns the units of a stored property, embedded or not.
+- attach_units: Adds the units of a property to its document under 'data'.
+- property_projection: Builds the projection reading some fields of a property, and a slice of its units.
+- update_units: Sets fields of units, by their position in the rent roll.
+- update_named_units: Sets fields of every row of the named units.
+- delete_units: Deletes the units of a property.
+
+"""
+from .mongo_models import data_collection, units_collection
+from .json_stream import raw_codec_options
+from pymongo import UpdateOne
+
+# Number of units written per `insert_many` call and read per cursor batch.
+unit_batch_size = 1000
+
+# Largest count accepted by the `$slice` projection, used to slice embedded units to the end of the array.
+max_slice_count = 2**31 - 1
+
+def insert_property(property_data):
+    """
+    Stores a property document and its units.
+
+    The property document is stored without its 'data' units, which are written to `units_collection` with unordered `insert_many` batches. If the units can't be written, the property and any units already written are removed.
+
+    Parameters:
+    - property_data (dict): The property document returned by the reader, with its units under 'data'.
+
+    Returns:
+    - ObjectId: The id of the stored property.
+    """
+    property_document = {key: value for key, value in property_data.items() if key != 'data'}
+    property_id = data_collection.insert_one(property_document).inserted_id
+
+    units = property_data.get('data') or []
+    try:
+        for start in range(0, len(units), unit_batch_size):
+            batch = [{'property_id': property_id, 'seq': seq, **units[seq]} for seq in range(start, min(start + unit_batch_size, len(units)))]
+            units_collection.insert_many(batch, ordered=False)
+    except Exception:
+        delete_units(property_id)
+        data_collection.delete_one({'_id': property_id})
+        raise
+
+    return property_id
+
+
+def has_embedded_units(document):
+    """
+    Returns whether a stored property embeds its units under 'data', as properties stored before `units_collection` existed do. The document must have been read with its 'data' field, or part of it, in the projection.
+    """
+    return 'data' in document
+
+
+def units_cursor(property_id, fields=None, skip=0, limit=None, raw=False):
+    """
+    Opens a cursor over the units of a property, in rent roll order.
+
+    Parameters:
+    - property_id (ObjectId): The id of the property.
+    - fields (iterable): The unit fields to read. Defaults to every field.
+    - skip (int): The number of units to skip. The first unit read is found on the (property_id, seq) index rather than by walking the skipped ones.
+    - limit (int): The largest number of units to read. Defaults to every unit.
+    - raw (bool): Whether to read the units as `RawBSONDocument`s rather than dicts.
+
+    Returns:
+    - Cursor: The units, without their 'property_id' and 'seq' keys, read in batches of at most `unit_batch_size`.
+    """
+    collection = units_collection.with_options(codec_options=raw_codec_options) if raw else units_collection
+    if fields is None:
+        projection = {'_id': 0, 'property_id': 0, 'seq': 0}
+    else:
+        projection = {'_id': 0, **{field: 1 for field in fields}}
+    query = {'property_id': property_id}
+    if skip:
+        query['seq'] = {'$gte': skip}
+    cursor = collection.find(query, projection).sort('seq', 1)
+    if limit is not None:
+        cursor = cursor.limit(limit)
+    return cursor.batch_size(min(limit or unit_batch_size, unit_batch_size))
+
+
+def find_units(property_id, fields=None, skip=0, limit=None):
+    """
+    Reads the units of a property, in rent roll order, with the options of `units_cursor`.
+
+    Returns:
+    - list: The units, without their 'property_id' and 'seq' keys.
+    """
+    return list(units_cursor(property_id, fields, skip, limit))
+
+
+def load_units(document, fields=None):
+    """
+    Returns the units of a stored property, whether it embeds them or they are stored in `units_collection`.
+
+    Parameters:
+    - document (dict): The stored property, with its '_id' and, if it embeds its units, its 'data'.
+    - fields (iterable): The unit fields to read from `units_collection`. Defaults to every field.
+
+    Returns:
+    - list: The units, in rent roll order.
+    """
+    if has_embedded_units(document):
+        return document['data']
+    return find_units(document['_id'], fields)
+
+
+def attach_units(document, fields=None, skip=0, limit=None):
+    """
+    Adds the units of a property to its document under 'data', unless it embeds them already.
+
+    Embedded units are read with the document, so they are expected to be projected and sliced by the projection of `property_projection` already. Only their fields are trimmed here, as MongoDB can't project the fields of a sliced array.
+
+    Parameters:
+    - document (dict): The stored property, with its '_id'.
+    - fields (iterable): The unit fields to read. Defaults to every field.
+    - skip (int): The number of units to skip in `units_collection`.
+    - limit (int): The largest number of units to read from `units_collection`. Defaults to every unit.
+
+    Returns:
+    - dict: The document.
+    """
+    if not has_embedded_units(document):
+        document['data'] = find_units(document['_id'], fields, skip, limit)
+    elif fields is not None:
+        document['data'] = [{field: unit[field] for field in fields if field in unit} for unit in document['data']]
+    return document
+
+
+def property_projection(fields=None, unit_fields=None, skip=0, limit=None):
+    """
+    Builds the projection reading some fields of a stored property, and a slice of the units it embeds, if any.
+
+    Parameters:
+    - fields (iterable): The fields of the property to read, other than 'data'. Dotted paths read part of a field. Defaults to every field.
+    - unit_fields (iterable): The unit fields to read, if the units are read. An empty iterable reads every unit field. None leaves the units out when `fields` is given.
+    - skip (int): The number of embedded units to skip.
+    - limit (int): The largest number of embedded units to read. Defaults to every unit.
+
+    Returns:
+    - dict: The projection, or None to read the whole document.
+    """
+    sliced = skip or limit is not None
+    unit_slice = {'$slice': [skip, max_slice_count if limit is None else limit]} if sliced else None
+
+    if fields is None:
+        return {'data': unit_slice} if sliced else None
+
+    projection = {field: 1 for field in fields}
+    if unit_fields is not None:
+        if sliced:
+            projection['data'] = unit_slice
+        elif unit_fields:
+            projection.update({f'data.{field}': 1 for field in unit_fields})
+        else:
+            projection['data'] = 1
+    return projection
+
+
+def update_units(document, unit_fields):
+    """
+    Sets fields of units of a property, by their position in the rent roll.
+
+    Parameters:
+    - document (dict): The stored property as it was read, with its '_id' and, if it embeds its units, its 'data'.
+    - unit_fields (dict): The fields to set on each unit, by position.
+
+    Returns:
+    - dict: The '$set' paths that update embedded units, to be applied with the property's own update. Empty if the units are stored in `units_collection`, which is updated here.
+    """
+    if has_embedded_units(document):
+        return {f'data.{seq}.{field}': value for seq, fields in unit_fields.items() for field, value in fields.items()}
+
+    if unit_fields:
+        units_collection.bulk_write([UpdateOne({'property_id': document['_id'], 'seq': seq}, {'$set': fields}) for seq, fields in unit_fields.items()], ordered=False)
+    return {}
+
+
+def update_named_units(document, unit_names, fields, identifier='unit'):
+    """
+    Sets fields of every row of the named units of a property.
+
+    Parameters:
+    - document (dict): The stored property as it was read, with its '_id' and, if it embeds its units, its 'data'.
+    - unit_names (iterable): The names of the units.
+    - fields (dict): The fields to set.
+    - identifier (str): The array filter identifier matching the units, when they are embedded. Updates combined into one must use different identifiers.
+
+    Returns:
+    - tuple: The '$set' paths and array filters that update embedded units, to be applied with the property's own update. Both are empty if the units are stored in `units_collection`, which is updated here.
+    """
+    unit_names = sorted(unit_names)
+    if not unit_names:
+        return {}, []
+
+    if has_embedded_units(document):
+        set_fields = {f'data.$[{identifier}].{field}': value for field, value in fields.items()}
+        return set_fields, [{f'{identifier}.unit': {'$in': unit_names}}]
+
+    units_collection.update_many({'property_id': document['_id'], 'unit': {'$in': unit_names}}, {'$set': fields})
+    return {}, []
+
+
+def delete_units(property_id):
+    """
+    Deletes the units of a property.
+
+    Parameters:
+    - property_id (ObjectId): The id of the property.
+
+    Returns:
+    - int: The number of units deleted.
+    """
+    return units_collection.delete_many({'property_id': property_id}).deleted_count
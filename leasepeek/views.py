@@ -3,7 +3,10 @@ Module Description:
 This module contains views controlling User and Data workflows. Specifically, these workflows interact with MongoDB for data storage and Django's authentication system and Postgres for user management.
 """
 from .mongo_models import data_collection
-from django.http import JsonResponse
+from .unit_storage import insert_property, delete_units, has_embedded_units, units_cursor, property_projection
+from .json_stream import raw_codec_options, property_json_chunks
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
 from django.contrib.auth import login
 from django.core.exceptions import ValidationError
 from rest_framework import status
@@ -16,10 +19,9 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from .serializers import UserRegisterSerializer, UserLoginSerializer
 from .serializers import CustomTokenObtainPairSerializer
 from .validations import custom_validation, validate_email, validate_password
-from leasepeek.readers.xlsx import read_xlsx
+from leasepeek.readers.xlsx import read_xlsx_file, metric_keys
 from bson.objectid import ObjectId
 from bson.errors import InvalidId
-import pandas as pd
 import logging
 import json
 from leasepeek.data_updaters.basic_data_updates import update_basic_data
@@ -31,6 +33,16 @@ from leasepeek.data_updaters.renovations import update_renovations_data
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# The summary fields of each property listed by read_user_data.
+basic_data = ['location', 'date', 'asOf', 'vacancy', 'floorplans', 'totalUnits', 'totalBalance', 'lossToLease']
+
+# The fields of a property that read_excel_data can return, by name. 'data' holds the units.
+property_fields = ('location', 'date', 'asOf', 'totalUnits', 'unitsConfirmed') + metric_keys
+
+# Default and largest number of properties listed per read_user_data page.
+user_data_page_size = 100
+max_user_data_page_size = 500
+
 # Token Authentication
 class CustomTokenObtainPairView(TokenObtainPairView):
 	""" 
@@ -131,7 +143,7 @@ class UserLoginView(APIView):
 def process_excel_data(request):
 	"""
 	View to process and store data from an Excel file.
-	This view reads the uploaded Excel file, convers it to a DataFrame, and then stores it in MongoDB.
+	This view reads the uploaded Excel file with the configured reader engine, and then stores the processed data in MongoDB. The property summaries are stored in one document and its units in the units collection.
 	"""
 	logger.info(f"User {request.user.username} initiated a process data POST request.")
 	user_id = request.user.user_id
@@ -146,11 +158,10 @@ def process_excel_data(request):
 		if file_name.endswith('.xlsx'):
 			# Process the attached file and store its data in MongoDB
 			try:
-				data_frame = pd.read_excel(file_obj, header=None)
-				unit_data = read_xlsx(data_frame, user_id, file_name)
-				result = data_collection.insert_one(unit_data)
+				unit_data = read_xlsx_file(file_obj, user_id, file_name, engine=settings.XLSX_READER_ENGINE)
+				property_id = insert_property(unit_data)
 				logger.info(f"File '{file_name}' processed successfully.")
-				return JsonResponse({"message": "Excel file processed successfully.", "objectId": str(result.inserted_id)}, status=status.HTTP_201_CREATED)
+				return JsonResponse({"message": "Excel file processed successfully.", "objectId": str(property_id)}, status=status.HTTP_201_CREATED)
 			except Exception as e:
 				logger.error(f"Error processing excel file '{file_name}': {e}", exc_info=True)
 				return JsonResponse({"message": "Error processing excel file."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -188,6 +199,8 @@ def update_excel_data(request):
 				return JsonResponse({'status': 'success', 'message': response_message}, status=status.HTTP_200_OK)
 	except json.JSONDecodeError:
 		return JsonResponse({'status': 'error', 'message': 'Invalid JSON'}, status=status.HTTP_400_BAD_REQUEST)
+	except ValidationError as e:
+		return JsonResponse({'status': 'error', 'message': e.message}, status=status.HTTP_400_BAD_REQUEST)
 	except Exception as e:
 		logger.error(f"Error processing request: {e}")
 		return JsonResponse({'status': 'error', 'message': 'Error processing request'}, status=500)
@@ -198,25 +211,44 @@ def update_excel_data(request):
 def read_user_data(request):
 	"""
 	View to retrieve basic building data for the authenticated user.
+	Only the summary fields are read from MongoDB. Properties are listed in pages ordered by objectId: `limit` sets the page size, and `after` takes the `next` objectId returned with the previous page.
 	"""
 	user_id = request.user.user_id
-	cursor = data_collection.find({'user_id': user_id})
 
-    # Check if cursor is empty
-	first_document = next(cursor, None)
-	if first_document is None:
+	# Read the page size and the objectId the page starts after
+	try:
+		limit = int(request.GET.get('limit', user_data_page_size))
+	except ValueError:
+		logger.error("Invalid limit for User ID: %s", user_id)
+		return Response({"message": "Invalid limit."}, status=status.HTTP_400_BAD_REQUEST)
+	limit = min(max(limit, 1), max_user_data_page_size)
+
+	query = {'user_id': user_id}
+	after = request.GET.get('after', None)
+	if after:
+		try:
+			query['_id'] = {'$gt': ObjectId(after)}
+		except InvalidId:
+			logger.error("Invalid after objectId: %s", after)
+			return Response({"message": "Invalid objectId format."}, status=status.HTTP_400_BAD_REQUEST)
+
+	# One more document than the page holds tells whether there is a next page
+	projection = {k: 1 for k in basic_data}
+	cursor = data_collection.find(query, projection).sort('_id', 1).limit(limit + 1).batch_size(limit + 1)
+	documents = list(cursor)
+	next_after = str(documents[limit - 1]['_id']) if len(documents) > limit else None
+
+	if not documents and not after:
 		logger.warning("No data found for User ID: %s", user_id)
 		return Response({"data": [], "message": "No building data found."}, status=status.HTTP_404_NOT_FOUND)
-	else:
-		# If there is at least one document, process the cursor
-		basic_data = ['location', 'date', 'asOf', 'vacancy', 'floorplans', 'totalUnits', 'totalBalance', 'lossToLease']
-		results = []
-		for item in cursor:
-			data_item = {k: item[k] for k in basic_data if k in item}
-			data_item['objectId'] = str(item['_id'])
-			results.append(data_item)
-		logger.info("Basic building data retrieved for User ID: %s", user_id)
-		return Response({"data": results, "message": "Basic building data successfully retrieved."}, status=status.HTTP_200_OK)
+
+	results = []
+	for item in documents[:limit]:
+		data_item = {k: item[k] for k in basic_data if k in item}
+		data_item['objectId'] = str(item['_id'])
+		results.append(data_item)
+	logger.info("Basic building data retrieved for User ID: %s", user_id)
+	return Response({"data": results, "next": next_after, "message": "Basic building data successfully retrieved."}, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
@@ -225,6 +257,8 @@ def read_user_data(request):
 def read_excel_data(request):
 	"""
 	View to retrieve data from MongoDB based on an objectId.
+	The units of the property are assembled under 'data' from the units collection, unless the property embeds them. The document is read as raw BSON and its JSON is streamed as it is encoded, so memory use doesn't grow with the number of units.
+	`fields` takes a comma separated list of the fields to return, such as 'floorplans,vacancy' or 'location.buildingName,data.unit,data.status', and defaults to every field. A field can't be requested along with one of its subfields. `unitSkip` and `unitLimit` return a slice of the units.
 	"""
 	user = request.user.user_id
 	object_id = request.GET.get('objectId', None)
@@ -236,23 +270,61 @@ def read_excel_data(request):
 	except InvalidId as e:
 		logger.error("Invalid ObjectId: %s", object_id)
 		return JsonResponse({"message": "Invalid objectId format."}, status=status.HTTP_400_BAD_REQUEST)
+
+	# Map the requested fields to a projection. Units are read whole unless some of their fields are named.
+	fields = None
+	unit_fields = ()
+	if request.GET.get('fields'):
+		fields = []
+		unit_fields = None
+		requested = list(dict.fromkeys(filter(None, (field.strip() for field in request.GET['fields'].split(',')))))
+		if not requested:
+			logger.error("No fields requested for ObjectId: %s", object_id)
+			return JsonResponse({"message": "No fields requested."}, status=status.HTTP_400_BAD_REQUEST)
+		for field in requested:
+			name, _, subfield = field.partition('.')
+			if name not in property_fields or '$' in field:
+				logger.error("Invalid field requested: %s", field)
+				return JsonResponse({"message": f"Invalid field: {field}."}, status=status.HTTP_400_BAD_REQUEST)
+			# A field and one of its subfields would collide in the projection
+			overlapping = next((other for other in requested if other.startswith(field + '.')), None)
+			if overlapping:
+				logger.error("Overlapping fields requested: %s, %s", field, overlapping)
+				return JsonResponse({"message": f"Overlapping fields: {field}, {overlapping}."}, status=status.HTTP_400_BAD_REQUEST)
+			if name != 'data':
+				fields.append(field)
+			elif subfield:
+				unit_fields = (unit_fields or ()) + (subfield,)
+			else:
+				unit_fields = ()
+	try:
+		unit_skip = int(request.GET.get('unitSkip', 0))
+		unit_limit = request.GET.get('unitLimit', None)
+		unit_limit = int(unit_limit) if unit_limit is not None else None
+		if unit_skip < 0 or (unit_limit is not None and unit_limit < 1):
+			raise ValueError
+	except ValueError:
+		logger.error("Invalid unit slice requested for ObjectId: %s", object_id)
+		return JsonResponse({"message": "Invalid unitSkip or unitLimit."}, status=status.HTTP_400_BAD_REQUEST)
+
 	try:	
-		cursor = data_collection.find({
+		# Read the property as raw BSON, decoded only as it is encoded
+		document = data_collection.with_options(codec_options=raw_codec_options).find_one({
 			'user_id': user,
 			'_id': ObjectId(object_id)
-		})
+		}, property_projection(fields, unit_fields, unit_skip, unit_limit))
 
-		if not cursor:
-			logger.error("Invalid ObjectId: %s", object_id)
-			return JsonResponse({"message": "Data not found."}, status=status.HTTP_404_NOT_FOUND)
-
-		results = [{k: v for k, v in item.items() if k != '_id'} for item in cursor]
-		if not results:
+		if document is None:
 			logger.warning("No data found for ObjectId: %s", object_id)
 			return JsonResponse({"message": "Data not found."}, status=status.HTTP_204_NO_CONTENT)
 
+		# Units stored in the units collection are streamed from their cursor after the property fields
+		units = None
+		if unit_fields is not None and not has_embedded_units(document):
+			units = units_cursor(document['_id'], unit_fields or None, unit_skip, unit_limit, raw=True)
+
 		logger.info("Data retrieved successfully")
-		return JsonResponse(results, safe=False, status=status.HTTP_200_OK)
+		return StreamingHttpResponse(property_json_chunks(document, units, unit_fields or None), content_type='application/json', status=status.HTTP_200_OK)
 	except Exception as e:
 		logger.error("Error retrieving data for ObjectId: %s", object_id)
 	return JsonResponse({"message": "Error retrieving data."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -280,6 +352,9 @@ def delete_property(request):
 			logger.warning("No property found with objectId: %s", object_id)
 			return Response({"message": "Property not found."}, status=status.HTTP_404_NOT_FOUND)
 
+		# Delete the units of the property
+		delete_units(ObjectId(object_id))
+
 	  # If the delete operation was successful, return a 200 OK
 		logger.info("Property data deleted for objectId: %s", object_id)
 		return Response({"message": "Property data deleted."}, status=status.HTTP_200_OK)
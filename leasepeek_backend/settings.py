@@ -133,6 +133,12 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Engine used to read uploaded rent rolls: 'pandas' loads the whole sheet into a DataFrame, 'openpyxl' streams it row by row and 'sax' streams the sheet XML directly.
+XLSX_READER_ENGINE = os.environ.get('XLSX_READER_ENGINE', 'pandas')
+
+# Whether the MongoDB indexes declared in leasepeek/mongo_indexes.py are built when the application starts. They can also be built with `python manage.py mongo_indexes`.
+MONGO_ENSURE_INDEXES = os.environ.get('MONGO_ENSURE_INDEXES', 'true').lower() == 'true'
+
 CORS_ORIGIN_WHITELIST = [
      'http://localhost:4200',
      'https://localhost:4200',